@@ -0,0 +1,64 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.disassembler import disassemble, numpy, to_disassembly_listing
+from assembler.output_formats import build_image
+from program_generator import generate_program
+
+
+def build_test_image(instruction_count: int, seed: int) -> bytes:
+    program_size = min(instruction_count, 100000)
+    image = build_image(AssembleRisc().assemble_source(generate_program(program_size, seed)).machine_code)
+    return bytes(image) * (instruction_count // program_size)
+
+
+def build_random_image(byte_count: int, seed: int) -> bytes:
+    return random.Random(seed).randbytes(byte_count)
+
+
+def measure(function, image, use_numpy: bool) -> (float, int):
+    start = time.perf_counter()
+    result = function(image, use_numpy=use_numpy)
+    seconds = time.perf_counter() - start
+    return seconds, result.count('\n') if isinstance(result, str) else len(result)
+
+
+def get_args():
+    argument_parser = argparse.ArgumentParser(
+        description="Measures disassembler throughput in words per second on assembled generated programs and on "
+                    "random bytes, with and without NumPy."
+    )
+    argument_parser.add_argument(
+        "-s", "--sizes", nargs='+', type=int, default=[100000, 1000000], help="Image sizes in instructions."
+    )
+    argument_parser.add_argument("--seed", type=int, default=0, help="Seed of the program generator.")
+    return argument_parser.parse_args()
+
+
+def main():
+    args = get_args()
+    backends = [False, True] if numpy is not None else [False]
+    print(f'{"image":>8} {"words":>9} {"backend":>8} {"function":>22} {"seconds":>8} {"words/s":>10}')
+    for size in args.sizes:
+        images = {
+            'program': build_test_image(size, args.seed),
+            'random': build_random_image(4 * size, args.seed),
+        }
+        for image_name, image in images.items():
+            for use_numpy in backends:
+                for function in [disassemble, to_disassembly_listing]:
+                    seconds, words = measure(function, image, use_numpy)
+                    print(
+                        f'{image_name:>8} {words:>9} {"numpy" if use_numpy else "python":>8} '
+                        f'{function.__name__:>22} {seconds:>8.3f} {words / seconds:>10.0f}'
+                    )
+
+
+if __name__ == "__main__":
+    main()
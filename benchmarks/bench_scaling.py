@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.output_formats import build_image, to_binary_text, to_hex_text, to_hex_byte_dump
+from program_generator import generate_program
+
+
+def run_benchmark(instruction_count: int, seed: int) -> dict:
+    with tempfile.NamedTemporaryFile('w', suffix='.s', delete=False) as source_file:
+        source_file.write(generate_program(instruction_count, seed))
+    try:
+        start = time.perf_counter()
+        machine_code = AssembleRisc().assemble(source_file.name)
+        assembled = time.perf_counter()
+        to_binary_text(machine_code)
+        to_hex_text(machine_code)
+        to_hex_byte_dump(machine_code)
+        build_image(machine_code)
+        formatted = time.perf_counter()
+    finally:
+        os.remove(source_file.name)
+    return {
+        'instructions': len(machine_code),
+        'assemble_seconds': assembled - start,
+        'output_seconds': formatted - assembled,
+    }
+
+
+def get_args():
+    argument_parser = argparse.ArgumentParser(
+        description="Checks that assembly and output formatting time grow linearly with the program size."
+    )
+    argument_parser.add_argument(
+        "-s", "--sizes", nargs='+', type=int, default=[1000, 10000, 100000, 1000000],
+        help="Program sizes in instructions."
+    )
+    argument_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the program generator; each size uses the next seed."
+    )
+    return argument_parser.parse_args()
+
+
+def main():
+    args = get_args()
+    print(f'{"instructions":>12} {"assemble [s]":>13} {"output [s]":>11} {"us/instr":>9}')
+    for index, size in enumerate(args.sizes):
+        result = run_benchmark(size, args.seed + index)
+        total = result['assemble_seconds'] + result['output_seconds']
+        print(
+            f'{result["instructions"]:>12} {result["assemble_seconds"]:>13.3f} {result["output_seconds"]:>11.3f} '
+            f'{1e6 * total / result["instructions"]:>9.2f}'
+        )
+
+
+if __name__ == "__main__":
+    main()
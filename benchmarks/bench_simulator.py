@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.simulator import Simulator
+
+
+KERNELS = {
+    'integer': '''
+addi x6, x0, 1024
+outer:
+addi x5, x0, 0
+loop:
+lw x8, 0(x5)
+add x7, x7, x8
+mul x9, x8, x7
+sw x9, 1024(x5)
+addi x5, x5, 4
+bne x5, x6, loop
+jal x0, outer
+''',
+    'compressed': '''
+c.li x9, 0
+c.li x8, 31
+c.lw x10, 0(x9)
+c.add x10, x8
+c.sw x10, 0(x9)
+c.addi x8, -1
+c.bnez x8, -8
+c.j -12
+''',
+    'float': '''
+addi x5, x0, 3
+fcvt.s.w f1, x5
+fcvt.s.w f2, x0
+loop:
+fadd.s f2, f2, f1
+fmul.s f3, f2, f1
+fmadd.s f4, f3, f1, f2
+fsw f4, 256(x0)
+jal x0, loop
+'''
+}
+
+
+def measure(image, instruction_count: int) -> float:
+    simulator = Simulator(image)
+    start = time.perf_counter()
+    simulator.run(instruction_count)
+    return time.perf_counter() - start
+
+
+def get_args():
+    argument_parser = argparse.ArgumentParser(
+        description="Measures the simulator throughput in instructions per second on small looping kernels."
+    )
+    argument_parser.add_argument(
+        "-n", "--instructions", type=int, default=2000000, help="Number of instructions simulated per kernel."
+    )
+    return argument_parser.parse_args()
+
+
+def main():
+    args = get_args()
+    print(f'{"kernel":>12} {"instructions":>12} {"seconds":>8} {"instructions/s":>14}')
+    for name, source in KERNELS.items():
+        image = AssembleRisc().assemble_source(source).image
+        seconds = measure(image, args.instructions)
+        print(f'{name:>12} {args.instructions:>12} {seconds:>8.3f} {args.instructions / seconds:>14.0f}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SOURCE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+STARTUP_SCENARIOS = {
+    'interpreter': 'pass',
+    'import': 'import assembler.assemblerisc',
+    'assemble_one_line': (
+        'import sys\n'
+        'from assembler.assemblerisc import AssembleRisc\n'
+        'AssembleRisc().assemble(sys.argv[1])\n'
+    ),
+}
+
+
+def measure_startup(code: str, source_filename: str, repeats: int) -> list:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code, source_filename], cwd=SOURCE_DIRECTORY, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def get_args():
+    argument_parser = argparse.ArgumentParser(
+        description="Measures the process start-up time of importing the assembler and assembling one line."
+    )
+    argument_parser.add_argument("-n", "--repeats", type=int, default=20, help="Number of runs per scenario.")
+    return argument_parser.parse_args()
+
+
+def main():
+    args = get_args()
+    with tempfile.NamedTemporaryFile('w', suffix='.s', delete=False) as source_file:
+        source_file.write('add x1, x2, x3\n')
+    try:
+        print(f'{"scenario":>18} {"median [ms]":>12} {"min [ms]":>9}')
+        for scenario, code in STARTUP_SCENARIOS.items():
+            timings = measure_startup(code, source_file.name, args.repeats)
+            print(f'{scenario:>18} {1e3 * statistics.median(timings):>12.1f} {1e3 * min(timings):>9.1f}')
+    finally:
+        os.remove(source_file.name)
+
+
+if __name__ == "__main__":
+    main()
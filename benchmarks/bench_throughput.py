@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc, AssemblyContext
+from bench_startup import STARTUP_SCENARIOS, measure_startup
+from program_generator import generate_program
+
+
+REGRESSION_THRESHOLD = 0.1
+
+
+def measure_passes(source: str) -> dict:
+    assembler = AssembleRisc()
+    context = AssemblyContext()
+    start = time.perf_counter()
+    assembler.find_labels_pass(context, source)
+    labels_found = time.perf_counter()
+    assembler.parse_instructions_pass(context)
+    encoded = time.perf_counter()
+    return {
+        'find_labels_pass_seconds': labels_found - start,
+        'parse_instructions_pass_seconds': encoded - labels_found,
+        'handler_counts': dict(Counter(parse_info.kind.name.lower() for _, parse_info in context.parsed_instructions)),
+    }
+
+
+def measure_peak_memory(source: str) -> int:
+    tracemalloc.start()
+    try:
+        AssembleRisc().assemble_source(source)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(instruction_count: int, seed: int, repeats: int) -> dict:
+    source = generate_program(instruction_count, seed)
+    line_count = source.count('\n')
+    runs = [measure_passes(source) for _ in range(repeats)]
+    find_labels_seconds = statistics.median(run['find_labels_pass_seconds'] for run in runs)
+    parse_instructions_seconds = statistics.median(run['parse_instructions_pass_seconds'] for run in runs)
+    total_seconds = find_labels_seconds + parse_instructions_seconds
+    return {
+        'instructions': instruction_count,
+        'lines': line_count,
+        'find_labels_pass_seconds': find_labels_seconds,
+        'parse_instructions_pass_seconds': parse_instructions_seconds,
+        'lines_per_second': line_count / total_seconds,
+        'peak_memory_bytes': measure_peak_memory(source),
+        'handler_counts': runs[0]['handler_counts'],
+    }
+
+
+def run_startup_benchmark(repeats: int) -> dict:
+    with tempfile.NamedTemporaryFile('w', suffix='.s', delete=False) as source_file:
+        source_file.write('add x1, x2, x3\n')
+    try:
+        return {
+            scenario: statistics.median(measure_startup(code, source_file.name, repeats))
+            for scenario, code in STARTUP_SCENARIOS.items()
+        }
+    finally:
+        os.remove(source_file.name)
+
+
+def get_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare_results(baseline: dict, results: dict, threshold: float) -> list:
+    regressions = []
+    baseline_benchmarks = {benchmark['instructions']: benchmark for benchmark in baseline['benchmarks']}
+    for benchmark in results['benchmarks']:
+        previous = baseline_benchmarks.get(benchmark['instructions'])
+        if previous is None:
+            continue
+        if benchmark['lines_per_second'] < previous['lines_per_second'] * (1 - threshold):
+            regressions.append(
+                f'{benchmark["instructions"]} instructions: {benchmark["lines_per_second"]:.0f} lines/s, '
+                f'was {previous["lines_per_second"]:.0f}'
+            )
+        if benchmark['peak_memory_bytes'] > previous['peak_memory_bytes'] * (1 + threshold):
+            regressions.append(
+                f'{benchmark["instructions"]} instructions: {benchmark["peak_memory_bytes"]} bytes peak memory, '
+                f'was {previous["peak_memory_bytes"]}'
+            )
+    for scenario, seconds in results.get('startup_seconds', {}).items():
+        previous = baseline.get('startup_seconds', {}).get(scenario)
+        if previous is not None and seconds > previous * (1 + threshold):
+            regressions.append(f'{scenario} startup: {1e3 * seconds:.1f} ms, was {1e3 * previous:.1f} ms')
+    return regressions
+
+
+def get_args():
+    argument_parser = argparse.ArgumentParser(
+        description="Measures assembler throughput, per-pass time, peak memory and start-up time on generated "
+                    "programs mixing every instruction type, and writes the results as JSON."
+    )
+    argument_parser.add_argument(
+        "-s", "--sizes", nargs='+', type=int, default=[1000, 10000, 100000], help="Program sizes in instructions."
+    )
+    argument_parser.add_argument("--seed", type=int, default=0, help="Seed of the program generator.")
+    argument_parser.add_argument("-n", "--repeats", type=int, default=3, help="Number of runs per program size.")
+    argument_parser.add_argument(
+        "--startup-repeats", type=int, default=10, help="Number of runs per start-up scenario, 0 to skip them."
+    )
+    argument_parser.add_argument("-o", "--output", help="File the JSON results are written to.")
+    argument_parser.add_argument("-c", "--compare", help="JSON results of a previous run to compare against.")
+    argument_parser.add_argument(
+        "-t", "--threshold", type=float, default=REGRESSION_THRESHOLD,
+        help="Relative slowdown or memory growth reported as a regression."
+    )
+    return argument_parser.parse_args()
+
+
+def main():
+    args = get_args()
+    results = {
+        'revision': get_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'benchmarks': [],
+    }
+
+    print(f'{"instructions":>12} {"labels [s]":>11} {"encode [s]":>11} {"lines/s":>10} {"peak [MiB]":>11}')
+    for size in args.sizes:
+        benchmark = run_benchmark(size, args.seed, args.repeats)
+        results['benchmarks'].append(benchmark)
+        print(
+            f'{benchmark["instructions"]:>12} {benchmark["find_labels_pass_seconds"]:>11.3f} '
+            f'{benchmark["parse_instructions_pass_seconds"]:>11.3f} {benchmark["lines_per_second"]:>10.0f} '
+            f'{benchmark["peak_memory_bytes"] / 2 ** 20:>11.1f}'
+        )
+
+    if args.startup_repeats:
+        results['startup_seconds'] = run_startup_benchmark(args.startup_repeats)
+        for scenario, seconds in results['startup_seconds'].items():
+            print(f'{scenario:>18} startup {1e3 * seconds:>8.1f} ms')
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare_results(json.load(baseline_file), results, args.threshold)
+        for regression in regressions:
+            print(f'regression: {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
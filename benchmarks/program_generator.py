@@ -0,0 +1,208 @@
+import argparse
+import random
+
+
+X_REGISTERS = ['x' + str(index) for index in range(1, 32)]
+COMPRESSED_X_REGISTERS = ['x' + str(index) for index in range(8, 16)]
+F_REGISTERS = ['f' + str(index) for index in range(32)]
+COMPRESSED_F_REGISTERS = ['f' + str(index) for index in range(8, 16)]
+ROUNDING_MODES = ['rne', 'rtz', 'rdn', 'rup', 'rmm', 'dyn']
+CSR_NAMES = ['mstatus', 'fcsr', 'fflags', '0x300', '0x305']
+FENCE_OPERANDS = ['r', 'w', 'rw', 'i', 'o', 'io', 'iorw']
+
+HANDLER_TEMPLATES = {
+    'r_instruction': [
+        '{r_op} {rd}, {rs1}, {rs2}',
+    ],
+    'i_instruction': [
+        '{i_op} {rd}, {rs1}, {imm12}',
+        'ecall',
+        'ebreak',
+        '{csr_op} {rd}, {csr}, {rs1}',
+        '{csri_op} {rd}, {csr}, {uimm5}',
+    ],
+    'i_shift_instruction': [
+        '{shift_op} {rd}, {rs1}, {uimm5}',
+    ],
+    'i_load_instruction': [
+        '{load_op} {rd}, {imm12}({rs1})',
+    ],
+    'u_instruction': [
+        '{u_op} {rd}, {uimm20}',
+    ],
+    'jal_instruction': [
+        'jal {rd}, {label}',
+    ],
+    'jalr_instruction': [
+        'jalr {rd}, {imm12}({rs1})',
+    ],
+    'b_instruction': [
+        '{b_op} {rs1}, {rs2}, {label}',
+    ],
+    's_instruction': [
+        '{store_op} {rs2}, {imm12}({rs1})',
+    ],
+    'fence_instruction': [
+        'fence {fence_pred}, {fence_succ}',
+        'fence',
+        'fence.i',
+    ],
+    'compressed_r_instruction': [
+        '{c_r_op} {crd}, {crs2}',
+        '{c_rr_op} {rd}, {rs2}',
+    ],
+    'compressed_i_instruction': [
+        'c.addi {rd}, {nzimm6}',
+        'c.li {rd}, {imm6}',
+        'c.lui {c_lui_rd}, {nzimm6}',
+        'c.slli {rd}, {nzuimm5}',
+        '{c_shift_op} {crd}, {nzuimm5}',
+        'c.andi {crd}, {imm6}',
+        'c.addi16sp sp, {addi16sp_imm}',
+        'c.addi4spn {crd}, sp, {addi4spn_imm}',
+        'c.nop',
+        'c.ebreak',
+        'c.lwsp {rd}, {uimm8_4}(sp)',
+        'c.flwsp {fd}, {uimm8_4}(sp)',
+        'c.fldsp {fd}, {uimm9_8}(sp)',
+    ],
+    'compressed_b_instruction': [
+        '{c_b_op} {crs1}, {label}',
+    ],
+    'compressed_l_load_instruction': [
+        'c.lw {crd}, {uimm7_4}({crs1})',
+        'c.flw {cfd}, {uimm7_4}({crs1})',
+        'c.fld {cfd}, {uimm8_8}({crs1})',
+    ],
+    'compressed_l_store_instruction': [
+        'c.sw {crs2}, {uimm7_4}({crs1})',
+        'c.fsw {cfs2}, {uimm7_4}({crs1})',
+        'c.fsd {cfs2}, {uimm8_8}({crs1})',
+    ],
+    'compressed_store_sp_instruction': [
+        'c.swsp {rs2}, {uimm8_4}(sp)',
+        'c.fswsp {fs2}, {uimm8_4}(sp)',
+        'c.fsdsp {fs2}, {uimm9_8}(sp)',
+    ],
+    'compressed_j_instruction': [
+        '{c_j_op} {c_j_imm}',
+    ],
+    'compressed_j_r_instruction': [
+        '{c_jr_op} {rs1}',
+    ],
+    'floating_point_r_instruction': [
+        '{f_rm_op} {fd}, {fs1}, {fs2}',
+        '{f_rm_op} {fd}, {fs1}, {fs2}, {rm}',
+        'fsqrt.s {fd}, {fs1}',
+        '{f_sign_op} {fd}, {fs1}, {fs2}',
+        '{f_compare_op} {rd}, {fs1}, {fs2}',
+        'fcvt.w.s {rd}, {fs1}, {rm}',
+        'fcvt.s.w {fd}, {rs1}, {rm}',
+        'fmv.x.w {rd}, {fs1}',
+        'fmv.w.x {fd}, {rs1}',
+        'fclass.s {rd}, {fs1}',
+        'flw {fd}, {imm12}({rs1})',
+        'fsw {fs2}, {imm12}({rs1})',
+    ],
+    'floating_point_r4_instruction': [
+        '{f_r4_op} {fd}, {fs1}, {fs2}, {fs3}',
+        '{f_r4_op} {fd}, {fs1}, {fs2}, {fs3}, {rm}',
+    ],
+    'atomic_instruction': [
+        'lr.w {rd}, ({rs1})',
+        'sc.w{aq_rl} {rd}, {rs2}, ({rs1})',
+        '{amo_op}{aq_rl} {rd}, {rs2}, ({rs1})',
+    ],
+}
+
+
+def _random_operands(rng: random.Random, labels) -> dict:
+    return {
+        'r_op': rng.choice(['add', 'sub', 'sll', 'slt', 'sltu', 'xor', 'srl', 'sra', 'or', 'and', 'mul', 'div']),
+        'i_op': rng.choice(['addi', 'slti', 'sltiu', 'xori', 'ori', 'andi']),
+        'shift_op': rng.choice(['slli', 'srli', 'srai']),
+        'load_op': rng.choice(['lb', 'lh', 'lw', 'lbu', 'lhu']),
+        'store_op': rng.choice(['sb', 'sh', 'sw']),
+        'u_op': rng.choice(['lui', 'auipc']),
+        'b_op': rng.choice(['beq', 'bne', 'blt', 'bge', 'bltu', 'bgeu']),
+        'csr_op': rng.choice(['csrrw', 'csrrs', 'csrrc']),
+        'csri_op': rng.choice(['csrrwi', 'csrrsi', 'csrrci']),
+        'c_r_op': rng.choice(['c.sub', 'c.xor', 'c.or', 'c.and']),
+        'c_rr_op': rng.choice(['c.add', 'c.mv']),
+        'c_shift_op': rng.choice(['c.srli', 'c.srai']),
+        'c_b_op': rng.choice(['c.beqz', 'c.bnez']),
+        'c_j_op': rng.choice(['c.j', 'c.jal']),
+        'c_jr_op': rng.choice(['c.jr', 'c.jalr']),
+        'f_rm_op': rng.choice(['fadd.s', 'fsub.s', 'fmul.s', 'fdiv.s']),
+        'f_sign_op': rng.choice(['fsgnj.s', 'fsgnjn.s', 'fsgnjx.s', 'fmin.s', 'fmax.s']),
+        'f_compare_op': rng.choice(['feq.s', 'flt.s', 'fle.s']),
+        'f_r4_op': rng.choice(['fmadd.s', 'fmsub.s', 'fnmsub.s', 'fnmadd.s']),
+        'amo_op': rng.choice([
+            'amoswap.w', 'amoadd.w', 'amoxor.w', 'amoand.w', 'amoor.w', 'amomin.w', 'amomax.w', 'amominu.w',
+            'amomaxu.w'
+        ]),
+        'aq_rl': rng.choice(['', '.aq', '.rl', '.aqrl']),
+        'rm': rng.choice(ROUNDING_MODES),
+        'csr': rng.choice(CSR_NAMES),
+        'fence_pred': rng.choice(FENCE_OPERANDS),
+        'fence_succ': rng.choice(FENCE_OPERANDS),
+        'rd': rng.choice(X_REGISTERS),
+        'rs1': rng.choice(X_REGISTERS),
+        'rs2': rng.choice(X_REGISTERS),
+        'c_lui_rd': rng.choice([register for register in X_REGISTERS if register != 'x2']),
+        'crd': rng.choice(COMPRESSED_X_REGISTERS),
+        'crs1': rng.choice(COMPRESSED_X_REGISTERS),
+        'crs2': rng.choice(COMPRESSED_X_REGISTERS),
+        'fd': rng.choice(F_REGISTERS),
+        'fs1': rng.choice(F_REGISTERS),
+        'fs2': rng.choice(F_REGISTERS),
+        'fs3': rng.choice(F_REGISTERS),
+        'cfd': rng.choice(COMPRESSED_F_REGISTERS),
+        'cfs2': rng.choice(COMPRESSED_F_REGISTERS),
+        'imm12': rng.randint(-2048, 2047),
+        'uimm5': rng.randint(0, 31),
+        'nzuimm5': rng.randint(1, 31),
+        'uimm20': hex(rng.randint(0, 0xfffff)),
+        'imm6': rng.randint(-32, 31),
+        'nzimm6': rng.choice([value for value in range(-32, 32) if value]),
+        'addi16sp_imm': 16 * rng.choice([value for value in range(-32, 32) if value]),
+        'addi4spn_imm': 4 * rng.randint(1, 255),
+        'uimm7_4': 4 * rng.randint(0, 31),
+        'uimm8_8': 8 * rng.randint(0, 31),
+        'uimm8_4': 4 * rng.randint(0, 63),
+        'uimm9_8': 8 * rng.randint(0, 63),
+        'c_j_imm': 2 * rng.randint(-1024, 1023),
+        'label': rng.choice(labels),
+    }
+
+
+def generate_program(instruction_count: int, seed: int = 0, block_size: int = 32, handler_types=None) -> str:
+    rng = random.Random(seed)
+    handler_types = list(handler_types or HANDLER_TEMPLATES)
+    lines = []
+    block_count = -(-instruction_count // block_size)
+    for block in range(block_count):
+        lines.append(f'block_{block}:')
+        labels = [f'block_{block}'] + ([f'block_{block + 1}'] if block + 1 < block_count else [])
+        for _ in range(min(block_size, instruction_count - block * block_size)):
+            template = rng.choice(HANDLER_TEMPLATES[rng.choice(handler_types)])
+            lines.append(template.format(**_random_operands(rng, labels)))
+    return '\n'.join(lines) + '\n'
+
+
+def get_args():
+    argument_parser = argparse.ArgumentParser(
+        description="Generates a random program that mixes every instruction type supported by the assembler."
+    )
+    argument_parser.add_argument("-n", "--instructions", type=int, default=1000, help="Number of instructions.")
+    argument_parser.add_argument("-s", "--seed", type=int, default=0, help="Seed of the random generator.")
+    return argument_parser.parse_args()
+
+
+def main():
+    args = get_args()
+    print(generate_program(args.instructions, args.seed), end='')
+
+
+if __name__ == "__main__":
+    main()
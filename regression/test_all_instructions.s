@@ -0,0 +1,413 @@
+block_0:
+lui x4, 0x1926e
+fence.i
+c.fswsp f13, 24(sp)
+bgeu x11, x9, block_1
+amoadd.w x17, x31, (x10)
+jal x27, block_0
+lhu x28, -1038(x7)
+c.beqz x13, block_0
+c.mv x27, x11
+auipc x31, 0x96e8c
+c.jr x17
+c.beqz x12, block_1
+srli x31, x1, 13
+div x17, x24, x23
+fence.i
+amoor.w.aqrl x26, x29, (x24)
+c.jalr x19
+xor x3, x22, x21
+sc.w.aqrl x9, x24, (x11)
+sh x20, -1482(x22)
+jal x1, block_0
+c.fld f13, 160(x11)
+c.jal -1886
+jal x1, block_1
+fence r, rw
+c.fsdsp f16, 8(sp)
+fence
+lr.w x14, (x5)
+c.lw x11, 72(x14)
+fence
+c.j -1480
+c.flw f12, 116(x9)
+block_1:
+sc.w.rl x3, x3, (x1)
+csrrc x25, fflags, x17
+jalr x21, -700(x17)
+bne x22, x14, block_1
+bltu x4, x10, block_2
+c.jr x26
+sh x1, -999(x29)
+c.fsw f14, 108(x15)
+sc.w.aq x10, x19, (x28)
+lbu x30, 2028(x13)
+c.jalr x1
+fnmsub.s f18, f3, f3, f23
+c.fld f10, 248(x13)
+csrrsi x6, fcsr, 1
+blt x20, x11, block_1
+c.jalr x12
+fence
+jalr x26, 1858(x4)
+fence i, rw
+srai x16, x21, 20
+c.fswsp f2, 80(sp)
+c.lw x9, 108(x15)
+c.lwsp x7, 232(sp)
+c.flw f15, 96(x14)
+c.fswsp f4, 152(sp)
+c.flw f14, 12(x13)
+srli x20, x18, 29
+c.j 994
+c.add x30, x12
+c.sub x9, x10
+fence iorw, rw
+lui x2, 0x61652
+block_2:
+sll x18, x14, x16
+c.jal 1678
+c.jalr x21
+c.xor x8, x14
+or x31, x31, x15
+fnmsub.s f6, f12, f9, f20
+sltu x27, x22, x8
+c.swsp x19, 180(sp)
+or x22, x29, x6
+c.flw f11, 100(x8)
+c.addi x16, 12
+jalr x3, -1376(x13)
+fsqrt.s f6, f17
+fsqrt.s f25, f20
+jal x18, block_3
+lui x19, 0x48e1e
+slt x20, x8, x27
+sh x21, 1381(x19)
+sw x29, 1880(x19)
+lbu x4, 301(x27)
+c.addi x26, -21
+ecall
+c.jalr x11
+jal x18, block_2
+slt x3, x10, x20
+srli x22, x13, 5
+jalr x1, -40(x25)
+jal x25, block_2
+sb x27, 972(x16)
+c.fswsp f28, 120(sp)
+jal x3, block_3
+mul x29, x13, x15
+block_3:
+c.jalr x12
+jal x27, block_3
+lr.w x2, (x26)
+c.beqz x8, block_3
+c.xor x14, x14
+lhu x3, 305(x25)
+c.beqz x12, block_3
+fclass.s x19, f12
+jalr x9, -279(x2)
+c.lwsp x20, 112(sp)
+sh x7, 607(x2)
+srai x8, x30, 17
+jalr x22, 432(x17)
+jalr x15, 1806(x10)
+jalr x22, -1682(x21)
+c.addi4spn x9, sp, 740
+c.beqz x10, block_3
+bltu x30, x19, block_4
+c.lw x14, 48(x13)
+ebreak
+c.mv x13, x22
+c.jal 1482
+sh x26, 1553(x8)
+c.swsp x29, 144(sp)
+srli x17, x23, 16
+c.flw f8, 56(x9)
+srai x6, x6, 26
+c.jalr x5
+fence io, i
+slli x24, x9, 18
+jalr x23, -164(x6)
+div x3, x31, x28
+block_4:
+lui x19, 0x37b09
+bge x28, x23, block_5
+c.fldsp f25, 224(sp)
+jalr x28, -1608(x30)
+jal x6, block_4
+csrrw x24, mstatus, x7
+c.lwsp x23, 0(sp)
+bgeu x22, x13, block_5
+jalr x12, -717(x25)
+c.lui x14, 8
+c.bnez x11, block_5
+fence io, iorw
+fence o, w
+sub x22, x12, x7
+sw x28, -615(x25)
+c.fsd f8, 72(x13)
+c.srai x9, 6
+c.fld f11, 32(x10)
+c.j 1800
+csrrci x31, 0x305, 2
+c.jal 412
+or x13, x13, x21
+csrrwi x1, 0x300, 26
+fmadd.s f13, f27, f12, f18
+fmv.x.w x22, f22
+sb x19, 98(x14)
+c.lwsp x8, 188(sp)
+lr.w x17, (x21)
+c.sw x15, 8(x12)
+bltu x29, x9, block_4
+jal x11, block_4
+c.jal 1706
+block_5:
+c.jalr x21
+jal x30, block_6
+jalr x26, 797(x21)
+jalr x16, 1181(x8)
+srli x31, x7, 4
+c.flw f14, 120(x11)
+c.sw x9, 96(x13)
+c.swsp x12, 240(sp)
+c.lw x13, 64(x11)
+beq x29, x2, block_6
+fmsub.s f19, f6, f24, f6, rdn
+fmv.w.x f3, x8
+fsqrt.s f3, f13
+fence.i
+flw f24, -396(x8)
+lui x24, 0xd8c28
+c.mv x30, x13
+c.swsp x23, 76(sp)
+csrrc x23, 0x300, x15
+sw x26, -1086(x17)
+bge x16, x31, block_5
+sub x19, x3, x11
+fnmadd.s f27, f23, f14, f28, rne
+c.lw x9, 20(x14)
+lb x2, 1515(x26)
+fmsub.s f16, f18, f16, f0, rup
+jal x21, block_6
+fmsub.s f8, f17, f29, f14, rne
+c.flwsp f5, 68(sp)
+c.jal -646
+fence
+c.fswsp f15, 180(sp)
+block_6:
+lw x10, -1296(x23)
+fle.s x12, f17, f19
+jal x10, block_6
+c.ebreak
+fnmsub.s f8, f19, f12, f15, rup
+c.flw f8, 60(x14)
+c.fsd f11, 184(x12)
+sh x24, -1514(x14)
+c.beqz x10, block_6
+blt x12, x22, block_6
+amomaxu.w x7, x30, (x29)
+c.fsd f9, 24(x14)
+c.swsp x8, 40(sp)
+lh x13, -1224(x21)
+fence.i
+fmv.w.x f22, x13
+c.fld f9, 96(x12)
+lw x3, -2027(x7)
+c.andi x10, 20
+jal x27, block_6
+fmsub.s f13, f17, f31, f7
+sb x26, -1224(x1)
+c.beqz x13, block_7
+c.flw f9, 28(x8)
+lui x26, 0x28507
+fsqrt.s f22, f10
+fmsub.s f21, f15, f16, f13
+c.addi4spn x10, sp, 324
+sw x16, -388(x9)
+bgeu x25, x28, block_7
+c.fsd f8, 16(x14)
+c.add x29, x29
+block_7:
+c.j 1528
+lh x1, 978(x27)
+lr.w x11, (x22)
+c.jalr x22
+c.jr x8
+sh x8, 267(x9)
+c.mv x18, x18
+auipc x17, 0xa82c6
+and x1, x18, x30
+auipc x7, 0xebf70
+add x20, x8, x3
+srai x20, x5, 23
+c.fsw f14, 104(x10)
+c.jalr x14
+c.andi x8, 19
+or x1, x13, x5
+amominu.w x8, x9, (x22)
+fnmsub.s f17, f9, f26, f11, rne
+csrrc x3, 0x305, x3
+csrrs x26, fcsr, x29
+c.fsdsp f16, 480(sp)
+c.jalr x7
+fmsub.s f22, f0, f23, f14
+lw x30, 1540(x3)
+jal x28, block_8
+c.beqz x13, block_7
+sw x31, 1710(x6)
+csrrc x22, mstatus, x19
+c.fldsp f25, 232(sp)
+c.fsw f9, 80(x10)
+bltu x3, x10, block_8
+c.jal -1274
+block_8:
+c.mv x6, x8
+jal x16, block_9
+c.lui x28, 14
+c.sw x11, 20(x13)
+c.flw f8, 120(x12)
+fmadd.s f2, f2, f14, f25, rtz
+c.beqz x14, block_9
+c.sw x13, 116(x11)
+sw x20, 1162(x11)
+blt x31, x14, block_9
+c.bnez x8, block_8
+lr.w x11, (x27)
+lw x17, -227(x10)
+fence
+jal x25, block_9
+c.srli x12, 28
+fence o, r
+c.jalr x30
+lr.w x3, (x6)
+c.sub x10, x8
+c.j -1902
+c.fsdsp f27, 232(sp)
+ecall
+amoor.w x16, x18, (x12)
+ebreak
+fmsub.s f4, f25, f21, f25
+c.lw x10, 84(x13)
+c.jalr x17
+jal x7, block_8
+c.sub x9, x12
+c.flw f14, 112(x11)
+srai x28, x15, 26
+block_9:
+fcvt.s.w f0, x25, rdn
+c.bnez x11, block_10
+c.flw f14, 36(x11)
+fence.i
+lui x31, 0x8a2a4
+c.jr x16
+lui x10, 0x5f8f4
+c.beqz x12, block_10
+c.bnez x12, block_9
+c.or x9, x9
+sc.w.aq x10, x30, (x28)
+lui x4, 0x30030
+amoadd.w.aq x10, x6, (x25)
+c.add x22, x9
+c.fldsp f2, 464(sp)
+c.jal 1010
+div x5, x28, x1
+sltiu x24, x22, 1648
+mul x30, x13, x25
+c.jal 1022
+fence.i
+div x12, x25, x1
+jalr x17, 336(x20)
+c.add x18, x19
+jal x8, block_9
+c.mv x25, x23
+bltu x13, x6, block_9
+c.or x15, x8
+c.jalr x6
+c.add x19, x12
+c.jr x25
+bltu x19, x13, block_9
+block_10:
+jal x7, block_11
+sll x3, x26, x29
+c.sw x15, 12(x8)
+jal x20, block_10
+and x9, x24, x4
+c.mv x17, x11
+srli x22, x11, 0
+c.and x13, x13
+srli x21, x26, 26
+c.li x4, 5
+c.beqz x13, block_11
+c.fsdsp f19, 408(sp)
+fence.i
+jal x7, block_11
+c.lwsp x1, 16(sp)
+c.sub x10, x11
+bltu x18, x2, block_10
+beq x12, x9, block_11
+c.swsp x2, 192(sp)
+c.fsdsp f7, 368(sp)
+amomax.w.aq x29, x11, (x10)
+flw f30, 731(x10)
+sc.w.aq x15, x30, (x24)
+c.fsw f15, 24(x8)
+bltu x21, x13, block_11
+c.jalr x25
+slli x4, x5, 9
+sw x1, 1595(x22)
+c.fsw f8, 104(x11)
+fmadd.s f13, f19, f14, f15, dyn
+xor x8, x3, x27
+c.srai x9, 13
+block_11:
+c.flw f14, 52(x9)
+c.fsd f15, 232(x11)
+c.fsd f9, 56(x9)
+sb x4, 289(x23)
+lui x26, 0xd4fec
+auipc x31, 0xe1b85
+sc.w.aq x4, x24, (x13)
+jalr x22, -196(x24)
+and x21, x23, x27
+c.srli x9, 7
+c.j 426
+jal x28, block_12
+srli x25, x31, 20
+jalr x4, 522(x30)
+fcvt.w.s x21, f23, rmm
+c.addi16sp sp, 192
+jal x20, block_11
+c.and x13, x12
+sw x4, -775(x14)
+fence.i
+flt.s x12, f22, f24
+jalr x4, -57(x6)
+amoswap.w.aqrl x1, x1, (x8)
+jal x3, block_11
+c.jalr x20
+fnmadd.s f7, f27, f30, f5
+csrrsi x12, 0x305, 13
+sh x9, 1366(x28)
+c.fsd f14, 64(x9)
+jalr x31, 1930(x22)
+c.beqz x13, block_12
+c.nop
+block_12:
+lr.w x31, (x22)
+c.fswsp f8, 116(sp)
+jal x23, block_12
+div x13, x23, x6
+c.mv x12, x20
+c.flwsp f16, 200(sp)
+c.jr x5
+c.jalr x4
+fence.i
+bltu x31, x21, block_12
+sb x15, -81(x5)
+bne x6, x22, block_12
+lui x31, 0x5cefb
+c.and x10, x15
+lui x16, 0x6b4f6
+fcvt.s.w f8, x15, rdn
@@ -0,0 +1,24 @@
+# A extension edge cases, checked against test_simulate_a.sim
+addi x5, x0, 256
+addi x6, x0, -5
+addi x7, x0, 3
+addi x8, x5, 4
+sw x6, 0(x5)
+amomin.w x10, x7, (x5)      # -5, memory stays -5
+amominu.w x11, x7, (x5)     # -5, memory becomes 3
+amomax.w x12, x6, (x5)      # 3, memory stays 3
+amomaxu.w x13, x6, (x5)     # 3, memory becomes -5
+amoadd.w x14, x7, (x5)      # -5, memory becomes -2
+amoxor.w x15, x6, (x5)      # -2, memory becomes 5
+amoand.w x16, x7, (x5)      # 5, memory becomes 1
+amoor.w x17, x6, (x5)       # 1, memory becomes -5
+amoswap.w.aqrl x18, x7, (x5)  # -5, memory becomes 3
+sc.w x19, x6, (x5)          # no reservation: fails with 1
+lr.w x20, (x5)              # 3
+sc.w x21, x6, (x5)          # succeeds with 0, memory becomes -5
+lw x22, 0(x5)               # -5
+sc.w x23, x7, (x5)          # the reservation was used up: fails with 1
+lr.w x24, (x5)
+sc.w x25, x7, (x8)          # another address: fails with 1
+lw x26, 0(x5)               # -5
+ebreak
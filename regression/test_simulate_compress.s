@@ -0,0 +1,26 @@
+# Code with an RVC form for most instructions, checked with and without --compress against test_simulate_compress.sim
+addi x8, x0, 0              # c.li
+addi x9, x0, 10             # c.li
+addi x10, x0, 0             # c.li
+loop:
+add x10, x10, x9            # c.add
+addi x9, x9, -1             # c.addi
+bne x9, x0, loop            # c.bnez
+addi x2, x2, -16            # c.addi16sp
+sw x10, 12(x2)              # c.swsp
+lw x11, 12(x2)              # c.lwsp
+addi x12, x2, 12            # c.addi4spn
+lw x13, 0(x12)              # c.lw
+jal x1, double              # c.jal
+jal x0, done                # c.j
+double:
+add x13, x13, x13           # c.add
+jalr x0, 0(x1)              # c.jr
+done:
+addi x2, x2, 16             # c.addi16sp
+sub x14, x13, x11           # c.sub
+and x15, x14, x13           # c.and
+slli x15, x15, 2            # c.slli
+srai x14, x14, 1            # c.srai
+addi x1, x0, 0              # the return address depends on the code size
+ebreak
@@ -0,0 +1,58 @@
+# F extension edge cases, checked against test_simulate_f.sim
+lui x5, 0x7f800
+fmv.w.x f1, x5              # +inf
+fmv.w.x f2, x0              # +0
+lui x6, 0x80000
+fmv.w.x f3, x6              # -0
+lui x7, 0x7f801
+fmv.w.x f4, x7              # signalling NaN
+lui x8, 0x3f800
+fmv.w.x f5, x8              # 1.0
+fsub.s f6, f1, f1           # inf - inf: canonical NaN
+fdiv.s f7, f5, f2           # 1 / +0: +inf
+fdiv.s f8, f5, f3           # 1 / -0: -inf
+fdiv.s f9, f2, f2           # 0 / 0: canonical NaN
+fsqrt.s f10, f3             # sqrt(-0): -0
+fsgnjn.s f11, f5, f5        # -1.0
+fsqrt.s f12, f11            # sqrt(-1): canonical NaN
+fmin.s f13, f4, f5          # a NaN operand is ignored: 1.0
+fmin.s f14, f2, f3          # -0 is smaller than +0
+fmax.s f15, f6, f6          # both operands NaN: canonical NaN
+fadd.s f16, f4, f5          # signalling NaN input: canonical NaN
+feq.s x10, f2, f3           # +0 == -0
+fle.s x11, f2, f3           # +0 <= -0
+fclass.s x12, f3            # negative zero
+fclass.s x13, f4            # signalling NaN
+fclass.s x14, f6            # quiet NaN
+fclass.s x15, f1            # +inf
+fcvt.w.s x16, f6            # NaN saturates to 2^31 - 1
+fcvt.w.s x17, f8            # -inf saturates to -2^31
+fcvt.wu.s x18, f1           # +inf saturates to 2^32 - 1
+lui x9, 0x40200
+fmv.w.x f17, x9             # 2.5
+fcvt.w.s x19, f17, rne      # 2
+fcvt.w.s x20, f17, rmm      # 3
+fcvt.w.s x21, f17, rup      # 3
+fsgnjn.s f18, f17, f17      # -2.5
+fcvt.w.s x22, f18, rdn      # -3
+fcvt.w.s x23, f18, rtz      # -2
+fcvt.w.s x24, f18, rne      # -2
+fcvt.s.w f19, x6            # -2^31
+fcvt.s.wu f20, x6           # 2^31
+addi x25, x0, -1
+fcvt.s.wu f21, x25          # 2^32 - 1 rounds to 2^32
+lui x26, 0x7f800
+addi x26, x26, -1
+fmv.w.x f22, x26            # largest finite single
+fadd.s f23, f22, f22        # overflows to +inf
+addi x27, x0, 1
+fmv.w.x f24, x27            # smallest subnormal
+fmul.s f25, f24, f5         # stays subnormal
+fclass.s x28, f24           # positive subnormal
+lui x29, 0x3f801
+addi x29, x29, -2048
+fmv.w.x f26, x29            # 1 + 2^-12
+lui x30, 0x1c800
+fmv.w.x f27, x30            # 2^-70
+fmadd.s f28, f26, f26, f27  # rounded once: 0x3f801001
+ebreak
@@ -0,0 +1,23 @@
+# M extension edge cases, checked against test_simulate_m.sim
+lui x5, 0x80000             # -2^31
+addi x6, x0, -1
+addi x7, x0, 7
+addi x9, x0, -7
+addi x28, x0, 2
+div x10, x5, x6             # overflow: -2^31
+rem x11, x5, x6             # overflow: 0
+div x12, x7, x0             # division by zero: -1
+divu x13, x7, x0            # division by zero: 2^32 - 1
+rem x14, x7, x0             # division by zero: the dividend
+remu x15, x7, x0            # division by zero: the dividend
+div x16, x9, x28            # rounds toward zero: -3
+rem x17, x9, x28            # takes the sign of the dividend: -1
+mulh x18, x5, x5            # 2^62 >> 32
+mulhu x19, x6, x6           # (2^32 - 1)^2 >> 32
+mulhsu x20, x6, x6          # -1 * (2^32 - 1) >> 32
+mul x21, x5, x6             # low word of 2^31
+divu x22, x6, x28
+remu x23, x6, x7
+mulh x24, x5, x6            # 2^31 >> 32: 0
+mulhsu x25, x5, x6          # -2^31 * (2^32 - 1) >> 32
+ebreak
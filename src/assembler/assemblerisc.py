@@ -1,363 +1,420 @@
-from assembler.tokenizer import reset_lineno
-from assembler.parser import parser
+from functools import lru_cache
+
+from assembler.tokenizer import get_lexer
+from assembler.parser import get_parser
+from assembler.fast_parser import fast_parse
+from assembler.assembly_result import AssemblyResult, StreamedInstruction, StreamedPatch
+from assembler.compression import compress_instructions
+from assembler.instruction_ir import Instruction, InstructionKind
+from assembler.encoding_templates import get_encoding_template
+from assembler.output_formats import build_image
+from assembler.relaxation import PC_RELATIVE_OFFSET_RANGES, fits_offset, relax_branches
 from assembler.instruction_info import *
 from assembler.immediate_generator import *
 
 
-class AssembleRisc:
-    def __init__(self):
-        self.parse_info = {}
+PARSE_CACHE_SIZE = 4096
+ENCODE_CACHE_SIZE = 4096
+
+_new_tuple = tuple.__new__
+
+# Memoized parses and encodings run with line number 0, so their error messages end with it.
+CACHED_ERROR_SUFFIX = ' at line 0'
+
+
+def _move_cached_error(error: Exception, lineno: int) -> Exception:
+    message = str(error)
+    if type(error) is not Exception or not message.endswith(CACHED_ERROR_SUFFIX):
+        return error
+    error_message = message[:-len(CACHED_ERROR_SUFFIX)] + ' at line {}'.format(str(lineno))
+    return Exception(error_message)
+
+
+class AssemblyContext:
+    def __init__(self, labels_table=None):
         self.instruction_address = 0
-        self.labels_table = {}
-        self.assembly_sequence = ""
+        self.labels_table = {} if labels_table is None else labels_table
+        self.parsed_instructions = []
+
+
+class AssembleRisc:
+    def __init__(
+        self, use_fast_path=True, parse_cache_size=PARSE_CACHE_SIZE, encode_cache_size=ENCODE_CACHE_SIZE,
+        profiler=None, compress=False, far_jumps=False
+    ):
+        self.use_fast_path = use_fast_path
+        self.compress = compress
+        self.far_jumps = far_jumps
+        self.profiler = profiler
+        self._parse_cached = lru_cache(maxsize=parse_cache_size)(self._parse_normalized_line)
+        self._encode_cached = lru_cache(maxsize=encode_cache_size)(self._encode_record_items)
         self.instruction_handlers = {
-            'r_instruction': self._decode_r_instruction,
-            'i_instruction': self._decode_i_instruction,
-            'i_shift_instruction': self._decode_i_shift_instruction,
-            'i_load_instruction': self._decode_i_load_instruction,
-            'u_instruction': self._decode_u_instruction,
-            'jal_instruction': self._decode_jal_instruction,
-            'jalr_instruction': self._decode_jalr_instruction,
-            'b_instruction': self._decode_b_instruction,
-            's_instruction': self._decode_s_instruction,
-            'fence_instruction': self._decode_fence_instruction,
-            'compressed_r_instruction': self._decode_compressed_r_instruction,
-            'compressed_i_instruction': self._decode_compressed_i_instruction,
-            'compressed_b_instruction': self._decode_compressed_b_instruction,
-            'compressed_l_load_instruction': self._decode_compressed_l_load_instruction,
-            'compressed_l_store_instruction': self._decode_compressed_l_store_instruction,
-            'compressed_store_sp_instruction': self._decode_compressed_store_sp_instruction,
-            'compressed_j_instruction': self._decode_compressed_j_instruction,
-            'compressed_j_r_instruction': self._decode_compressed_j_r_instruction,
-            'floating_point_r_instruction': self._decode_floating_point_r_instruction,
-            'floating_point_r4_instruction': self._decode_floating_point_r4_instruction,
-            'atomic_instruction': self._decode_atomic_instruction
+            InstructionKind.R_INSTRUCTION: self._decode_r_instruction,
+            InstructionKind.I_INSTRUCTION: self._decode_i_instruction,
+            InstructionKind.I_SHIFT_INSTRUCTION: self._decode_i_shift_instruction,
+            InstructionKind.I_LOAD_INSTRUCTION: self._decode_i_load_instruction,
+            InstructionKind.U_INSTRUCTION: self._decode_u_instruction,
+            InstructionKind.JAL_INSTRUCTION: self._decode_jal_instruction,
+            InstructionKind.JALR_INSTRUCTION: self._decode_jalr_instruction,
+            InstructionKind.B_INSTRUCTION: self._decode_b_instruction,
+            InstructionKind.S_INSTRUCTION: self._decode_s_instruction,
+            InstructionKind.FENCE_INSTRUCTION: self._decode_fence_instruction,
+            InstructionKind.COMPRESSED_R_INSTRUCTION: self._decode_compressed_r_instruction,
+            InstructionKind.COMPRESSED_I_INSTRUCTION: self._decode_compressed_i_instruction,
+            InstructionKind.COMPRESSED_B_INSTRUCTION: self._decode_compressed_b_instruction,
+            InstructionKind.COMPRESSED_L_LOAD_INSTRUCTION: self._decode_compressed_l_load_instruction,
+            InstructionKind.COMPRESSED_L_STORE_INSTRUCTION: self._decode_compressed_l_store_instruction,
+            InstructionKind.COMPRESSED_STORE_SP_INSTRUCTION: self._decode_compressed_store_sp_instruction,
+            InstructionKind.COMPRESSED_J_INSTRUCTION: self._decode_compressed_j_instruction,
+            InstructionKind.COMPRESSED_J_R_INSTRUCTION: self._decode_compressed_j_r_instruction,
+            InstructionKind.FLOATING_POINT_R_INSTRUCTION: self._decode_floating_point_r_instruction,
+            InstructionKind.FLOATING_POINT_R4_INSTRUCTION: self._decode_floating_point_r4_instruction,
+            InstructionKind.ATOMIC_INSTRUCTION: self._decode_atomic_instruction
         }
+        if profiler is not None:
+            self._install_profiler(profiler)
 
-    def _decode_r_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = R_OPCODE
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        rs2_bits = get_register_index_binary(instruction['rs2'])
-        funct3_bits = R_FUNCT3[instruction['opcode']]
-        funct7_bits = R_FUNCT7[instruction['opcode']]
-        return funct7_bits + rs2_bits + rs1_bits + funct3_bits + rd_bits + opcode_bits
-
-    def _decode_i_instruction(self) -> str:
-        instruction = self.parse_info
-        if instruction['opcode'] in I_ENVIRONMENT_INSTRUCTIONS + I_CSR_INSTRUCTIONS + I_CSRI_INSTRUCTIONS:
-            opcode_bits = I_SYSTEM_OPCODE
-        else:
-            opcode_bits = I_OPCODE
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        funct3_bits = I_FUNCT3[instruction['opcode']]
-        imm_bits = get_immediate_binary_12(instruction['imm'])
-        return imm_bits + rs1_bits + funct3_bits + rd_bits + opcode_bits
-
-    def _decode_i_shift_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = I_OPCODE
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        funct3_bits = I_FUNCT3[instruction['opcode']]
-        imm_bits = get_immediate_binary_5(instruction['imm'])
-        funct7_bits = I_SHIFT_FUNCT7[instruction['opcode']]
-        return funct7_bits + imm_bits + rs1_bits + funct3_bits + rd_bits + opcode_bits
-
-    def _decode_i_load_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = I_LOAD_OPCODE[instruction['opcode']]
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        funct3_bits = I_LOAD_FUNCT3[instruction['opcode']]
-        imm_bits = get_immediate_binary_12(instruction['imm'])
-        return imm_bits + rs1_bits + funct3_bits + rd_bits + opcode_bits
-
-    def _decode_u_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = U_OPCODE[instruction['opcode']]
-        rd_bits = get_register_index_binary(instruction['rd'])
-        imm_bits = get_immediate_binary_20(instruction['imm'])
-        return imm_bits + rd_bits + opcode_bits
-
-    def _decode_jal_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = JAL_OPCODE
-        rd_bits = get_register_index_binary(instruction['rd'])
-        if 'imm' in instruction:
-            imm_bits = get_immediate_binary_20_jal(instruction['imm'])
-        else:
-            target_address = self.labels_table[instruction['label']]
-            imm_value = (target_address - self.instruction_address)
-            imm_bits = get_immediate_binary_20_jal(imm_value)
-        return imm_bits + rd_bits + opcode_bits
-
-    def _decode_jalr_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = JALR_OPCODE
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        funct3_bits = JALR_FUNCT3
-        imm_bits = get_immediate_binary_12(instruction['imm'])
-        return imm_bits + rs1_bits + funct3_bits + rd_bits + opcode_bits
-
-    def _decode_b_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = B_OPCODE
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        rs2_bits = get_register_index_binary(instruction['rs2'])
-        funct3_bits = B_FUNCT3[instruction['opcode']]
-        if 'imm' in instruction:
-            imm_value = instruction['imm'] // 2
+    def _install_profiler(self, profiler) -> None:
+        self.instruction_handlers = {
+            kind: profiler.wrap(handler, 'encode:' + kind.name.lower(), 'encode')
+            for kind, handler in self.instruction_handlers.items()
+        }
+        self.encode_instruction = profiler.wrap(self.encode_instruction, 'encode_instruction', 'encode')
+        self._parse_line = profiler.wrap(self._parse_line, 'parse_line', 'parse')
+        self._parse_line_uncached = profiler.wrap(self._parse_line_uncached, 'parse_line_uncached', 'parse')
+
+        ply_parse_line = self._ply_parse_line
+
+        def profiled_ply_parse_line(line: str, lineno: int) -> Instruction:
+            return ply_parse_line(line, lineno, tokenfunc=profiler.wrap(get_lexer().token, 'lex', 'parse'))
+        self._ply_parse_line = profiler.wrap(profiled_ply_parse_line, 'ply_parse', 'parse')
+
+        self.find_labels_pass = profiler.wrap(self.find_labels_pass, 'find_labels_pass', 'pass')
+        self.compress_instructions_pass = profiler.wrap(
+            self.compress_instructions_pass, 'compress_instructions_pass', 'pass'
+        )
+        self.relax_branches_pass = profiler.wrap(self.relax_branches_pass, 'relax_branches_pass', 'pass')
+        self.parse_instructions_pass = profiler.wrap(self.parse_instructions_pass, 'parse_instructions_pass', 'pass')
+        self.assemble_source = profiler.wrap(self.assemble_source, 'assemble_source', 'pass')
+
+    def _decode_r_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return template.base_word | (instruction.rs2 << 20) | (instruction.rs1 << 15) | (instruction.rd << 7)
+
+    def _decode_i_instruction(self, instruction, context) -> int:
+        if instruction.rs1 < 0 or instruction.rs1 > 31:
+            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
+            raise Exception(error_message)
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | template.encode_immediate(instruction.imm) | (instruction.rs1 << 15) |
+            (instruction.rd << 7)
+        )
+
+    def _decode_i_shift_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | template.encode_immediate(instruction.imm) | (instruction.rs1 << 15) |
+            (instruction.rd << 7)
+        )
+
+    def _decode_i_load_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | template.encode_immediate(instruction.imm) | (instruction.rs1 << 15) |
+            (instruction.rd << 7)
+        )
+
+    def _decode_u_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return template.base_word | template.encode_immediate(instruction.imm) | (instruction.rd << 7)
+
+    def _get_pc_relative_offset(self, instruction, context) -> int:
+        if instruction.label is None:
+            offset = instruction.imm
         else:
-            target_address = self.labels_table[instruction['label']]
-            imm_value = (target_address - self.instruction_address) // 2
-        imm_bits_12_10to5, imm_bits_4to1_11 = get_immediate_binary_12b(imm_value)
-        return imm_bits_12_10to5 + rs2_bits + rs1_bits + funct3_bits + imm_bits_4to1_11 + opcode_bits
-
-    def _decode_s_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = S_OPCODE[instruction['opcode']]
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        rs2_bits = get_register_index_binary(instruction['rs2'])
-        funct3_bits = S_FUNCT3[instruction['opcode']]
-        imm_bits_11to5, imm_bits_4to0 = get_immediate_binary_12s(instruction['imm'])
-        return imm_bits_11to5 + rs2_bits + rs1_bits + funct3_bits + imm_bits_4to0 + opcode_bits
-
-    def _decode_fence_instruction(self) -> str:
-        def fence_operand_to_bits(op: str) -> str:
-            replace_dict = {"i": "8", "o": "4", "r": "2", "w": "1"}
-            pred_vals = "".join([replace_dict.get(c, c) for c in op])
-            return get_immediate_binary_4(sum([int(x) for x in pred_vals]))
-        instruction = self.parse_info
-        pred, succ = instruction['pred'], instruction['succ']
-        pred_bits, succ_bits = fence_operand_to_bits(pred), fence_operand_to_bits(succ)
-        opcode_bits = FENCE_OPCODE
-        rs1_bits = '00000'
-        rd_bits = '00000'
-        funct3_bits = FENCE_FUNCT3[instruction['opcode']]
-        return '0000' + pred_bits + succ_bits + rs1_bits + funct3_bits + rd_bits + opcode_bits
-
-    def _decode_compressed_r_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = '01'
-        if instruction['opcode'] in [INSTRUCTION_C_ADD, INSTRUCTION_C_MV]:
-            opcode_bits = '10'
-            if int(instruction['rd']) == 0 or int(instruction['rs2']) == 0:
-                error_message = 'Error: illegal operands at line {}'.format(str(instruction['lineno']))
+            offset = context.labels_table[instruction.label] - context.instruction_address
+        if not fits_offset(offset, PC_RELATIVE_OFFSET_RANGES[instruction.kind]):
+            if instruction.label is None:
+                error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
+            else:
+                error_message = 'Error: label {} out of range at line {}'.format(
+                    instruction.label, str(instruction.lineno)
+                )
+            raise Exception(error_message)
+        return offset
+
+    def _decode_jal_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        imm_value = self._get_pc_relative_offset(instruction, context)
+        return template.base_word | template.encode_immediate(imm_value) | (instruction.rd << 7)
+
+    def _decode_jalr_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | template.encode_immediate(instruction.imm) | (instruction.rs1 << 15) |
+            (instruction.rd << 7)
+        )
+
+    def _decode_b_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        imm_value = self._get_pc_relative_offset(instruction, context)
+        return (
+            template.base_word | template.encode_immediate(imm_value) | (instruction.rs2 << 20) |
+            (instruction.rs1 << 15)
+        )
+
+    def _decode_s_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | template.encode_immediate(instruction.imm) | (instruction.rs2 << 20) |
+            (instruction.rs1 << 15)
+        )
+
+    def _decode_fence_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return template.base_word | (instruction.pred << 24) | (instruction.succ << 20)
+
+    def _get_compressed_register_index(self, index: int, instruction) -> int:
+        if index < 8 or index > 15:
+            error_message = 'Error: illegal operands at line {}'.format(str(instruction.lineno))
+            raise Exception(error_message)
+        return get_compressed_register_index(index)
+
+    def _decode_compressed_r_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        if template.layout == 'CR':
+            if instruction.rd == 0 or instruction.rs2 == 0:
+                error_message = 'Error: illegal operands at line {}'.format(str(instruction.lineno))
                 raise Exception(error_message)
-            rd_bits = get_register_index_binary(instruction['rd'])
-            rs2_bits = get_register_index_binary(instruction['rs2'])
-            func_bit = COMPRESSED_R_FUNCT[instruction['opcode']]
-            return '100' + func_bit + rd_bits + rs2_bits + opcode_bits
+            return template.base_word | (instruction.rd << 7) | (instruction.rs2 << 2)
         else:
-            if (
-                    int(instruction['rd']) < 8 or int(instruction['rd']) > 15 or
-                    int(instruction['rs2']) < 8 or int(instruction['rs2']) > 15
-            ):
-                error_message = 'Error: illegal operands at line {}'.format(str(instruction['lineno']))
+            if instruction.rd < 8 or instruction.rd > 15 or instruction.rs2 < 8 or instruction.rs2 > 15:
+                error_message = 'Error: illegal operands at line {}'.format(str(instruction.lineno))
                 raise Exception(error_message)
-            rd_bits = get_compressed_register_index_binary(instruction['rd'])
-            rs2_bits = get_compressed_register_index_binary(instruction['rs2'])
-            funct_bits = COMPRESSED_R_FUNCT[instruction['opcode']]
-            return '100' + '0' + '11' + rd_bits + funct_bits + rs2_bits + opcode_bits
-
-    def _decode_compressed_i_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = COMPRESSED_I_OPCODE[instruction['opcode']]
-        rd_bits = get_compressed_register_index_binary(instruction['rd'])
-        if instruction['opcode'] == INSTRUCTION_C_ADDI4SPN:
-            imm_bits = get_immediate_binary_8_addi4spn(instruction['imm'])
-            funct3_bits = COMPRESSED_I_FUNCT3[instruction['opcode']]
-            return funct3_bits + imm_bits + rd_bits + opcode_bits
-        elif (
-            instruction['opcode'] in [
-                INSTRUCTION_C_ADDI, INSTRUCTION_C_LI, INSTRUCTION_C_LUI, INSTRUCTION_C_SLLI,
-                INSTRUCTION_C_ADDI16SP, INSTRUCTION_C_NOP, INSTRUCTION_C_ADDI4SPN, INSTRUCTION_C_EBREAK,
-                INSTRUCTION_C_SLLI64, INSTRUCTION_C_LWSP, INSTRUCTION_C_FLWSP, INSTRUCTION_C_FLDSP
-            ]
-        ):
-            if instruction['opcode'] == INSTRUCTION_C_LUI and int(instruction['rd']) == 2:
-                error_message = 'Error: illegal operands at line {}'.format(str(instruction['lineno']))
+            return template.base_word | ((instruction.rd - 8) << 7) | ((instruction.rs2 - 8) << 2)
+
+    def _decode_compressed_i_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        if template.layout == 'CIW':
+            return (
+                template.base_word | template.encode_immediate(instruction.imm) |
+                (self._get_compressed_register_index(instruction.rd, instruction) << 2)
+            )
+        elif template.layout == 'CI':
+            opcode = instruction.mnemonic
+            if opcode == INSTRUCTION_C_LUI and instruction.rd == 2:
+                error_message = 'Error: illegal operands at line {}'.format(str(instruction.lineno))
                 raise Exception(error_message)
-            if instruction['opcode'] == INSTRUCTION_C_ADDI16SP and int(instruction['rd']) != 2:
-                error_message = 'Error: illegal operands at line {}'.format(str(instruction['lineno']))
+            if opcode == INSTRUCTION_C_ADDI16SP and instruction.rd != 2:
+                error_message = 'Error: illegal operands at line {}'.format(str(instruction.lineno))
                 raise Exception(error_message)
-            rd_bits = get_register_index_binary(instruction['rd'])
-            if instruction['opcode'] in [INSTRUCTION_C_FLDSP]:
-                imm_bits = get_immediate_binary_6_ldsp(instruction['imm'])
-            elif instruction['opcode'] in [INSTRUCTION_C_LWSP, INSTRUCTION_C_FLWSP]:
-                imm_bits = get_immediate_binary_6_lwsp(instruction['imm'])
-            elif instruction['opcode'] == INSTRUCTION_C_ADDI16SP:
-                imm_bits = get_immediate_binary_6_addi16sp(instruction['imm'])
-            else:
-                imm_bits = get_immediate_binary_6(instruction['imm'])
-            imm_bits_part1, imm_bits_part2 = imm_bits[0], imm_bits[1:6]
-            funct3_bits = COMPRESSED_I_FUNCT3[instruction['opcode']]
-            return funct3_bits + imm_bits_part1 + rd_bits + imm_bits_part2 + opcode_bits
+            return template.base_word | template.encode_immediate(instruction.imm) | (instruction.rd << 7)
         else:
-            if int(instruction['rd']) < 8 or int(instruction['rd']) > 15:
-                error_message = 'Error: illegal operands at line {}'.format(str(instruction['lineno']))
+            if instruction.rd < 8 or instruction.rd > 15:
+                error_message = 'Error: illegal operands at line {}'.format(str(instruction.lineno))
                 raise Exception(error_message)
-            rd_bits = get_compressed_register_index_binary(instruction['rd'])
-            imm_bits = get_immediate_binary_6(instruction['imm'])
-            funct2_bits = COMPRESSED_I_FUNCT2[instruction['opcode']]
-            return '100' + imm_bits[0] + funct2_bits + rd_bits + imm_bits[1:6] + opcode_bits
-
-    def _decode_compressed_b_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = '01'
-        rs1_bits = get_compressed_register_index_binary(instruction['rs1'])
-        funct3_bits = COMPRESSED_B_FUNCT3[instruction['opcode']]
-        if 'imm' in instruction:
-            imm_value = instruction['imm'] // 2
-        else:
-            target_address = self.labels_table[instruction['label']]
-            imm_value = (target_address - self.instruction_address) // 2
-        imm_bits_8_4to3, imm_bits_7to6_2to1_5 = get_immediate_binary_8_compressed_b(imm_value)
-        return funct3_bits + imm_bits_8_4to3 + rs1_bits + imm_bits_7to6_2to1_5 + opcode_bits
-
-    def _decode_compressed_l_load_instruction(self) -> str:
-        instruction = self.parse_info
-        if instruction['opcode'] in [INSTRUCTION_C_LW, INSTRUCTION_C_FLW] and int(instruction['imm']) % 4 != 0:
-            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction['lineno']))
+            return template.base_word | template.encode_immediate(instruction.imm) | ((instruction.rd - 8) << 7)
+
+    def _decode_compressed_b_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        imm_value = self._get_pc_relative_offset(instruction, context)
+        return (
+            template.base_word | template.encode_immediate(imm_value) |
+            (self._get_compressed_register_index(instruction.rs1, instruction) << 7)
+        )
+
+    def _decode_compressed_l_load_instruction(self, instruction, context) -> int:
+        opcode = instruction.mnemonic
+        if opcode in [INSTRUCTION_C_LW, INSTRUCTION_C_FLW] and instruction.imm % 4 != 0:
+            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
             raise Exception(error_message)
-        if instruction['opcode'] == INSTRUCTION_C_FLD and int(instruction['imm']) % 8 != 0:
-            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction['lineno']))
+        if opcode == INSTRUCTION_C_FLD and instruction.imm % 8 != 0:
+            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
             raise Exception(error_message)
-        opcode_bits = '00'
-        rd_bits = get_compressed_register_index_binary(instruction['rd'])
-        rs1_bits = get_compressed_register_index_binary(instruction['rs1'])
-        funct3_bits = COMPRESSED_L_FUNCT3[instruction['opcode']]
-        if instruction['opcode'] in [INSTRUCTION_C_LW, INSTRUCTION_C_FLW]:
-            imm_bits_part1, imm_bits_part2 = get_immediate_binary_5_compressed_l(instruction['imm'])
-        else:
-            imm_bits_part1, imm_bits_part2 = get_immediate_binary_5_compressed_l_d(instruction['imm'])
-        return funct3_bits + imm_bits_part1 + rs1_bits + imm_bits_part2 + rd_bits + opcode_bits
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | template.encode_immediate(instruction.imm) |
+            (self._get_compressed_register_index(instruction.rs1, instruction) << 7) |
+            (self._get_compressed_register_index(instruction.rd, instruction) << 2)
+        )
 
-    def _decode_compressed_l_store_instruction(self) -> str:
-        instruction = self.parse_info
-        if instruction['opcode'] in [INSTRUCTION_C_SW, INSTRUCTION_C_FSW] and int(instruction['imm']) % 4 != 0:
-            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction['lineno']))
+    def _decode_compressed_l_store_instruction(self, instruction, context) -> int:
+        opcode = instruction.mnemonic
+        if opcode in [INSTRUCTION_C_SW, INSTRUCTION_C_FSW] and instruction.imm % 4 != 0:
+            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
             raise Exception(error_message)
-        if instruction['opcode'] == INSTRUCTION_C_FSD and int(instruction['imm']) % 8 != 0:
-            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction['lineno']))
+        if opcode == INSTRUCTION_C_FSD and instruction.imm % 8 != 0:
+            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
             raise Exception(error_message)
-        opcode_bits = '00'
-        rs2_bits = get_compressed_register_index_binary(instruction['rs2'])
-        rs1_bits = get_compressed_register_index_binary(instruction['rs1'])
-        funct3_bits = COMPRESSED_L_FUNCT3[instruction['opcode']]
-        if instruction['opcode'] in [INSTRUCTION_C_SW, INSTRUCTION_C_FSW]:
-            imm_bits_part1, imm_bits_part2 = get_immediate_binary_5_compressed_l(instruction['imm'])
-        else:
-            imm_bits_part1, imm_bits_part2 = get_immediate_binary_5_compressed_l_d(instruction['imm'])
-        return funct3_bits + imm_bits_part1 + rs1_bits + imm_bits_part2 + rs2_bits + opcode_bits
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | template.encode_immediate(instruction.imm) |
+            (self._get_compressed_register_index(instruction.rs1, instruction) << 7) |
+            (self._get_compressed_register_index(instruction.rs2, instruction) << 2)
+        )
 
-    def _decode_compressed_store_sp_instruction(self) -> str:
-        instruction = self.parse_info
-        if instruction['opcode'] in [INSTRUCTION_C_SWSP, INSTRUCTION_C_FSWSP] and int(instruction['imm']) % 4 != 0:
-            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction['lineno']))
+    def _decode_compressed_store_sp_instruction(self, instruction, context) -> int:
+        opcode = instruction.mnemonic
+        if opcode in [INSTRUCTION_C_SWSP, INSTRUCTION_C_FSWSP] and instruction.imm % 4 != 0:
+            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
             raise Exception(error_message)
-        if instruction['opcode'] == INSTRUCTION_C_FSDSP and int(instruction['imm']) % 8 != 0:
-            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction['lineno']))
+        if opcode == INSTRUCTION_C_FSDSP and instruction.imm % 8 != 0:
+            error_message = 'Error: illegal immediate operand at line {}'.format(str(instruction.lineno))
             raise Exception(error_message)
-        opcode_bits = '10'
-        rs2_bits = get_register_index_binary(instruction['rs2'])
-        if instruction['opcode'] == INSTRUCTION_C_FSDSP:
-            imm_bits = get_immediate_binary_6_sdsp(instruction['imm'])
-        else:
-            imm_bits = get_immediate_binary_6_swsp(instruction['imm'])
-        funct3_bits = COMPRESSED_STORE_SP_FUNCT3[instruction['opcode']]
-        return funct3_bits + imm_bits + rs2_bits + opcode_bits
-
-    def _decode_compressed_j_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = '01'
-        imm_bits = get_immediate_binary_11_compressed_j(instruction['imm'])
-        funct3_bits = COMPRESSED_J_FUNCT3[instruction['opcode']]
-        return funct3_bits + imm_bits + opcode_bits
-
-    def _decode_compressed_j_r_instruction(self) -> str:
-        instruction = self.parse_info
-        if int(instruction['rs1']) == 0:
-            error_message = 'Error: illegal operands at line {}'.format(str(instruction['lineno']))
+        template = get_encoding_template(instruction)
+        return template.base_word | template.encode_immediate(instruction.imm) | (instruction.rs2 << 2)
+
+    def _decode_compressed_j_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return template.base_word | template.encode_immediate(self._get_pc_relative_offset(instruction, context))
+
+    def _decode_compressed_j_r_instruction(self, instruction, context) -> int:
+        if instruction.rs1 == 0:
+            error_message = 'Error: illegal operands at line {}'.format(str(instruction.lineno))
             raise Exception(error_message)
+        template = get_encoding_template(instruction)
+        return template.base_word | (instruction.rs1 << 7)
 
-        opcode_bits = '10'
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        funct4_bits = COMPRESSED_J_R_FUNCT4[instruction['opcode']]
-        return funct4_bits + rs1_bits + '00000' + opcode_bits
-
-    def _decode_floating_point_r_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = FLOATING_POINT_R_OPCODE
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        rs2_bits = get_register_index_binary(instruction['rs2'])
-        rm_funct3_bits = instruction['rm_funct3']
-        funct7_bits = FLOATING_POINT_R_FUNCT7[instruction['opcode']]
-        return funct7_bits + rs2_bits + rs1_bits + rm_funct3_bits + rd_bits + opcode_bits
-
-    def _decode_floating_point_r4_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = FLOATING_POINT_R4_OPCODE[instruction['opcode']]
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        rs2_bits = get_register_index_binary(instruction['rs2'])
-        rs3_bits = get_register_index_binary(instruction['rs3'])
-        rm_funct3_bits = instruction['rm_funct3']
-        return rs3_bits + '00' + rs2_bits + rs1_bits + rm_funct3_bits + rd_bits + opcode_bits
-
-    def _decode_atomic_instruction(self) -> str:
-        instruction = self.parse_info
-        opcode_bits = ATOMIC_OPCODE
-        rd_bits = get_register_index_binary(instruction['rd'])
-        rs1_bits = get_register_index_binary(instruction['rs1'])
-        rs2_bits = get_register_index_binary(instruction['rs2'])
-        funct3_bits = ATOMIC_FUNCT3
-        funct5_bits = ATOMIC_FUNCT5[instruction['opcode']]
-        aq_rl_bits = instruction['aq_rl']
-        return funct5_bits + aq_rl_bits + rs2_bits + rs1_bits + funct3_bits + rd_bits + opcode_bits
-
-    def find_labels_pass(self) -> None:
-        self.instruction_address = 0
-        for line in self.assembly_sequence.splitlines(keepends=True):
-            self.parse_info = parser.parse(line)
-            if self.parse_info['type'] == 'label':
-                self.labels_table[self.parse_info['label']] = self.instruction_address
-            else:
-                if 'compressed' in self.parse_info['type']:
-                    self.instruction_address += 2
-                elif 'instruction' in self.parse_info['type']:
-                    self.instruction_address += 4
+    def _decode_floating_point_r_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | (instruction.rs2 << 20) | (instruction.rs1 << 15) | (instruction.rm_funct3 << 12) |
+            (instruction.rd << 7)
+        )
 
-    def parse_instructions_pass(self) -> str:
-        binary_code = ""
-        self.instruction_address = 0
+    def _decode_floating_point_r4_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | (instruction.rs3 << 27) | (instruction.rs2 << 20) | (instruction.rs1 << 15) |
+            (instruction.rm_funct3 << 12) | (instruction.rd << 7)
+        )
+
+    def _decode_atomic_instruction(self, instruction, context) -> int:
+        template = get_encoding_template(instruction)
+        return (
+            template.base_word | (instruction.aq_rl << 25) | (instruction.rs2 << 20) | (instruction.rs1 << 15) |
+            (instruction.rd << 7)
+        )
+
+    def cache_info(self) -> dict:
+        return {'parse': self._parse_cached.cache_info(), 'encode': self._encode_cached.cache_info()}
+
+    def cache_clear(self) -> None:
+        self._parse_cached.cache_clear()
+        self._encode_cached.cache_clear()
 
-        reset_lineno()
-        for line in self.assembly_sequence.splitlines(keepends=True):
-            self.parse_info = parser.parse(line)
-            # print(self.parse_info)
+    def _parse_normalized_line(self, normalized_line: str) -> tuple:
+        return self._parse_line_uncached(normalized_line + '\n', 0)[:-1]
 
-            if 'instruction' in self.parse_info['type']:
-                binary_code += self.instruction_handlers[self.parse_info['type']]() + "\n"
-                if 'compressed' in self.parse_info['type']:
-                    self.instruction_address += 2
+    def _parse_line(self, line: str, lineno: int) -> Instruction:
+        try:
+            fields = self._parse_cached(' '.join(line.split()))
+        except Exception as e:
+            raise _move_cached_error(e, lineno) from None
+        return _new_tuple(Instruction, fields + (lineno,))
+
+    def _parse_line_uncached(self, line: str, lineno: int) -> Instruction:
+        if self.use_fast_path:
+            parse_info = fast_parse(line, lineno)
+            if parse_info is not None:
+                return parse_info
+        return self._ply_parse_line(line, lineno)
+
+    def _ply_parse_line(self, line: str, lineno: int, tokenfunc=None) -> Instruction:
+        lexer = get_lexer()
+        lexer.lineno = lineno
+        return get_parser().parse(line, lexer=lexer, tokenfunc=tokenfunc)
+
+    def find_labels_pass(self, context, source: str, first_lineno=1) -> None:
+        context.instruction_address = 0
+        context.parsed_instructions = []
+
+        for lineno, line in enumerate(source.splitlines(keepends=True), start=first_lineno):
+            parse_info = self._parse_line(line, lineno)
+            size = parse_info.size
+            if size:
+                context.parsed_instructions.append((context.instruction_address, parse_info))
+                context.instruction_address += size
+            elif parse_info.kind == InstructionKind.LABEL:
+                context.labels_table[parse_info.label] = context.instruction_address
+
+    def compress_instructions_pass(self, context):
+        return compress_instructions(context)
+
+    def relax_branches_pass(self, context) -> bool:
+        return relax_branches(context, self.far_jumps)
+
+    def _encode_record_items(self, record_items) -> int:
+        parse_info = Instruction._make(record_items + (0,))
+        return self.instruction_handlers[parse_info.kind](parse_info, AssemblyContext())
+
+    def encode_instruction(self, context, instruction_address, parse_info) -> int:
+        if parse_info.label is None:
+            try:
+                return self._encode_cached(parse_info[:-1])
+            except Exception as e:
+                raise _move_cached_error(e, parse_info.lineno) from None
+        context.instruction_address = instruction_address
+        return self.instruction_handlers[parse_info.kind](parse_info, context)
+
+    def parse_instructions_pass(self, context) -> list:
+        machine_code = []
+        for instruction_address, parse_info in context.parsed_instructions:
+            machine_code.append(self.encode_instruction(context, instruction_address, parse_info))
+
+        return machine_code
+
+    # Every instruction is yielded as soon as it is read. One that refers to a label not defined yet comes with word
+    # None, and a StreamedPatch with its word follows once the label is defined, so only unresolved fixups are kept.
+    # Branches are not relaxed; one whose label is out of range is reported as an error.
+    def assemble_stream(self, lines):
+        context = AssemblyContext()
+        unresolved_fixups = {}
+        instruction_address = 0
+
+        for lineno, line in enumerate(lines, start=1):
+            if not line.endswith('\n'):
+                line += '\n'
+            parse_info = self._parse_line(line, lineno)
+            size = parse_info.size
+            if size:
+                label = parse_info.label
+                if label is not None and label not in context.labels_table:
+                    unresolved_fixups.setdefault(label, []).append((instruction_address, parse_info))
+                    yield StreamedInstruction(instruction_address, None, size, lineno)
                 else:
-                    self.instruction_address += 4
+                    encoded = self.encode_instruction(context, instruction_address, parse_info)
+                    yield StreamedInstruction(instruction_address, encoded, size, lineno)
+                instruction_address += size
+            elif parse_info.kind == InstructionKind.LABEL:
+                context.labels_table[parse_info.label] = instruction_address
+                for fixup_address, fixup_info in unresolved_fixups.pop(parse_info.label, []):
+                    yield StreamedPatch(fixup_address, self.encode_instruction(context, fixup_address, fixup_info))
+
+        if unresolved_fixups:
+            parse_info = min((fixups[0][1] for fixups in unresolved_fixups.values()), key=lambda info: info.lineno)
+            error_message = 'Error: label {} not defined at line {}'.format(parse_info.label, str(parse_info.lineno))
+            raise Exception(error_message)
+
+    def assemble_source(self, source: str) -> AssemblyResult:
+        context = AssemblyContext()
+        self.find_labels_pass(context, source + "\n")
+        compression_report = self.compress_instructions_pass(context) if self.compress else None
+        self.relax_branches_pass(context)
+        machine_code = self.parse_instructions_pass(context)
+        return AssemblyResult(
+            bytes(build_image(machine_code)), machine_code, context.labels_table, compression_report
+        )
 
-        return binary_code
+    def assemble_lines(self, lines) -> AssemblyResult:
+        return self.assemble_source(''.join(line if line.endswith('\n') else line + '\n' for line in lines))
 
-    def assemble(self, filename) -> str:
+    def assemble(self, filename) -> list:
         try:
             with open(filename) as file:
-                self.assembly_sequence = file.read() + "\n"
-                self.find_labels_pass()
-                binary_code = self.parse_instructions_pass()
-                return binary_code
+                source = file.read()
         except IOError:
             error_message = 'Error: file {} not found'.format(filename)
             raise Exception(error_message)
+        return self.assemble_source(source).machine_code
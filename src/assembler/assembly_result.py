@@ -0,0 +1,28 @@
+from typing import NamedTuple
+
+
+class AssemblyResult(NamedTuple):
+    image: bytes
+    machine_code: list
+    labels_table: dict
+    compression_report: object = None
+
+    @property
+    def instruction_count(self) -> int:
+        return len(self.machine_code)
+
+    @property
+    def size(self) -> int:
+        return len(self.image)
+
+
+class StreamedInstruction(NamedTuple):
+    address: int
+    word: int
+    size: int
+    lineno: int
+
+
+class StreamedPatch(NamedTuple):
+    address: int
+    word: int
@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from assembler.assemblerisc import AssembleRisc, AssemblyContext
+from assembler.assembly_result import AssemblyResult
+from assembler.output_formats import build_image
+from assembler.parser import get_parser
+from assembler.relaxation import find_out_of_range_instructions
+from assembler.tokenizer import get_lexer
+
+
+CHUNKS_PER_WORKER = 4
+
+MIN_LINES_PER_CHUNK = 10000
+
+_labels_table = {}
+
+
+def initialize_worker() -> None:
+    get_lexer()
+    get_parser()
+
+
+def _initialize_resolver(labels_table) -> None:
+    global _labels_table
+    initialize_worker()
+    _labels_table = labels_table
+
+
+def read_source(filename) -> str:
+    try:
+        with open(filename) as file:
+            return file.read()
+    except IOError:
+        error_message = 'Error: file {} not found'.format(filename)
+        raise Exception(error_message)
+
+
+def read_image(filename) -> bytes:
+    try:
+        with open(filename, 'rb') as file:
+            return file.read()
+    except IOError:
+        error_message = 'Error: file {} not found'.format(filename)
+        raise Exception(error_message)
+
+
+def _assemble_file(filename) -> list:
+    return AssembleRisc().assemble(filename)
+
+
+def _assemble_source(source) -> AssemblyResult:
+    return AssembleRisc().assemble_source(source)
+
+
+def map_jobs(function, items, jobs) -> list:
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    chunk_size = max(1, len(items) // (jobs * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker) as executor:
+        return list(executor.map(function, items, chunksize=chunk_size))
+
+
+def assemble_many(filenames, jobs=None, cache=None) -> list:
+    filenames = list(filenames)
+    if cache is None:
+        return map_jobs(_assemble_file, filenames, jobs)
+
+    sources = [read_source(filename) for filename in filenames]
+    results = [cache.get(source) for source in sources]
+    missed_indexes = [index for index, result in enumerate(results) if result is None]
+    assembled_results = map_jobs(_assemble_source, [sources[index] for index in missed_indexes], jobs)
+    for index, result in zip(missed_indexes, assembled_results):
+        cache.put(sources[index], result)
+        results[index] = result
+    return [result.machine_code for result in results]
+
+
+def _parse_chunk(lines, first_lineno) -> tuple:
+    assembler = AssembleRisc()
+    context = AssemblyContext()
+    assembler.find_labels_pass(context, ''.join(lines), first_lineno)
+    chunk_size = context.instruction_address
+
+    machine_code = []
+    fixups = []
+    encode_error = None
+    for index, (instruction_address, parse_info) in enumerate(context.parsed_instructions):
+        if parse_info.label is not None:
+            machine_code.append(None)
+            fixups.append((index, instruction_address, parse_info))
+        elif encode_error is None:
+            try:
+                machine_code.append(assembler.encode_instruction(context, instruction_address, parse_info))
+            except Exception as e:
+                machine_code.append(None)
+                encode_error = (index, e)
+        else:
+            machine_code.append(None)
+    return context.labels_table, chunk_size, machine_code, fixups, encode_error
+
+
+def _resolve_fixups(fixups) -> tuple:
+    assembler = AssembleRisc()
+    context = AssemblyContext(_labels_table)
+    resolved = []
+    for index, instruction_address, parse_info in fixups:
+        try:
+            resolved.append((index, assembler.encode_instruction(context, instruction_address, parse_info)))
+        except Exception as e:
+            return resolved, (index, e)
+    return resolved, None
+
+
+def assemble_parallel(filename, jobs=None, chunk_lines=None, cache=None) -> list:
+    source = read_source(filename)
+    if cache is None:
+        return assemble_source_parallel(source, jobs, chunk_lines).machine_code
+    return cache.get_or_assemble(
+        source, lambda missed_source: assemble_source_parallel(missed_source, jobs, chunk_lines)
+    ).machine_code
+
+
+def assemble_source_parallel(source, jobs=None, chunk_lines=None) -> AssemblyResult:
+    lines = (source + "\n").splitlines(keepends=True)
+    jobs = jobs or os.cpu_count() or 1
+    chunk_lines = chunk_lines or max(MIN_LINES_PER_CHUNK, -(-len(lines) // (jobs * CHUNKS_PER_WORKER)))
+    if jobs == 1 or len(lines) <= chunk_lines:
+        return _assemble_source(source)
+
+    chunk_starts = range(0, len(lines), chunk_lines)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker) as executor:
+        chunks = list(executor.map(
+            _parse_chunk, [lines[start:start + chunk_lines] for start in chunk_starts],
+            [start + 1 for start in chunk_starts]
+        ))
+
+    labels_table = {}
+    chunk_fixups = []
+    chunk_address = 0
+    for chunk_labels, chunk_size, _, fixups, _ in chunks:
+        for label, label_address in chunk_labels.items():
+            labels_table[label] = chunk_address + label_address
+        chunk_fixups.append([
+            (index, chunk_address + instruction_address, parse_info)
+            for index, instruction_address, parse_info in fixups
+        ])
+        chunk_address += chunk_size
+    if find_out_of_range_instructions(
+        [(instruction_address, parse_info) for fixups in chunk_fixups for _, instruction_address, parse_info in fixups],
+        labels_table
+    ):
+        return _assemble_source(source)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_initialize_resolver, initargs=(labels_table,)) as executor:
+        resolutions = list(executor.map(_resolve_fixups, chunk_fixups))
+
+    machine_code = []
+    for (_, _, chunk_code, _, encode_error), (resolved, resolve_error) in zip(chunks, resolutions):
+        errors = [error for error in (encode_error, resolve_error) if error is not None]
+        if errors:
+            raise min(errors, key=lambda error: error[0])[1]
+        for index, code in resolved:
+            chunk_code[index] = code
+        machine_code.extend(chunk_code)
+    return AssemblyResult(bytes(build_image(machine_code)), machine_code, labels_table)
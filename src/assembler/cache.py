@@ -0,0 +1,131 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+from assembler.assembly_result import AssemblyResult
+from assembler.output_formats import build_image
+
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'assemblerisc'
+)
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+# Eviction goes below the limits, so that the following puts do not have to scan the directory again.
+EVICTION_TARGET = 0.9
+
+CACHE_ENTRY_SUFFIX = '.json'
+
+_assembler_version = None
+
+
+def get_assembler_version() -> str:
+    global _assembler_version
+    if _assembler_version is None:
+        version_hash = hashlib.sha256()
+        for module_filename in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+            with open(module_filename, 'rb') as module_file:
+                version_hash.update(module_file.read())
+        _assembler_version = version_hash.hexdigest()
+    return _assembler_version
+
+
+class AssemblyCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIRECTORY, max_entries=DEFAULT_MAX_ENTRIES, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entry_sizes = None
+        self._total_size = 0
+
+    def get_key(self, source: str) -> str:
+        source_hash = hashlib.sha256(get_assembler_version().encode())
+        source_hash.update(source.encode())
+        return source_hash.hexdigest()
+
+    def _entry_filename(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_ENTRY_SUFFIX)
+
+    def get(self, source: str):
+        entry_filename = self._entry_filename(self.get_key(source))
+        try:
+            with open(entry_filename) as entry_file:
+                entry = json.load(entry_file)
+            machine_code = entry['machine_code']
+            result = AssemblyResult(bytes(build_image(machine_code)), machine_code, entry['labels_table'])
+            os.utime(entry_filename)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, source: str, result: AssemblyResult) -> None:
+        entry_text = json.dumps({'machine_code': result.machine_code, 'labels_table': result.labels_table})
+        entry_filename = self._entry_filename(self.get_key(source))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, temporary_filename = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(file_descriptor, 'w') as entry_file:
+                entry_file.write(entry_text)
+            os.replace(temporary_filename, entry_filename)
+            self._track_entry(entry_filename, len(entry_text))
+        except OSError:
+            pass
+
+    def get_or_assemble(self, source: str, assemble_function) -> AssemblyResult:
+        result = self.get(source)
+        if result is None:
+            result = assemble_function(source)
+            self.put(source, result)
+        return result
+
+    def _scan_entries(self) -> list:
+        entries = []
+        for entry_filename in glob.glob(os.path.join(self.directory, '*' + CACHE_ENTRY_SUFFIX)):
+            try:
+                entry_stat = os.stat(entry_filename)
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_filename))
+        return entries
+
+    def _track_entry(self, entry_filename, entry_size: int) -> None:
+        # The directory is scanned once, then the sizes are tracked in memory. Entries written by other processes are
+        # only seen by the scan that each eviction starts with.
+        if self._entry_sizes is None:
+            self._entry_sizes = {filename: size for _, size, filename in self._scan_entries()}
+            self._total_size = sum(self._entry_sizes.values())
+        else:
+            self._total_size += entry_size - self._entry_sizes.get(entry_filename, 0)
+            self._entry_sizes[entry_filename] = entry_size
+        if len(self._entry_sizes) > self.max_entries or self._total_size > self.max_size:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._scan_entries(), reverse=True)
+        max_entries = int(self.max_entries * EVICTION_TARGET)
+        max_size = self.max_size * EVICTION_TARGET
+
+        self._entry_sizes = {}
+        total_size = 0
+        for index, (_, entry_size, entry_filename) in enumerate(entries):
+            total_size += entry_size
+            if index >= max_entries or total_size > max_size:
+                try:
+                    os.remove(entry_filename)
+                except OSError:
+                    pass
+            else:
+                self._entry_sizes[entry_filename] = entry_size
+        self._total_size = sum(self._entry_sizes.values())
+
+    def clear(self) -> None:
+        for entry_filename in glob.glob(os.path.join(self.directory, '*' + CACHE_ENTRY_SUFFIX)):
+            os.remove(entry_filename)
+        self._entry_sizes = None
+        self._total_size = 0
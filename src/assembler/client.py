@@ -0,0 +1,56 @@
+import getpass
+import json
+import os
+import socket
+import struct
+import tempfile
+
+from assembler.assembly_result import AssemblyResult
+from assembler.output_formats import split_image
+
+
+DEFAULT_SOCKET_PATH = os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR', tempfile.gettempdir()), 'assemblerisc-{}.sock'.format(getpass.getuser())
+)
+
+MESSAGE_LENGTH = struct.Struct('>I')
+
+
+class AssemblerClient:
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(socket_path)
+        except OSError:
+            self.socket.close()
+            error_message = 'Error: no assembler server listening on {}'.format(socket_path)
+            raise Exception(error_message)
+        self.file = self.socket.makefile('rwb')
+
+    def _read_message(self) -> bytes:
+        header = self.file.read(MESSAGE_LENGTH.size)
+        if len(header) < MESSAGE_LENGTH.size:
+            error_message = 'Error: connection to the assembler server closed'
+            raise Exception(error_message)
+        length, = MESSAGE_LENGTH.unpack(header)
+        return self.file.read(length)
+
+    def _request(self, request) -> AssemblyResult:
+        body = json.dumps(request).encode()
+        self.file.write(MESSAGE_LENGTH.pack(len(body)) + body)
+        self.file.flush()
+        header = json.loads(self._read_message())
+        image = self._read_message()
+        if 'error' in header:
+            raise Exception(header['error'])
+        return AssemblyResult(image, split_image(image), header['labels_table'])
+
+    def assemble_source(self, source: str) -> AssemblyResult:
+        return self._request({'source': source})
+
+    def assemble_file(self, filename) -> AssemblyResult:
+        return self._request({'path': os.path.abspath(filename)})
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
@@ -0,0 +1,280 @@
+from bisect import bisect_left
+from itertools import accumulate
+from typing import NamedTuple
+
+from assembler.instruction_info import *
+from assembler.instruction_ir import InstructionKind, OPCODE_IDS
+from assembler.relaxation import (
+    COMPRESSED_B_OFFSET_RANGE, COMPRESSED_J_OFFSET_RANGE, PC_RELATIVE_OFFSET_RANGES, fits_offset
+)
+
+
+class CompressionReport(NamedTuple):
+    instruction_count: int
+    compressed_count: int
+    original_size: int
+    compressed_size: int
+
+    @property
+    def saved_size(self) -> int:
+        return self.original_size - self.compressed_size
+
+
+def is_compressed_register(index: int) -> bool:
+    return 8 <= index <= 15
+
+
+def fits_signed(value: int, bits: int) -> bool:
+    return -(1 << (bits - 1)) <= value < (1 << (bits - 1))
+
+
+def fits_scaled(value: int, scale: int, limit: int) -> bool:
+    return 0 <= value <= limit and value % scale == 0
+
+
+def _compressed(parse_info, opcode: str, kind, **fields):
+    return parse_info._replace(kind=kind, opcode=OPCODE_IDS[opcode], **fields)
+
+
+def _compress_addi(parse_info):
+    rd, rs1, imm = parse_info.rd, parse_info.rs1, parse_info.imm
+    if rd == 0:
+        if rs1 == 0 and imm == 0:
+            return _compressed(parse_info, INSTRUCTION_C_NOP, InstructionKind.COMPRESSED_I_INSTRUCTION)
+        return None
+    if rs1 == 0 and fits_signed(imm, 6):
+        return _compressed(parse_info, INSTRUCTION_C_LI, InstructionKind.COMPRESSED_I_INSTRUCTION)
+    if imm == 0:
+        return _compressed(parse_info, INSTRUCTION_C_MV, InstructionKind.COMPRESSED_R_INSTRUCTION, rs1=0, rs2=rs1)
+    if rd == rs1 == 2 and fits_signed(imm, 10) and imm % 16 == 0:
+        return _compressed(parse_info, INSTRUCTION_C_ADDI16SP, InstructionKind.COMPRESSED_I_INSTRUCTION, rs1=0)
+    if rd == rs1 and fits_signed(imm, 6):
+        return _compressed(parse_info, INSTRUCTION_C_ADDI, InstructionKind.COMPRESSED_I_INSTRUCTION, rs1=0)
+    if rs1 == 2 and is_compressed_register(rd) and imm != 0 and fits_scaled(imm, 4, 1020):
+        return _compressed(parse_info, INSTRUCTION_C_ADDI4SPN, InstructionKind.COMPRESSED_I_INSTRUCTION, rs1=0)
+    return None
+
+
+def _compress_andi(parse_info):
+    if parse_info.rd == parse_info.rs1 and is_compressed_register(parse_info.rd) and fits_signed(parse_info.imm, 6):
+        return _compressed(parse_info, INSTRUCTION_C_ANDI, InstructionKind.COMPRESSED_I_INSTRUCTION, rs1=0)
+    return None
+
+
+def _compress_slli(parse_info):
+    if parse_info.rd == parse_info.rs1 != 0 and 0 < parse_info.imm < 32:
+        return _compressed(parse_info, INSTRUCTION_C_SLLI, InstructionKind.COMPRESSED_I_INSTRUCTION, rs1=0)
+    return None
+
+
+def _compress_right_shift(parse_info):
+    if parse_info.rd == parse_info.rs1 and is_compressed_register(parse_info.rd) and 0 < parse_info.imm < 32:
+        opcode = INSTRUCTION_C_SRLI if parse_info.mnemonic == INSTRUCTION_SRLI else INSTRUCTION_C_SRAI
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_I_INSTRUCTION, rs1=0)
+    return None
+
+
+def _compress_lui(parse_info):
+    upper = parse_info.imm & 0xfffff
+    if upper & 0x80000:
+        upper -= 1 << 20
+    if parse_info.rd not in (0, 2) and upper != 0 and fits_signed(upper, 6):
+        return _compressed(parse_info, INSTRUCTION_C_LUI, InstructionKind.COMPRESSED_I_INSTRUCTION, imm=upper)
+    return None
+
+
+def _compress_add(parse_info):
+    rd, rs1, rs2 = parse_info.rd, parse_info.rs1, parse_info.rs2
+    if rd == 0 or (rs1 == 0 and rs2 == 0):
+        return None
+    if rs1 == 0 or rs2 == 0:
+        return _compressed(
+            parse_info, INSTRUCTION_C_MV, InstructionKind.COMPRESSED_R_INSTRUCTION, rs1=0, rs2=rs1 or rs2
+        )
+    if rd == rs1:
+        return _compressed(parse_info, INSTRUCTION_C_ADD, InstructionKind.COMPRESSED_R_INSTRUCTION, rs1=0)
+    if rd == rs2:
+        return _compressed(parse_info, INSTRUCTION_C_ADD, InstructionKind.COMPRESSED_R_INSTRUCTION, rs1=0, rs2=rs1)
+    return None
+
+
+COMPRESSED_ARITHMETIC_OPCODES = {
+    INSTRUCTION_SUB: INSTRUCTION_C_SUB,
+    INSTRUCTION_XOR: INSTRUCTION_C_XOR,
+    INSTRUCTION_OR: INSTRUCTION_C_OR,
+    INSTRUCTION_AND: INSTRUCTION_C_AND
+}
+
+
+def _compress_arithmetic(parse_info):
+    rd, rs1, rs2 = parse_info.rd, parse_info.rs1, parse_info.rs2
+    if not (is_compressed_register(rs1) and is_compressed_register(rs2)):
+        return None
+    opcode = COMPRESSED_ARITHMETIC_OPCODES[parse_info.mnemonic]
+    if rd == rs1:
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_R_INSTRUCTION, rs1=0)
+    if rd == rs2 and parse_info.mnemonic != INSTRUCTION_SUB:
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_R_INSTRUCTION, rs1=0, rs2=rs1)
+    return None
+
+
+def _compress_load(parse_info):
+    is_float = parse_info.mnemonic == INSTRUCTION_FLW
+    if parse_info.rs1 == 2 and (is_float or parse_info.rd != 0) and fits_scaled(parse_info.imm, 4, 252):
+        opcode = INSTRUCTION_C_FLWSP if is_float else INSTRUCTION_C_LWSP
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_I_INSTRUCTION, rs1=0)
+    if (
+        is_compressed_register(parse_info.rd) and is_compressed_register(parse_info.rs1) and
+        fits_scaled(parse_info.imm, 4, 124)
+    ):
+        opcode = INSTRUCTION_C_FLW if is_float else INSTRUCTION_C_LW
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_L_LOAD_INSTRUCTION)
+    return None
+
+
+def _compress_store(parse_info):
+    is_float = parse_info.mnemonic == INSTRUCTION_FSW
+    if parse_info.rs1 == 2 and fits_scaled(parse_info.imm, 4, 252):
+        opcode = INSTRUCTION_C_FSWSP if is_float else INSTRUCTION_C_SWSP
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_STORE_SP_INSTRUCTION, rs1=0)
+    if (
+        is_compressed_register(parse_info.rs2) and is_compressed_register(parse_info.rs1) and
+        fits_scaled(parse_info.imm, 4, 124)
+    ):
+        opcode = INSTRUCTION_C_FSW if is_float else INSTRUCTION_C_SW
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_L_STORE_INSTRUCTION)
+    return None
+
+
+def _compress_jalr(parse_info):
+    if parse_info.imm == 0 and parse_info.rs1 != 0 and parse_info.rd in (0, 1):
+        opcode = INSTRUCTION_C_JR if parse_info.rd == 0 else INSTRUCTION_C_JALR
+        return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_J_R_INSTRUCTION, rd=0)
+    return None
+
+
+def _compress_ebreak(parse_info):
+    return _compressed(parse_info, INSTRUCTION_C_EBREAK, InstructionKind.COMPRESSED_I_INSTRUCTION, imm=0x20)
+
+
+def _compress_branch(parse_info):
+    if parse_info.label is None:
+        return None
+    rs1, rs2 = parse_info.rs1, parse_info.rs2
+    if rs2 == 0 and is_compressed_register(rs1):
+        register = rs1
+    elif rs1 == 0 and is_compressed_register(rs2):
+        register = rs2
+    else:
+        return None
+    opcode = INSTRUCTION_C_BEQZ if parse_info.mnemonic == INSTRUCTION_BEQ else INSTRUCTION_C_BNEZ
+    return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_B_INSTRUCTION, rs1=register, rs2=0)
+
+
+def _compress_jal(parse_info):
+    if parse_info.label is None or parse_info.rd not in (0, 1):
+        return None
+    opcode = INSTRUCTION_C_J if parse_info.rd == 0 else INSTRUCTION_C_JAL
+    return _compressed(parse_info, opcode, InstructionKind.COMPRESSED_J_INSTRUCTION, rd=0)
+
+
+COMPRESSION_RULES = {
+    INSTRUCTION_ADDI: _compress_addi,
+    INSTRUCTION_ANDI: _compress_andi,
+    INSTRUCTION_SLLI: _compress_slli,
+    INSTRUCTION_SRLI: _compress_right_shift,
+    INSTRUCTION_SRAI: _compress_right_shift,
+    INSTRUCTION_LUI: _compress_lui,
+    INSTRUCTION_ADD: _compress_add,
+    INSTRUCTION_SUB: _compress_arithmetic,
+    INSTRUCTION_XOR: _compress_arithmetic,
+    INSTRUCTION_OR: _compress_arithmetic,
+    INSTRUCTION_AND: _compress_arithmetic,
+    INSTRUCTION_LW: _compress_load,
+    INSTRUCTION_FLW: _compress_load,
+    INSTRUCTION_SW: _compress_store,
+    INSTRUCTION_FSW: _compress_store,
+    INSTRUCTION_JALR: _compress_jalr,
+    INSTRUCTION_EBREAK: _compress_ebreak
+}
+
+# Branches and jumps to labels are only compressed once their offset is known to fit, see compress_instructions.
+PC_RELATIVE_COMPRESSION_RULES = {
+    INSTRUCTION_BEQ: (_compress_branch, COMPRESSED_B_OFFSET_RANGE),
+    INSTRUCTION_BNE: (_compress_branch, COMPRESSED_B_OFFSET_RANGE),
+    INSTRUCTION_JAL: (_compress_jal, COMPRESSED_J_OFFSET_RANGE)
+}
+
+
+def compress_instruction(parse_info):
+    rule = COMPRESSION_RULES.get(parse_info.mnemonic)
+    return None if rule is None else rule(parse_info)
+
+
+def _remap_offset(parse_info, index: int, old_addresses, new_addresses):
+    target_index = bisect_left(old_addresses, old_addresses[index] + parse_info.imm)
+    if target_index == len(old_addresses) or old_addresses[target_index] != old_addresses[index] + parse_info.imm:
+        return parse_info
+    return parse_info._replace(imm=new_addresses[target_index] - new_addresses[index])
+
+
+def compress_instructions(context) -> CompressionReport:
+    parsed_instructions = context.parsed_instructions
+    labels_table = context.labels_table
+    old_addresses = [address for address, _ in parsed_instructions] + [context.instruction_address]
+
+    instructions = []
+    candidates = []
+    for index, (_, parse_info) in enumerate(parsed_instructions):
+        compressed_instruction = None
+        if parse_info.mnemonic in PC_RELATIVE_COMPRESSION_RULES:
+            rule, offset_range = PC_RELATIVE_COMPRESSION_RULES[parse_info.mnemonic]
+            candidate = rule(parse_info)
+            if candidate is not None and parse_info.label in labels_table:
+                label_index = bisect_left(old_addresses, labels_table[parse_info.label])
+                candidates.append((index, label_index, candidate, offset_range))
+        else:
+            compressed_instruction = compress_instruction(parse_info)
+        instructions.append(parse_info if compressed_instruction is None else compressed_instruction)
+
+    # Compressing an instruction never moves two others apart, so a branch that fits stays in range as the rest
+    # shrinks; this loop only ever adds branches and ends once a pass compresses nothing new.
+    while candidates:
+        addresses = list(accumulate((instruction.size for instruction in instructions), initial=0))
+        remaining_candidates = []
+        for candidate in candidates:
+            index, label_index, compressed_instruction, offset_range = candidate
+            offset = addresses[label_index] - addresses[index] - (2 if label_index > index else 0)
+            if fits_offset(offset, offset_range):
+                instructions[index] = compressed_instruction
+            else:
+                remaining_candidates.append(candidate)
+        if len(remaining_candidates) == len(candidates):
+            break
+        candidates = remaining_candidates
+
+    new_addresses = list(accumulate((instruction.size for instruction in instructions), initial=0))
+    for label, address in labels_table.items():
+        labels_table[label] = new_addresses[bisect_left(old_addresses, address)]
+    for index, parse_info in enumerate(instructions):
+        if parse_info.label is None and parse_info.kind in PC_RELATIVE_OFFSET_RANGES:
+            instructions[index] = _remap_offset(parse_info, index, old_addresses, new_addresses)
+
+    context.parsed_instructions = list(zip(new_addresses, instructions))
+    context.instruction_address = new_addresses[-1]
+    return CompressionReport(
+        len(instructions),
+        sum(1 for (_, old_instruction), instruction in zip(parsed_instructions, instructions)
+            if instruction.size < old_instruction.size),
+        old_addresses[-1],
+        new_addresses[-1]
+    )
+
+
+def format_compression_report(report) -> str:
+    saved_percentage = 100 * report.saved_size / report.original_size if report.original_size else 0
+    return (
+        f'{report.compressed_count} of {report.instruction_count} instructions compressed, '
+        f'{report.original_size} -> {report.compressed_size} bytes ({report.saved_size} bytes, '
+        f'{saved_percentage:.1f}% saved)\n'
+    )
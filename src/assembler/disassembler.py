@@ -0,0 +1,603 @@
+from typing import NamedTuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from assembler.csr_registers import CSR_ENCODING_TABLE
+from assembler.encoding_templates import ENCODING_TEMPLATES
+from assembler.immediate_generator import *
+from assembler.instruction_info import *
+from assembler.instruction_ir import InstructionKind, OPCODE_NAMES
+from assembler.output_formats import is_compressed
+
+
+X_REGISTER_NAMES = tuple('x' + str(index) for index in range(32))
+F_REGISTER_NAMES = tuple('f' + str(index) for index in range(32))
+
+CSR_NAMES = {number: name for name, number in reversed(list(CSR_ENCODING_TABLE.items()))}
+
+ROUNDING_MODE_NAMES = {bits: name for name, bits in FLOATING_POINT_ROUNDING_MODES.items()}
+
+ATOMIC_ORDERING_SUFFIXES = ('', '.rl', '.aq', '.aqrl')
+
+MAJOR_OPCODE_MASK = 0x7f
+COMPRESSED_MAJOR_OPCODE_MASK = 0xe003
+
+LAYOUT_MASKS = {
+    'R': 0xfe00707f,
+    'I': 0x0000707f,
+    'S': 0x0000707f,
+    'B': 0x0000707f,
+    'U': 0x0000007f,
+    'J': 0x0000007f,
+    'R4': 0x0600007f,
+    'CR': 0xf003,
+    'CA': 0xfc63,
+    'CIW': 0xe003,
+    'CI': 0xe003,
+    'CB': 0xe003,
+    'CL': 0xe003,
+    'CS': 0xe003,
+    'CSS': 0xe003,
+    'CJ': 0xe003
+}
+
+RD_FIELD = 0x1f << 7
+RS1_FIELD = 0x1f << 15
+RS2_FIELD = 0x1f << 20
+FUNCT3_FIELD = 0x7 << 12
+FUNCT7_FIELD = 0x7f << 25
+AQ_RL_FIELD = 0x3 << 25
+IMMEDIATE_12_FIELD = 0xfff << 20
+COMPRESSED_RD_FIELD = 0x1f << 7
+COMPRESSED_RS2_FIELD = 0x1f << 2
+COMPRESSED_FUNCT2_FIELD = 0x3 << 10
+COMPRESSED_IMMEDIATE_6_FIELD = (0x1 << 12) | (0x1f << 2)
+
+FIXED_FIELDS = {
+    **{opcode: (FUNCT3_FIELD, funct3 << 12) for opcode, funct3 in FLOATING_POINT_R_FUNCT3.items()},
+    INSTRUCTION_ECALL: (IMMEDIATE_12_FIELD | RS1_FIELD | RD_FIELD, get_immediate_12(0)),
+    INSTRUCTION_EBREAK: (IMMEDIATE_12_FIELD | RS1_FIELD | RD_FIELD, get_immediate_12(1)),
+    INSTRUCTION_FSQRT_S: (RS2_FIELD, 0),
+    INSTRUCTION_FMV_X_W: (RS2_FIELD | FUNCT3_FIELD, 0b000 << 12),
+    INSTRUCTION_FMV_W_X: (RS2_FIELD | FUNCT3_FIELD, 0b000 << 12),
+    INSTRUCTION_FCLASS_S: (RS2_FIELD | FUNCT3_FIELD, 0b001 << 12),
+    INSTRUCTION_FCVT_W_S: (RS2_FIELD, 0 << 20),
+    INSTRUCTION_FCVT_WU_S: (RS2_FIELD, 1 << 20),
+    INSTRUCTION_FCVT_S_W: (RS2_FIELD, 0 << 20),
+    INSTRUCTION_FCVT_S_WU: (RS2_FIELD, 1 << 20),
+    INSTRUCTION_A_LR_W: (RS2_FIELD, 0),
+    INSTRUCTION_C_NOP: (COMPRESSED_RD_FIELD | COMPRESSED_IMMEDIATE_6_FIELD, 0),
+    INSTRUCTION_C_EBREAK: (COMPRESSED_RD_FIELD | COMPRESSED_IMMEDIATE_6_FIELD, get_immediate_6(0x20)),
+    INSTRUCTION_C_SLLI64: (COMPRESSED_IMMEDIATE_6_FIELD, 0),
+    INSTRUCTION_C_ADDI16SP: (COMPRESSED_RD_FIELD, 2 << 7),
+    INSTRUCTION_C_JR: (COMPRESSED_RS2_FIELD, 0),
+    INSTRUCTION_C_JALR: (COMPRESSED_RS2_FIELD, 0)
+}
+
+SIGNED_IMMEDIATE_ENCODERS = [
+    get_immediate_6, get_immediate_6_addi16sp, get_immediate_8_compressed_b, get_immediate_11_compressed_j,
+    get_immediate_12, get_immediate_12b, get_immediate_12s, get_immediate_20_jal
+]
+
+UNSIGNED_IMMEDIATE_INSTRUCTIONS = [INSTRUCTION_C_SLLI, INSTRUCTION_C_SRLI, INSTRUCTION_C_SRAI]
+
+
+class Decoding(NamedTuple):
+    opcode: str
+    layout: str
+    format_operands: object
+    decode_immediate: object = None
+
+
+def build_immediate_decoder(encode_immediate, signed: bool):
+    segments = []
+    sign_bit = 0
+    for value_bit in range(32):
+        code = encode_immediate(1 << value_bit)
+        if code == 0:
+            continue
+        code_bit = code.bit_length() - 1
+        sign_bit = value_bit
+        if segments:
+            last_code_bit, width, last_value_bit = segments[-1]
+            if last_code_bit + width == code_bit and last_value_bit + width == value_bit:
+                segments[-1][1] += 1
+                continue
+        segments.append([code_bit, 1, value_bit])
+    segments = tuple((code_bit, (1 << width) - 1, value_bit) for code_bit, width, value_bit in segments)
+    sign = (1 << sign_bit) if signed else 0
+
+    def decode_immediate(code: int) -> int:
+        value = 0
+        for code_shift, mask, value_shift in segments:
+            value |= ((code >> code_shift) & mask) << value_shift
+        if value & sign:
+            value -= sign << 1
+        return value
+
+    return decode_immediate
+
+
+def _rd(code: int) -> int:
+    return (code >> 7) & 0x1f
+
+
+def _rs1(code: int) -> int:
+    return (code >> 15) & 0x1f
+
+
+def _rs2(code: int) -> int:
+    return (code >> 20) & 0x1f
+
+
+def _compressed_rs2(code: int) -> int:
+    return (code >> 2) & 0x1f
+
+
+def _compressed_rd_prime(code: int) -> int:
+    return ((code >> 7) & 0x7) + 8
+
+
+def _compressed_rs2_prime(code: int) -> int:
+    return ((code >> 2) & 0x7) + 8
+
+
+def _rounding_mode_suffix(code: int):
+    rm = (code >> 12) & 0x7
+    if rm not in ROUNDING_MODE_NAMES:
+        return None
+    return '' if rm == FLOATING_POINT_ROUNDING_MODES['dyn'] else ', ' + ROUNDING_MODE_NAMES[rm]
+
+
+def _fence_modes(bits: int) -> str:
+    return ''.join(mode for mode in FENCE_ALL_MODES if bits & FENCE_MODE_BITS[mode])
+
+
+def _format_r_instruction(decoding, code: int) -> str:
+    return (
+        f'{decoding.opcode} {X_REGISTER_NAMES[_rd(code)]}, {X_REGISTER_NAMES[_rs1(code)]}, '
+        f'{X_REGISTER_NAMES[_rs2(code)]}'
+    )
+
+
+def _format_i_instruction(decoding, code: int) -> str:
+    opcode = decoding.opcode
+    if opcode in I_ENVIRONMENT_INSTRUCTIONS:
+        return opcode
+    if opcode in I_CSR_INSTRUCTIONS or opcode in I_CSRI_INSTRUCTIONS:
+        csr = code >> 20
+        source = X_REGISTER_NAMES[_rs1(code)] if opcode in I_CSR_INSTRUCTIONS else str(_rs1(code))
+        return f'{opcode} {X_REGISTER_NAMES[_rd(code)]}, {CSR_NAMES.get(csr, hex(csr))}, {source}'
+    return (
+        f'{opcode} {X_REGISTER_NAMES[_rd(code)]}, {X_REGISTER_NAMES[_rs1(code)]}, '
+        f'{decoding.decode_immediate(code)}'
+    )
+
+
+def _format_i_load_instruction(decoding, code: int) -> str:
+    registers = F_REGISTER_NAMES if decoding.opcode == INSTRUCTION_FLW else X_REGISTER_NAMES
+    return (
+        f'{decoding.opcode} {registers[_rd(code)]}, {decoding.decode_immediate(code)}'
+        f'({X_REGISTER_NAMES[_rs1(code)]})'
+    )
+
+
+def _format_u_instruction(decoding, code: int) -> str:
+    return f'{decoding.opcode} {X_REGISTER_NAMES[_rd(code)]}, {hex(decoding.decode_immediate(code))}'
+
+
+def _format_jal_instruction(decoding, code: int) -> str:
+    return f'{decoding.opcode} {X_REGISTER_NAMES[_rd(code)]}, {decoding.decode_immediate(code)}'
+
+
+def _format_jalr_instruction(decoding, code: int) -> str:
+    return (
+        f'{decoding.opcode} {X_REGISTER_NAMES[_rd(code)]}, {decoding.decode_immediate(code)}'
+        f'({X_REGISTER_NAMES[_rs1(code)]})'
+    )
+
+
+def _format_b_instruction(decoding, code: int) -> str:
+    return (
+        f'{decoding.opcode} {X_REGISTER_NAMES[_rs1(code)]}, {X_REGISTER_NAMES[_rs2(code)]}, '
+        f'{decoding.decode_immediate(code)}'
+    )
+
+
+def _format_s_instruction(decoding, code: int) -> str:
+    registers = F_REGISTER_NAMES if decoding.opcode == INSTRUCTION_FSW else X_REGISTER_NAMES
+    return (
+        f'{decoding.opcode} {registers[_rs2(code)]}, {decoding.decode_immediate(code)}'
+        f'({X_REGISTER_NAMES[_rs1(code)]})'
+    )
+
+
+def _format_fence_instruction(decoding, code: int):
+    if decoding.opcode == INSTRUCTION_FENCE_I:
+        return decoding.opcode if code & ~LAYOUT_MASKS['I'] == 0 else None
+    pred, succ = (code >> 24) & 0xf, (code >> 20) & 0xf
+    if code & ~(LAYOUT_MASKS['I'] | (0xff << 20)) != 0 or pred == 0 or succ == 0:
+        return None
+    if pred == succ == FENCE_MODE_BITS['i'] | FENCE_MODE_BITS['o'] | FENCE_MODE_BITS['r'] | FENCE_MODE_BITS['w']:
+        return decoding.opcode
+    return f'{decoding.opcode} {_fence_modes(pred)}, {_fence_modes(succ)}'
+
+
+def _format_compressed_r_instruction(decoding, code: int):
+    if decoding.layout == 'CA':
+        return (
+            f'{decoding.opcode} {X_REGISTER_NAMES[_compressed_rd_prime(code)]}, '
+            f'{X_REGISTER_NAMES[_compressed_rs2_prime(code)]}'
+        )
+    if _rd(code) == 0:
+        return None
+    return f'{decoding.opcode} {X_REGISTER_NAMES[_rd(code)]}, {X_REGISTER_NAMES[_compressed_rs2(code)]}'
+
+
+def _format_compressed_i_instruction(decoding, code: int):
+    opcode = decoding.opcode
+    imm = decoding.decode_immediate(code)
+    if decoding.layout == 'CIW':
+        if imm == 0:
+            return None
+        return f'{opcode} {X_REGISTER_NAMES[_compressed_rs2_prime(code)]}, x2, {imm}'
+    elif decoding.layout == 'CB':
+        return f'{opcode} {X_REGISTER_NAMES[_compressed_rd_prime(code)]}, {imm}'
+    elif opcode in [INSTRUCTION_C_NOP, INSTRUCTION_C_EBREAK]:
+        return opcode
+    elif opcode == INSTRUCTION_C_SLLI64:
+        return f'{opcode} {X_REGISTER_NAMES[_rd(code)]}'
+    elif opcode == INSTRUCTION_C_ADDI16SP:
+        return f'{opcode} x2, {imm}' if imm != 0 else None
+    elif opcode in [INSTRUCTION_C_LWSP, INSTRUCTION_C_FLWSP, INSTRUCTION_C_FLDSP]:
+        registers = X_REGISTER_NAMES if opcode == INSTRUCTION_C_LWSP else F_REGISTER_NAMES
+        return f'{opcode} {registers[_rd(code)]}, {imm}(x2)'
+    return f'{opcode} {X_REGISTER_NAMES[_rd(code)]}, {imm}'
+
+
+def _format_compressed_b_instruction(decoding, code: int) -> str:
+    return f'{decoding.opcode} {X_REGISTER_NAMES[_compressed_rd_prime(code)]}, {decoding.decode_immediate(code)}'
+
+
+def _format_compressed_l_instruction(decoding, code: int) -> str:
+    registers = X_REGISTER_NAMES if decoding.opcode in [INSTRUCTION_C_LW, INSTRUCTION_C_SW] else F_REGISTER_NAMES
+    return (
+        f'{decoding.opcode} {registers[_compressed_rs2_prime(code)]}, {decoding.decode_immediate(code)}'
+        f'({X_REGISTER_NAMES[_compressed_rd_prime(code)]})'
+    )
+
+
+def _format_compressed_store_sp_instruction(decoding, code: int) -> str:
+    registers = X_REGISTER_NAMES if decoding.opcode == INSTRUCTION_C_SWSP else F_REGISTER_NAMES
+    return f'{decoding.opcode} {registers[_compressed_rs2(code)]}, {decoding.decode_immediate(code)}(x2)'
+
+
+def _format_compressed_j_instruction(decoding, code: int) -> str:
+    return f'{decoding.opcode} {decoding.decode_immediate(code)}'
+
+
+def _format_compressed_j_r_instruction(decoding, code: int):
+    if _rd(code) == 0:
+        return None
+    return f'{decoding.opcode} {X_REGISTER_NAMES[_rd(code)]}'
+
+
+def _format_floating_point_r_instruction(decoding, code: int):
+    opcode = decoding.opcode
+    rd, rs1, rs2 = _rd(code), _rs1(code), _rs2(code)
+    if opcode in FLOATING_POINT_R_FUNCT3:
+        registers = (
+            X_REGISTER_NAMES if opcode in FLOATING_POINT_R_WITH_FUNCT3_DEST_X_INSTRUCTIONS else F_REGISTER_NAMES
+        )
+        return f'{opcode} {registers[rd]}, {F_REGISTER_NAMES[rs1]}, {F_REGISTER_NAMES[rs2]}'
+    if opcode in [INSTRUCTION_FMV_X_W, INSTRUCTION_FCLASS_S]:
+        return f'{opcode} {X_REGISTER_NAMES[rd]}, {F_REGISTER_NAMES[rs1]}'
+    if opcode == INSTRUCTION_FMV_W_X:
+        return f'{opcode} {F_REGISTER_NAMES[rd]}, {X_REGISTER_NAMES[rs1]}'
+
+    suffix = _rounding_mode_suffix(code)
+    if suffix is None:
+        return None
+    if opcode in [INSTRUCTION_FCVT_W_S, INSTRUCTION_FCVT_WU_S]:
+        operands = f'{X_REGISTER_NAMES[rd]}, {F_REGISTER_NAMES[rs1]}'
+    elif opcode in FLOATING_POINT_CONVERT_2_FLOAT_INSTRUCTIONS:
+        operands = f'{F_REGISTER_NAMES[rd]}, {X_REGISTER_NAMES[rs1]}'
+    elif opcode == INSTRUCTION_FSQRT_S:
+        operands = f'{F_REGISTER_NAMES[rd]}, {F_REGISTER_NAMES[rs1]}'
+    else:
+        operands = f'{F_REGISTER_NAMES[rd]}, {F_REGISTER_NAMES[rs1]}, {F_REGISTER_NAMES[rs2]}'
+    return f'{opcode} {operands}{suffix}'
+
+
+def _format_floating_point_r4_instruction(decoding, code: int):
+    suffix = _rounding_mode_suffix(code)
+    if suffix is None:
+        return None
+    return (
+        f'{decoding.opcode} {F_REGISTER_NAMES[_rd(code)]}, {F_REGISTER_NAMES[_rs1(code)]}, '
+        f'{F_REGISTER_NAMES[_rs2(code)]}, {F_REGISTER_NAMES[code >> 27]}{suffix}'
+    )
+
+
+def _format_atomic_instruction(decoding, code: int) -> str:
+    opcode = decoding.opcode + ATOMIC_ORDERING_SUFFIXES[(code >> 25) & 0x3]
+    if decoding.opcode == INSTRUCTION_A_LR_W:
+        return f'{opcode} {X_REGISTER_NAMES[_rd(code)]}, ({X_REGISTER_NAMES[_rs1(code)]})'
+    return (
+        f'{opcode} {X_REGISTER_NAMES[_rd(code)]}, {X_REGISTER_NAMES[_rs2(code)]}, '
+        f'({X_REGISTER_NAMES[_rs1(code)]})'
+    )
+
+
+INSTRUCTION_FORMATTERS = {
+    InstructionKind.R_INSTRUCTION: _format_r_instruction,
+    InstructionKind.I_INSTRUCTION: _format_i_instruction,
+    InstructionKind.I_SHIFT_INSTRUCTION: _format_i_instruction,
+    InstructionKind.I_LOAD_INSTRUCTION: _format_i_load_instruction,
+    InstructionKind.U_INSTRUCTION: _format_u_instruction,
+    InstructionKind.JAL_INSTRUCTION: _format_jal_instruction,
+    InstructionKind.JALR_INSTRUCTION: _format_jalr_instruction,
+    InstructionKind.B_INSTRUCTION: _format_b_instruction,
+    InstructionKind.S_INSTRUCTION: _format_s_instruction,
+    InstructionKind.FENCE_INSTRUCTION: _format_fence_instruction,
+    InstructionKind.COMPRESSED_R_INSTRUCTION: _format_compressed_r_instruction,
+    InstructionKind.COMPRESSED_I_INSTRUCTION: _format_compressed_i_instruction,
+    InstructionKind.COMPRESSED_B_INSTRUCTION: _format_compressed_b_instruction,
+    InstructionKind.COMPRESSED_L_LOAD_INSTRUCTION: _format_compressed_l_instruction,
+    InstructionKind.COMPRESSED_L_STORE_INSTRUCTION: _format_compressed_l_instruction,
+    InstructionKind.COMPRESSED_STORE_SP_INSTRUCTION: _format_compressed_store_sp_instruction,
+    InstructionKind.COMPRESSED_J_INSTRUCTION: _format_compressed_j_instruction,
+    InstructionKind.COMPRESSED_J_R_INSTRUCTION: _format_compressed_j_r_instruction,
+    InstructionKind.FLOATING_POINT_R_INSTRUCTION: _format_floating_point_r_instruction,
+    InstructionKind.FLOATING_POINT_R4_INSTRUCTION: _format_floating_point_r4_instruction,
+    InstructionKind.ATOMIC_INSTRUCTION: _format_atomic_instruction
+}
+
+
+def get_decode_pattern(opcode_id: int) -> (int, int):
+    template = ENCODING_TEMPLATES[opcode_id]
+    mask = LAYOUT_MASKS[template.layout]
+    if template.kind == InstructionKind.I_SHIFT_INSTRUCTION:
+        mask |= FUNCT7_FIELD
+    elif template.kind == InstructionKind.FLOATING_POINT_R_INSTRUCTION:
+        mask &= ~FUNCT3_FIELD
+    elif template.kind == InstructionKind.ATOMIC_INSTRUCTION:
+        mask &= ~AQ_RL_FIELD
+    elif template.kind == InstructionKind.COMPRESSED_I_INSTRUCTION and template.layout == 'CB':
+        mask |= COMPRESSED_FUNCT2_FIELD
+    fixed_mask, fixed_value = FIXED_FIELDS.get(OPCODE_NAMES[opcode_id], (0, 0))
+    return mask | fixed_mask, template.base_word | fixed_value
+
+
+def get_major_opcode(code: int) -> int:
+    return code & (COMPRESSED_MAJOR_OPCODE_MASK if is_compressed(code) else MAJOR_OPCODE_MASK)
+
+
+def _build_decodings() -> tuple:
+    immediate_decoders = {}
+    decodings = [None] * len(OPCODE_NAMES)
+    for opcode_id, template in enumerate(ENCODING_TEMPLATES):
+        if template is None:
+            continue
+        opcode = OPCODE_NAMES[opcode_id]
+        decode_immediate = None
+        if template.encode_immediate is not None:
+            signed = (
+                template.encode_immediate in SIGNED_IMMEDIATE_ENCODERS and
+                opcode not in UNSIGNED_IMMEDIATE_INSTRUCTIONS
+            )
+            key = (template.encode_immediate, signed)
+            if key not in immediate_decoders:
+                immediate_decoders[key] = build_immediate_decoder(template.encode_immediate, signed)
+            decode_immediate = immediate_decoders[key]
+        decodings[opcode_id] = Decoding(
+            opcode, template.layout, INSTRUCTION_FORMATTERS[template.kind], decode_immediate
+        )
+    return tuple(decodings)
+
+
+def _build_decode_patterns() -> list:
+    patterns = [
+        get_decode_pattern(opcode_id) + (opcode_id,)
+        for opcode_id, template in enumerate(ENCODING_TEMPLATES) if template is not None
+    ]
+    return sorted(patterns, key=lambda pattern: -bin(pattern[0]).count('1'))
+
+
+def _build_decode_tables(patterns) -> dict:
+    tables = {}
+    for mask, match, opcode_id in patterns:
+        groups = tables.setdefault(get_major_opcode(match), {})
+        groups.setdefault(mask, {})[match] = opcode_id
+    return {major_opcode: tuple(groups.items()) for major_opcode, groups in tables.items()}
+
+
+DECODINGS = _build_decodings()
+
+DECODE_PATTERNS = _build_decode_patterns()
+
+DECODE_TABLES = _build_decode_tables(DECODE_PATTERNS)
+
+
+def find_opcode_id(code: int) -> int:
+    for mask, matches in DECODE_TABLES.get(get_major_opcode(code), ()):
+        opcode_id = matches.get(code & mask)
+        if opcode_id is not None:
+            return opcode_id
+    return -1
+
+
+def format_instruction(code: int, opcode_id: int = None) -> str:
+    if opcode_id is None:
+        opcode_id = find_opcode_id(code)
+    text = None
+    if opcode_id >= 0:
+        decoding = DECODINGS[opcode_id]
+        text = decoding.format_operands(decoding, code)
+    if text is None:
+        text = '.half 0x{0:04x}'.format(code) if is_compressed(code) else '.word 0x{0:08x}'.format(code)
+    return text
+
+
+def split_instructions(image) -> (list, list):
+    view = memoryview(image)
+    offsets, codes = [], []
+    offset = 0
+    while offset + 2 <= len(view):
+        size = 2 if is_compressed(view[offset]) else 4
+        if offset + size > len(view):
+            break
+        offsets.append(offset)
+        codes.append(int.from_bytes(view[offset:offset + size], 'little'))
+        offset += size
+    return offsets, codes
+
+
+def _split_instructions_vectorized(image):
+    halfwords = numpy.frombuffer(image, dtype='<u2', count=len(image) // 2).astype(numpy.uint32)
+    is_long = (halfwords & 0b11) == 0b11
+    index = numpy.arange(len(halfwords))
+    last_short = numpy.maximum.accumulate(numpy.where(is_long, -1, index))
+    run_position = index - last_short - 1
+    is_start = numpy.ones(len(halfwords), dtype=bool)
+    is_start[1:] = ~(is_long[:-1] & (run_position[:-1] & 1 == 0))
+    starts = numpy.flatnonzero(is_start)
+    if len(starts) and is_long[starts[-1]] and starts[-1] == len(halfwords) - 1:
+        starts = starts[:-1]
+    upper = halfwords[numpy.minimum(starts + 1, len(halfwords) - 1)]
+    codes = numpy.where(is_long[starts], halfwords[starts] | (upper << 16), halfwords[starts])
+    return starts * 2, codes
+
+
+def _find_opcode_ids_vectorized(codes):
+    opcode_ids = numpy.full(len(codes), -1, dtype=numpy.int32)
+    if len(codes) == 0:
+        return opcode_ids
+    major_opcodes = numpy.where(
+        (codes & 0b11) == 0b11, codes & MAJOR_OPCODE_MASK, codes & COMPRESSED_MAJOR_OPCODE_MASK
+    ).astype(numpy.uint16)
+    order = numpy.argsort(major_opcodes, kind='stable')
+    sorted_codes, sorted_major_opcodes = codes[order], major_opcodes[order]
+    sorted_opcode_ids = opcode_ids[order]
+    bounds = (numpy.flatnonzero(sorted_major_opcodes[1:] != sorted_major_opcodes[:-1]) + 1).tolist()
+    for start, end in zip([0] + bounds, bounds + [len(codes)]):
+        segment_codes, segment_opcode_ids = sorted_codes[start:end], sorted_opcode_ids[start:end]
+        for mask, matches, ids in _DECODE_ARRAYS.get(int(sorted_major_opcodes[start]), ()):
+            keys = segment_codes & mask
+            positions = numpy.minimum(numpy.searchsorted(matches, keys), len(matches) - 1)
+            hits = (matches[positions] == keys) & (segment_opcode_ids < 0)
+            segment_opcode_ids[hits] = ids[positions[hits]]
+    opcode_ids[order] = sorted_opcode_ids
+    return opcode_ids
+
+
+def _build_decode_arrays() -> dict:
+    return {
+        major_opcode: [
+            (
+                numpy.uint32(mask),
+                numpy.array(sorted(matches), dtype=numpy.uint32),
+                numpy.array([matches[match] for match in sorted(matches)], dtype=numpy.int32)
+            )
+            for mask, matches in groups
+        ]
+        for major_opcode, groups in DECODE_TABLES.items()
+    }
+
+
+_DECODE_ARRAYS = _build_decode_arrays() if numpy is not None else None
+
+
+def format_code(code: int) -> str:
+    return ('{0:04x}' if is_compressed(code) else '{0:08x}').format(code)
+
+
+def _format_trailing_bytes(image, end: int) -> str:
+    return '.byte ' + ', '.join('0x{0:02x}'.format(byte) for byte in bytes(image[end:]))
+
+
+def _decode_image_vectorized(image):
+    offsets, codes = _split_instructions_vectorized(image)
+    opcode_ids = _find_opcode_ids_vectorized(codes)
+    unique_codes, first_indexes, inverse = numpy.unique(codes, return_index=True, return_inverse=True)
+    unique_codes = unique_codes.tolist()
+    texts = [
+        format_instruction(code, opcode_id)
+        for code, opcode_id in zip(unique_codes, opcode_ids[first_indexes].tolist())
+    ]
+    end = int(offsets[-1]) + (2 if is_compressed(unique_codes[inverse[-1]]) else 4) if len(offsets) else 0
+    return offsets, inverse.reshape(-1), texts, [format_code(code) for code in unique_codes], end
+
+
+def _decode_image(image) -> (list, list, list, int):
+    offsets, codes = split_instructions(image)
+    formatted = {}
+    texts, code_texts = [], []
+    for code in codes:
+        text_and_code = formatted.get(code)
+        if text_and_code is None:
+            text_and_code = formatted[code] = (format_instruction(code), format_code(code))
+        texts.append(text_and_code[0])
+        code_texts.append(text_and_code[1])
+    end = offsets[-1] + (2 if is_compressed(codes[-1]) else 4) if offsets else 0
+    return offsets, code_texts, texts, end
+
+
+def decode_image(image, use_numpy=None) -> (list, list, list):
+    if numpy is not None if use_numpy is None else use_numpy:
+        offsets, inverse, unique_texts, unique_code_texts, end = _decode_image_vectorized(image)
+        offsets = offsets.tolist()
+        code_texts = numpy.array(unique_code_texts, dtype=object)[inverse].tolist()
+        texts = numpy.array(unique_texts, dtype=object)[inverse].tolist()
+    else:
+        offsets, code_texts, texts, end = _decode_image(image)
+    if end < len(image):
+        offsets.append(end)
+        code_texts.append('')
+        texts.append(_format_trailing_bytes(image, end))
+    return offsets, code_texts, texts
+
+
+def disassemble(image, use_numpy=None) -> list:
+    return decode_image(image, use_numpy)[2]
+
+
+def _format_listing_line(text: str, address: int, code_text: str) -> str:
+    return '{0:<40}# {1:08x}: {2}\n'.format(text, address, code_text)
+
+
+def _to_byte_rows(strings):
+    width = max(map(len, strings), default=0)
+    rows = b''.join(string.encode().ljust(width, bytes([_PADDING_BYTE])) for string in strings)
+    return numpy.frombuffer(rows, dtype=numpy.uint8).reshape(len(strings), width)
+
+
+def _to_hex_columns(values):
+    digits = max(8, len('{0:x}'.format(int(values.max()))) if len(values) else 8)
+    shifts = numpy.arange(4 * (digits - 1), -1, -4, dtype=numpy.uint64)
+    return _HEX_DIGITS[(values.astype(numpy.uint64)[:, None] >> shifts) & 0xf]
+
+
+_HEX_DIGITS = numpy.frombuffer(b'0123456789abcdef', dtype=numpy.uint8) if numpy is not None else None
+
+_PADDING_BYTE = 0xff
+
+
+def to_disassembly_listing(image, base_address: int = 0, use_numpy=None) -> str:
+    if numpy is not None if use_numpy is None else use_numpy:
+        offsets, inverse, unique_texts, unique_code_texts, end = _decode_image_vectorized(image)
+        prefixes = _to_byte_rows(['{0:<40}# '.format(text) for text in unique_texts])
+        suffixes = _to_byte_rows([': ' + code_text + '\n' for code_text in unique_code_texts])
+        lines = numpy.concatenate(
+            [prefixes[inverse], _to_hex_columns(offsets + base_address), suffixes[inverse]], axis=1
+        ).ravel()
+        listing = lines[lines != _PADDING_BYTE].tobytes().decode()
+    else:
+        offsets, code_texts, texts, end = _decode_image(image)
+        listing = ''.join(map(_format_listing_line, texts, [base_address + offset for offset in offsets], code_texts))
+    if end < len(image):
+        listing += _format_listing_line(_format_trailing_bytes(image, end), base_address + end, '')
+    return listing
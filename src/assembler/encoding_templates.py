@@ -0,0 +1,153 @@
+from typing import NamedTuple
+
+from assembler.instruction_info import *
+from assembler.immediate_generator import *
+from assembler.instruction_ir import InstructionKind, OPCODE_IDS, OPCODE_NAMES
+
+
+class EncodingTemplate(NamedTuple):
+    kind: InstructionKind
+    layout: str
+    base_word: int
+    encode_immediate: object = None
+
+
+def _build_templates() -> tuple:
+    templates = [None] * len(OPCODE_NAMES)
+
+    def add(opcodes, kind, layout, get_base_word, encode_immediate=None, immediate_encoders=None):
+        for opcode in opcodes:
+            templates[OPCODE_IDS[opcode]] = EncodingTemplate(
+                kind, layout, get_base_word(opcode), (immediate_encoders or {}).get(opcode, encode_immediate)
+            )
+
+    add(
+        R_FUNCT3, InstructionKind.R_INSTRUCTION, 'R',
+        lambda opcode: (R_FUNCT7[opcode] << 25) | (R_FUNCT3[opcode] << 12) | R_OPCODE
+    )
+    add(
+        [opcode for opcode in I_FUNCT3 if opcode not in I_SHIFT_FUNCT7], InstructionKind.I_INSTRUCTION, 'I',
+        lambda opcode: (I_FUNCT3[opcode] << 12) | (
+            I_SYSTEM_OPCODE if opcode in I_ENVIRONMENT_INSTRUCTIONS + I_CSR_INSTRUCTIONS + I_CSRI_INSTRUCTIONS
+            else I_OPCODE
+        ),
+        get_immediate_12
+    )
+    add(
+        I_SHIFT_FUNCT7, InstructionKind.I_SHIFT_INSTRUCTION, 'I',
+        lambda opcode: (I_SHIFT_FUNCT7[opcode] << 25) | (I_FUNCT3[opcode] << 12) | I_OPCODE,
+        get_immediate_5
+    )
+    add(
+        I_LOAD_FUNCT3, InstructionKind.I_LOAD_INSTRUCTION, 'I',
+        lambda opcode: (I_LOAD_FUNCT3[opcode] << 12) | I_LOAD_OPCODE[opcode],
+        get_immediate_12
+    )
+    add(U_OPCODE, InstructionKind.U_INSTRUCTION, 'U', lambda opcode: U_OPCODE[opcode], get_immediate_20)
+    add([INSTRUCTION_JAL], InstructionKind.JAL_INSTRUCTION, 'J', lambda opcode: JAL_OPCODE, get_immediate_20_jal)
+    add(
+        [INSTRUCTION_JALR], InstructionKind.JALR_INSTRUCTION, 'I',
+        lambda opcode: (JALR_FUNCT3 << 12) | JALR_OPCODE,
+        get_immediate_12
+    )
+    add(
+        B_FUNCT3, InstructionKind.B_INSTRUCTION, 'B',
+        lambda opcode: (B_FUNCT3[opcode] << 12) | B_OPCODE,
+        get_immediate_12b
+    )
+    add(
+        S_FUNCT3, InstructionKind.S_INSTRUCTION, 'S',
+        lambda opcode: (S_FUNCT3[opcode] << 12) | S_OPCODE[opcode],
+        get_immediate_12s
+    )
+    add(
+        FENCE_FUNCT3, InstructionKind.FENCE_INSTRUCTION, 'I',
+        lambda opcode: (FENCE_FUNCT3[opcode] << 12) | FENCE_OPCODE
+    )
+    add(
+        FLOATING_POINT_R_FUNCT7, InstructionKind.FLOATING_POINT_R_INSTRUCTION, 'R',
+        lambda opcode: (FLOATING_POINT_R_FUNCT7[opcode] << 25) | FLOATING_POINT_R_OPCODE
+    )
+    add(
+        FLOATING_POINT_R4_OPCODE, InstructionKind.FLOATING_POINT_R4_INSTRUCTION, 'R4',
+        lambda opcode: FLOATING_POINT_R4_OPCODE[opcode]
+    )
+    add(
+        ATOMIC_FUNCT5, InstructionKind.ATOMIC_INSTRUCTION, 'R',
+        lambda opcode: (ATOMIC_FUNCT5[opcode] << 27) | (ATOMIC_FUNCT3 << 12) | ATOMIC_OPCODE
+    )
+
+    add(
+        [INSTRUCTION_C_ADD, INSTRUCTION_C_MV], InstructionKind.COMPRESSED_R_INSTRUCTION, 'CR',
+        lambda opcode: (0b100 << 13) | (COMPRESSED_R_FUNCT[opcode] << 12) | 0b10
+    )
+    add(
+        [INSTRUCTION_C_SUB, INSTRUCTION_C_XOR, INSTRUCTION_C_OR, INSTRUCTION_C_AND],
+        InstructionKind.COMPRESSED_R_INSTRUCTION, 'CA',
+        lambda opcode: (0b100011 << 10) | (COMPRESSED_R_FUNCT[opcode] << 5) | 0b01
+    )
+    add(
+        [INSTRUCTION_C_ADDI4SPN], InstructionKind.COMPRESSED_I_INSTRUCTION, 'CIW',
+        lambda opcode: (COMPRESSED_I_FUNCT3[opcode] << 13) | COMPRESSED_I_OPCODE[opcode],
+        get_immediate_8_addi4spn
+    )
+    add(
+        [opcode for opcode in COMPRESSED_I_FUNCT3 if opcode != INSTRUCTION_C_ADDI4SPN],
+        InstructionKind.COMPRESSED_I_INSTRUCTION, 'CI',
+        lambda opcode: (COMPRESSED_I_FUNCT3[opcode] << 13) | COMPRESSED_I_OPCODE[opcode],
+        get_immediate_6,
+        {
+            INSTRUCTION_C_FLDSP: get_immediate_6_ldsp,
+            INSTRUCTION_C_LWSP: get_immediate_6_lwsp,
+            INSTRUCTION_C_FLWSP: get_immediate_6_lwsp,
+            INSTRUCTION_C_ADDI16SP: get_immediate_6_addi16sp
+        }
+    )
+    add(
+        COMPRESSED_I_FUNCT2, InstructionKind.COMPRESSED_I_INSTRUCTION, 'CB',
+        lambda opcode: (0b100 << 13) | (COMPRESSED_I_FUNCT2[opcode] << 10) | COMPRESSED_I_OPCODE[opcode],
+        get_immediate_6
+    )
+    add(
+        COMPRESSED_B_FUNCT3, InstructionKind.COMPRESSED_B_INSTRUCTION, 'CB',
+        lambda opcode: (COMPRESSED_B_FUNCT3[opcode] << 13) | 0b01,
+        get_immediate_8_compressed_b
+    )
+    add(
+        [INSTRUCTION_C_LW, INSTRUCTION_C_FLW, INSTRUCTION_C_FLD], InstructionKind.COMPRESSED_L_LOAD_INSTRUCTION, 'CL',
+        lambda opcode: COMPRESSED_L_FUNCT3[opcode] << 13,
+        get_immediate_5_compressed_l,
+        {INSTRUCTION_C_FLD: get_immediate_5_compressed_l_d}
+    )
+    add(
+        [INSTRUCTION_C_SW, INSTRUCTION_C_FSW, INSTRUCTION_C_FSD], InstructionKind.COMPRESSED_L_STORE_INSTRUCTION, 'CS',
+        lambda opcode: COMPRESSED_L_FUNCT3[opcode] << 13,
+        get_immediate_5_compressed_l,
+        {INSTRUCTION_C_FSD: get_immediate_5_compressed_l_d}
+    )
+    add(
+        COMPRESSED_STORE_SP_FUNCT3, InstructionKind.COMPRESSED_STORE_SP_INSTRUCTION, 'CSS',
+        lambda opcode: (COMPRESSED_STORE_SP_FUNCT3[opcode] << 13) | 0b10,
+        get_immediate_6_swsp,
+        {INSTRUCTION_C_FSDSP: get_immediate_6_sdsp}
+    )
+    add(
+        COMPRESSED_J_FUNCT3, InstructionKind.COMPRESSED_J_INSTRUCTION, 'CJ',
+        lambda opcode: (COMPRESSED_J_FUNCT3[opcode] << 13) | 0b01,
+        get_immediate_11_compressed_j
+    )
+    add(
+        COMPRESSED_J_R_FUNCT4, InstructionKind.COMPRESSED_J_R_INSTRUCTION, 'CR',
+        lambda opcode: (COMPRESSED_J_R_FUNCT4[opcode] << 12) | 0b10
+    )
+    return tuple(templates)
+
+
+ENCODING_TEMPLATES = _build_templates()
+
+
+def get_encoding_template(instruction) -> EncodingTemplate:
+    template = ENCODING_TEMPLATES[instruction.opcode]
+    if template is None or template.kind != instruction.kind:
+        raise KeyError(instruction.mnemonic)
+    return template
@@ -0,0 +1,122 @@
+import re
+
+from assembler.instruction_info import *
+from assembler.instruction_ir import Instruction, InstructionKind, OPCODE_IDS
+from assembler.pre_process import get_x_register_index, replacements
+from assembler.parser import to_int
+
+
+X_REGISTER_INDEXES = {
+    name: get_x_register_index(name)
+    for name in ['x' + str(index) for index in range(32)] +
+    [name for name, register in replacements.items() if register.startswith('x')]
+}
+
+_SEPARATOR = r'[ \t\r]*,[ \t\r]*'
+_OPERAND_REGISTER = r'([a-z0-9]+)'
+_OPERAND_IMMEDIATE = r'(0x[0-9a-fA-F]+|[+-]?[0-9]+)'
+
+_LINE = re.compile(r'[ \t\r]*([a-z]+)[ \t\r]+([^#\n]*?)[ \t\r]*(?:#[^\n]*)?\n\Z')
+
+_XREG_XREG_XREG = re.compile(
+    _OPERAND_REGISTER + _SEPARATOR + _OPERAND_REGISTER + _SEPARATOR + _OPERAND_REGISTER + r'\Z'
+)
+_XREG_XREG_IMM = re.compile(
+    _OPERAND_REGISTER + _SEPARATOR + _OPERAND_REGISTER + _SEPARATOR + _OPERAND_IMMEDIATE + r'\Z'
+)
+_XREG_IMM_LPAREN_XREG_RPAREN = re.compile(
+    _OPERAND_REGISTER + _SEPARATOR + _OPERAND_IMMEDIATE + r'[ \t\r]*\([ \t\r]*' + _OPERAND_REGISTER +
+    r'[ \t\r]*\)\Z'
+)
+
+
+def _parse_xreg_xreg_xreg(opcode: str, operands: str, lineno: int):
+    match = _XREG_XREG_XREG.match(operands)
+    if match is None:
+        return None
+    rd, rs1, rs2 = map(X_REGISTER_INDEXES.get, match.groups())
+    if rd is None or rs1 is None or rs2 is None:
+        return None
+    return Instruction(
+        InstructionKind.R_INSTRUCTION,
+        opcode=OPCODE_IDS[opcode],
+        rd=rd,
+        rs1=rs1,
+        rs2=rs2,
+        lineno=lineno
+    )
+
+
+def _parse_xreg_xreg_imm(opcode: str, operands: str, lineno: int):
+    match = _XREG_XREG_IMM.match(operands)
+    if match is None:
+        return None
+    first, second, imm = match.groups()
+    first, second = X_REGISTER_INDEXES.get(first), X_REGISTER_INDEXES.get(second)
+    if first is None or second is None:
+        return None
+    if opcode in B_INSTRUCTIONS:
+        return Instruction(
+            InstructionKind.B_INSTRUCTION,
+            opcode=OPCODE_IDS[opcode],
+            rs1=first,
+            rs2=second,
+            imm=to_int(imm),
+            lineno=lineno
+        )
+    return Instruction(
+        InstructionKind.I_SHIFT_INSTRUCTION if opcode in I_SHIFT_INSTRUCTIONS else InstructionKind.I_INSTRUCTION,
+        opcode=OPCODE_IDS[opcode],
+        rd=first,
+        rs1=second,
+        imm=to_int(imm),
+        lineno=lineno
+    )
+
+
+def _parse_xreg_imm_lparen_xreg_rparen(opcode: str, operands: str, lineno: int):
+    match = _XREG_IMM_LPAREN_XREG_RPAREN.match(operands)
+    if match is None:
+        return None
+    first, imm, rs1 = match.groups()
+    first, rs1 = X_REGISTER_INDEXES.get(first), X_REGISTER_INDEXES.get(rs1)
+    if first is None or rs1 is None:
+        return None
+    if opcode in S_INSTUCTIONS:
+        return Instruction(
+            InstructionKind.S_INSTRUCTION,
+            opcode=OPCODE_IDS[opcode],
+            rs2=first,
+            rs1=rs1,
+            imm=to_int(imm),
+            lineno=lineno
+        )
+    return Instruction(
+        InstructionKind.JALR_INSTRUCTION if opcode == INSTRUCTION_JALR else InstructionKind.I_LOAD_INSTRUCTION,
+        opcode=OPCODE_IDS[opcode],
+        rd=first,
+        rs1=rs1,
+        imm=to_int(imm),
+        lineno=lineno
+    )
+
+
+FAST_PATH_HANDLERS = {
+    **{opcode: _parse_xreg_xreg_xreg for opcode in R_INSTRUCTIONS},
+    **{opcode: _parse_xreg_xreg_imm for opcode in I_INSTRUCTIONS + I_SHIFT_INSTRUCTIONS + B_INSTRUCTIONS},
+    **{
+        opcode: _parse_xreg_imm_lparen_xreg_rparen
+        for opcode in I_LOAD_INSTRUCTIONS + S_INSTUCTIONS + [INSTRUCTION_JALR]
+    },
+}
+
+
+def fast_parse(line: str, lineno: int):
+    match = _LINE.match(line)
+    if match is None:
+        return None
+    opcode, operands = match.groups()
+    handler = FAST_PATH_HANDLERS.get(opcode)
+    if handler is None:
+        return None
+    return handler(opcode, operands, lineno)
@@ -0,0 +1,21 @@
+import os
+
+from assembler.tokenizer import build_lexer
+from assembler.parser import build_parser
+
+
+TABLE_MODULES = ['lextab.py', 'parsetab.py']
+
+
+def generate_tables() -> None:
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for table_module in TABLE_MODULES:
+        table_filename = os.path.join(directory, table_module)
+        if os.path.exists(table_filename):
+            os.remove(table_filename)
+    build_lexer()
+    build_parser()
+
+
+if __name__ == "__main__":
+    generate_tables()
@@ -1,124 +1,94 @@
-def get_register_index_binary(index) -> str:
-    return '{0:05b}'.format(int(index))
+def get_register_index(index: int) -> int:
+    return index & 0x1f
 
 
-def get_compressed_register_index_binary(index) -> str:
-    return '{0:03b}'.format(int(index) - 8)
+def get_compressed_register_index(index: int) -> int:
+    return (index - 8) & 0x7
 
 
-def get_immediate_binary_4(value) -> str:
-    value &= 0xf
-    return '{0:04b}'.format(int(value))
+def get_immediate_5(value) -> int:
+    return (value & 0x1f) << 20
 
 
-def get_immediate_binary_5(value) -> str:
-    value &= 0x1f
-    return '{0:05b}'.format(int(value))
-
-
-def get_immediate_binary_6(value) -> str:
+def get_immediate_6(value) -> int:
     value &= 0x3f
-    return '{0:06b}'.format(int(value))
-
-
-def get_immediate_binary_6_addi16sp(value) -> str:
-    value >>= 4
-    imm_bits = get_immediate_binary_6(value)
-    return imm_bits[0] + imm_bits[5] + imm_bits[3] + imm_bits[1:3] + imm_bits[4]
+    return ((value >> 5) << 12) | ((value & 0x1f) << 2)
 
 
-def get_immediate_binary_6_lwsp(value) -> str:
-    value >>= 2
-    imm_bits = get_immediate_binary_6(value)
-    return imm_bits[2] + imm_bits[3:6] + imm_bits[0:2]
+def get_immediate_6_addi16sp(value) -> int:
+    return (
+        (((value >> 9) & 0x1) << 12) | (((value >> 4) & 0x1) << 6) | (((value >> 6) & 0x1) << 5) |
+        (((value >> 7) & 0x3) << 3) | (((value >> 5) & 0x1) << 2)
+    )
 
 
-def get_immediate_binary_6_swsp(value) -> str:
-    value >>= 2
-    imm_bits = get_immediate_binary_6(value)
-    return imm_bits[2:6] + imm_bits[0:2]
+def get_immediate_6_lwsp(value) -> int:
+    return (((value >> 5) & 0x1) << 12) | (((value >> 2) & 0x7) << 4) | (((value >> 6) & 0x3) << 2)
 
 
-def get_immediate_binary_6_ldsp(value) -> str:
-    value >>= 3
-    imm_bits = get_immediate_binary_6(value)
-    return imm_bits[3] + imm_bits[4:6] + imm_bits[0:3]
+def get_immediate_6_swsp(value) -> int:
+    return (((value >> 2) & 0xf) << 9) | (((value >> 6) & 0x3) << 7)
 
 
-def get_immediate_binary_6_sdsp(value) -> str:
-    value >>= 3
-    imm_bits = get_immediate_binary_6(value)
-    return imm_bits[3:6] + imm_bits[0:3]
+def get_immediate_6_ldsp(value) -> int:
+    return (((value >> 5) & 0x1) << 12) | (((value >> 3) & 0x3) << 5) | (((value >> 6) & 0x7) << 2)
 
 
-def get_immediate_binary_8(value) -> str:
-    value &= 0xff
-    return '{0:08b}'.format(int(value))
+def get_immediate_6_sdsp(value) -> int:
+    return (((value >> 3) & 0x7) << 10) | (((value >> 6) & 0x7) << 7)
 
 
-def get_immediate_binary_8_addi4spn(value) -> str:
-    value >>= 2
-    imm_bits = get_immediate_binary_8(value)
-    return imm_bits[4:6] + imm_bits[0:4] + imm_bits[7] + imm_bits[6]
+def get_immediate_8_addi4spn(value) -> int:
+    return (
+        (((value >> 4) & 0x3) << 11) | (((value >> 6) & 0xf) << 7) |
+        (((value >> 2) & 0x1) << 6) | (((value >> 3) & 0x1) << 5)
+    )
 
 
-def get_immediate_binary_12(value) -> str:
-    value &= 0xfff
-    return '{0:012b}'.format(int(value))
+def get_immediate_12(value) -> int:
+    return (value & 0xfff) << 20
 
 
-def get_immediate_binary_12b(value) -> (str, str):
-    imm_bits = get_immediate_binary_12(value)
-    imm_bits_12_10to5 = imm_bits[0] + imm_bits[2:8]
-    imm_bits_4to1_11 = imm_bits[8:12] + imm_bits[1]
-    return imm_bits_12_10to5, imm_bits_4to1_11
+def get_immediate_12b(value) -> int:
+    return (
+        (((value >> 12) & 0x1) << 31) | (((value >> 5) & 0x3f) << 25) |
+        (((value >> 1) & 0xf) << 8) | (((value >> 11) & 0x1) << 7)
+    )
 
 
-def get_immediate_binary_12s(value) -> (str, str):
-    imm_bits = get_immediate_binary_12(value)
-    imm_bits_11to5 = imm_bits[0:7]
-    imm_bits_4to0 = imm_bits[7:12]
-    return imm_bits_11to5, imm_bits_4to0
+def get_immediate_12s(value) -> int:
+    return (((value >> 5) & 0x7f) << 25) | ((value & 0x1f) << 7)
 
 
-def get_immediate_binary_20(value) -> str:
-    value &= 0xfffff
-    return '{0:020b}'.format(int(value))
+def get_immediate_20(value) -> int:
+    return (value & 0xfffff) << 12
 
 
-def get_immediate_binary_20_jal(value) -> str:
-    value >>= 1
-    imm_bits = get_immediate_binary_20(value)
-    return imm_bits[0] + imm_bits[10:20] + imm_bits[9] + imm_bits[1:9]
+def get_immediate_20_jal(value) -> int:
+    return (
+        (((value >> 20) & 0x1) << 31) | (((value >> 1) & 0x3ff) << 21) |
+        (((value >> 11) & 0x1) << 20) | (((value >> 12) & 0xff) << 12)
+    )
 
 
-def get_immediate_binary_8_compressed_b(value) -> (str, str):
-    imm_bits = get_immediate_binary_8(value)
-    imm_bits_7to6_2to1_5 = imm_bits[1:3] + imm_bits[6:8] + imm_bits[3]
-    imm_bits_8_4to3 = imm_bits[0] + imm_bits[4:6]
-    return imm_bits_8_4to3, imm_bits_7to6_2to1_5
+def get_immediate_8_compressed_b(value) -> int:
+    return (
+        (((value >> 8) & 0x1) << 12) | (((value >> 3) & 0x3) << 10) | (((value >> 6) & 0x3) << 5) |
+        (((value >> 1) & 0x3) << 3) | (((value >> 5) & 0x1) << 2)
+    )
 
 
-def get_immediate_binary_5_compressed_l(value) -> (str, str):
-    value //= 4
-    imm_bits = get_immediate_binary_5(value)
-    imm_bits_5to3 = imm_bits[1:4]
-    imm_bits_2_6 = imm_bits[4] + imm_bits[0]
-    return imm_bits_5to3, imm_bits_2_6
+def get_immediate_5_compressed_l(value) -> int:
+    return (((value >> 3) & 0x7) << 10) | (((value >> 2) & 0x1) << 6) | (((value >> 6) & 0x1) << 5)
 
 
-def get_immediate_binary_5_compressed_l_d(value) -> (str, str):
-    value //= 8
-    imm_bits = get_immediate_binary_5(value)
-    imm_bits_5to3 = imm_bits[2:5]
-    imm_bits_7to6 = imm_bits[0:2]
-    return imm_bits_5to3, imm_bits_7to6
+def get_immediate_5_compressed_l_d(value) -> int:
+    return (((value >> 3) & 0x7) << 10) | (((value >> 6) & 0x3) << 5)
 
 
-def get_immediate_binary_11_compressed_j(value) -> str:
-    imm_bits = get_immediate_binary_12(value)
-    imm_bits = imm_bits[0:11]
+def get_immediate_11_compressed_j(value) -> int:
     return (
-            imm_bits[0] + imm_bits[7] + imm_bits[2:4] + imm_bits[1] +
-            imm_bits[5] + imm_bits[4] + imm_bits[8:11] + imm_bits[6]
+        (((value >> 11) & 0x1) << 12) | (((value >> 4) & 0x1) << 11) | (((value >> 8) & 0x3) << 9) |
+        (((value >> 10) & 0x1) << 8) | (((value >> 6) & 0x1) << 7) | (((value >> 7) & 0x1) << 6) |
+        (((value >> 1) & 0x7) << 3) | (((value >> 5) & 0x1) << 2)
     )
@@ -0,0 +1,161 @@
+from bisect import bisect_left
+from itertools import accumulate
+
+from assembler.assemblerisc import AssembleRisc, AssemblyContext
+from assembler.assembly_result import AssemblyResult
+from assembler.instruction_ir import InstructionKind
+from assembler.output_formats import build_image
+from assembler.relaxation import PC_RELATIVE_OFFSET_RANGES, find_out_of_range_instructions
+
+
+PC_RELATIVE_INSTRUCTIONS = list(PC_RELATIVE_OFFSET_RANGES)
+
+
+class IncrementalAssembler:
+    def __init__(self, assembler=None):
+        self.assembler = assembler or AssembleRisc()
+        self.context = AssemblyContext()
+        self.lines = []
+        self.parsed_lines = []
+        self.sizes = []
+        self.addresses = []
+        self.words = []
+        self.distances = []
+        self.errors = []
+        self.pc_relative_lines = []
+        self.label_counts = {}
+
+    @property
+    def labels_table(self) -> dict:
+        return self.context.labels_table
+
+    def _end_address(self) -> int:
+        return self.addresses[-1] + self.sizes[-1] if self.addresses else 0
+
+    def _encode_line(self, index) -> None:
+        parse_info = self.parsed_lines[index]
+        if parse_info.lineno != index + 1:
+            parse_info = self.parsed_lines[index] = parse_info.with_lineno(index + 1)
+        try:
+            self.words[index] = self.assembler.encode_instruction(self.context, self.addresses[index], parse_info)
+        except Exception as e:
+            self.words[index] = None
+            self.distances[index] = None
+            self.errors[index] = e
+            return
+        self.errors[index] = None
+        if parse_info.label is not None:
+            self.distances[index] = self.context.labels_table[parse_info.label] - self.addresses[index]
+
+    def assemble(self, source: str) -> AssemblyResult:
+        self.context = AssemblyContext()
+        self.lines, self.parsed_lines, self.sizes, self.addresses = [], [], [], []
+        self.words, self.distances, self.errors, self.pc_relative_lines = [], [], [], []
+        self.label_counts = {}
+        self.update(1, 0, source.splitlines())
+        return self.result()
+
+    def update(self, first_lineno, last_lineno, new_lines) -> list:
+        start, end = first_lineno - 1, last_lineno
+        if not 0 <= start <= end <= len(self.lines):
+            error_message = 'Error: invalid line range {}-{}'.format(first_lineno, last_lineno)
+            raise Exception(error_message)
+
+        new_lines = [line.rstrip('\n') for line in new_lines]
+        parsed_lines = [
+            self.assembler._parse_line(line + '\n', first_lineno + offset) for offset, line in enumerate(new_lines)
+        ]
+        sizes = [parse_info.size for parse_info in parsed_lines]
+        start_address = self.addresses[start] if start < len(self.addresses) else self._end_address()
+        addresses = list(accumulate(sizes, initial=start_address))[:-1]
+        address_delta = sum(sizes) - sum(self.sizes[start:end])
+        line_delta = len(new_lines) - (end - start)
+
+        labels_table = self.context.labels_table
+        old_labels = {
+            parse_info.label: labels_table.get(parse_info.label)
+            for parse_info in self.parsed_lines[start:end] if parse_info.kind == InstructionKind.LABEL
+        }
+        new_labels = {
+            parse_info.label: address
+            for parse_info, address in zip(parsed_lines, addresses) if parse_info.kind == InstructionKind.LABEL
+        }
+        duplicated_labels = set()
+        for parse_info in self.parsed_lines[start:end]:
+            if parse_info.kind == InstructionKind.LABEL:
+                self.label_counts[parse_info.label] -= 1
+                if self.label_counts[parse_info.label]:
+                    duplicated_labels.add(parse_info.label)
+        for parse_info in parsed_lines:
+            if parse_info.kind == InstructionKind.LABEL:
+                self.label_counts[parse_info.label] = self.label_counts.get(parse_info.label, 0) + 1
+                if self.label_counts[parse_info.label] > 1:
+                    duplicated_labels.add(parse_info.label)
+        for label in old_labels:
+            labels_table.pop(label, None)
+        if address_delta:
+            following_labels = set()
+            index = end
+            while index < len(self.sizes) and self.sizes[index] == 0:
+                if self.parsed_lines[index].kind == InstructionKind.LABEL:
+                    following_labels.add(self.parsed_lines[index].label)
+                index += 1
+            labels_table.update({
+                label: address + address_delta for label, address in labels_table.items()
+                if address > start_address or label in following_labels
+            })
+        labels_table.update(new_labels)
+
+        self.lines[start:end] = new_lines
+        self.parsed_lines[start:end] = parsed_lines
+        self.sizes[start:end] = sizes
+        self.addresses[start:end] = addresses
+        if address_delta:
+            tail = start + len(new_lines)
+            self.addresses[tail:] = [address + address_delta for address in self.addresses[tail:]]
+        self.words[start:end] = [None] * len(new_lines)
+        self.distances[start:end] = [None] * len(new_lines)
+        self.errors[start:end] = [None] * len(new_lines)
+        if duplicated_labels:
+            for index, parse_info in enumerate(self.parsed_lines):
+                if parse_info.kind == InstructionKind.LABEL and parse_info.label in duplicated_labels:
+                    labels_table[parse_info.label] = self.addresses[index]
+
+        low = bisect_left(self.pc_relative_lines, start)
+        high = bisect_left(self.pc_relative_lines, end)
+        new_pc_relative_lines = [
+            start + offset for offset, parse_info in enumerate(parsed_lines)
+            if parse_info.kind in PC_RELATIVE_INSTRUCTIONS
+        ]
+        self.pc_relative_lines[low:high] = new_pc_relative_lines
+        tail = low + len(new_pc_relative_lines)
+        if line_delta:
+            self.pc_relative_lines[tail:] = [index + line_delta for index in self.pc_relative_lines[tail:]]
+
+        encode_lines = [start + offset for offset, size in enumerate(sizes) if size]
+        if address_delta or old_labels != new_labels or duplicated_labels:
+            parsed_lines, addresses, distances = self.parsed_lines, self.addresses, self.distances
+            for index in self.pc_relative_lines[:low] + self.pc_relative_lines[tail:]:
+                target_address = labels_table.get(parsed_lines[index].label)
+                if target_address is None or target_address - addresses[index] != distances[index]:
+                    encode_lines.append(index)
+        if line_delta:
+            errors = self.errors
+            encode_lines.extend(
+                index for index in range(start + len(new_lines), len(errors)) if errors[index] is not None
+            )
+        encode_lines = sorted(set(encode_lines))
+        for index in encode_lines:
+            self._encode_line(index)
+        return [index + 1 for index in encode_lines]
+
+    def result(self) -> AssemblyResult:
+        errors = [error for error in self.errors if error is not None]
+        if errors and find_out_of_range_instructions(
+            [(self.addresses[index], self.parsed_lines[index]) for index in self.pc_relative_lines], self.labels_table
+        ):
+            return self.assembler.assemble_lines(self.lines)
+        if errors:
+            raise errors[0]
+        machine_code = [word for word in self.words if word is not None]
+        return AssemblyResult(bytes(build_image(machine_code)), machine_code, dict(self.context.labels_table))
@@ -261,305 +261,307 @@ ALL_INSTRUCTIONS = (
 )
 
 
-R_OPCODE = '0110011'
+R_OPCODE = 0b0110011
 
 I_LOAD_OPCODE = {
-    INSTRUCTION_LB: '0000011',
-    INSTRUCTION_LH: '0000011',
-    INSTRUCTION_LW: '0000011',
-    INSTRUCTION_LBU: '0000011',
-    INSTRUCTION_LHU: '0000011',
+    INSTRUCTION_LB: 0b0000011,
+    INSTRUCTION_LH: 0b0000011,
+    INSTRUCTION_LW: 0b0000011,
+    INSTRUCTION_LBU: 0b0000011,
+    INSTRUCTION_LHU: 0b0000011,
 
-    INSTRUCTION_FLW: '0000111'
+    INSTRUCTION_FLW: 0b0000111
 }
 
-I_OPCODE = '0010011'
+I_OPCODE = 0b0010011
 
-I_SYSTEM_OPCODE = '1110011'
+I_SYSTEM_OPCODE = 0b1110011
 
-FENCE_OPCODE = '0001111'
+FENCE_OPCODE = 0b0001111
 
 U_OPCODE = {
-    INSTRUCTION_LUI: '0110111',
-    INSTRUCTION_AUIPC: '0010111'
+    INSTRUCTION_LUI: 0b0110111,
+    INSTRUCTION_AUIPC: 0b0010111
 }
 
-B_OPCODE = '1100011'
+B_OPCODE = 0b1100011
 
 S_OPCODE = {
-    INSTRUCTION_SB: '0100011',
-    INSTRUCTION_SH: '0100011',
-    INSTRUCTION_SW: '0100011',
+    INSTRUCTION_SB: 0b0100011,
+    INSTRUCTION_SH: 0b0100011,
+    INSTRUCTION_SW: 0b0100011,
 
-    INSTRUCTION_FSW: '0100111'
+    INSTRUCTION_FSW: 0b0100111
 }
 
-JAL_OPCODE = '1101111'
+JAL_OPCODE = 0b1101111
 
-JALR_OPCODE = '1100111'
+JALR_OPCODE = 0b1100111
 
-FLOATING_POINT_R_OPCODE = '1010011'
+FLOATING_POINT_R_OPCODE = 0b1010011
 
 FLOATING_POINT_R4_OPCODE = {
-    INSTRUCTION_FMADD_S: '1000011',
-    INSTRUCTION_FMSUB_S: '1000111',
-    INSTRUCTION_FNMSUB_S: '1001011',
-    INSTRUCTION_FNMADD_S: '1001111'
+    INSTRUCTION_FMADD_S: 0b1000011,
+    INSTRUCTION_FMSUB_S: 0b1000111,
+    INSTRUCTION_FNMSUB_S: 0b1001011,
+    INSTRUCTION_FNMADD_S: 0b1001111
 }
 
-ATOMIC_OPCODE = '0101111'
+ATOMIC_OPCODE = 0b0101111
 
 R_FUNCT3 = {
-    INSTRUCTION_ADD: '000',
-    INSTRUCTION_SUB: '000',
-    INSTRUCTION_SLL: '001',
-    INSTRUCTION_SLT: '010',
-    INSTRUCTION_SLTU: '011',
-    INSTRUCTION_XOR: '100',
-    INSTRUCTION_SRL: '101',
-    INSTRUCTION_SRA: '101',
-    INSTRUCTION_OR: '110',
-    INSTRUCTION_AND: '111',
-
-    INSTRUCTION_MUL: '000',
-    INSTRUCTION_MULH: '001',
-    INSTRUCTION_MULHSU: '010',
-    INSTRUCTION_MULHU: '011',
-    INSTRUCTION_DIV: '100',
-    INSTRUCTION_DIVU: '101',
-    INSTRUCTION_REM: '110',
-    INSTRUCTION_REMU: '111'
+    INSTRUCTION_ADD: 0b000,
+    INSTRUCTION_SUB: 0b000,
+    INSTRUCTION_SLL: 0b001,
+    INSTRUCTION_SLT: 0b010,
+    INSTRUCTION_SLTU: 0b011,
+    INSTRUCTION_XOR: 0b100,
+    INSTRUCTION_SRL: 0b101,
+    INSTRUCTION_SRA: 0b101,
+    INSTRUCTION_OR: 0b110,
+    INSTRUCTION_AND: 0b111,
+
+    INSTRUCTION_MUL: 0b000,
+    INSTRUCTION_MULH: 0b001,
+    INSTRUCTION_MULHSU: 0b010,
+    INSTRUCTION_MULHU: 0b011,
+    INSTRUCTION_DIV: 0b100,
+    INSTRUCTION_DIVU: 0b101,
+    INSTRUCTION_REM: 0b110,
+    INSTRUCTION_REMU: 0b111
 }
 
 I_LOAD_FUNCT3 = {
-    INSTRUCTION_LB: '000',
-    INSTRUCTION_LH: '001',
-    INSTRUCTION_LW: '010',
-    INSTRUCTION_LBU: '100',
-    INSTRUCTION_LHU: '101',
+    INSTRUCTION_LB: 0b000,
+    INSTRUCTION_LH: 0b001,
+    INSTRUCTION_LW: 0b010,
+    INSTRUCTION_LBU: 0b100,
+    INSTRUCTION_LHU: 0b101,
 
-    INSTRUCTION_FLW: '010'
+    INSTRUCTION_FLW: 0b010
 }
 
 I_FUNCT3 = {
-    INSTRUCTION_ADDI: '000',
-    INSTRUCTION_SLTI: '010',
-    INSTRUCTION_SLTIU: '011',
-    INSTRUCTION_XORI: '100',
-    INSTRUCTION_ORI: '110',
-    INSTRUCTION_ANDI: '111',
-    INSTRUCTION_SLLI: '001',
-    INSTRUCTION_SRLI: '101',
-    INSTRUCTION_SRAI: '101',
-
-    INSTRUCTION_EBREAK: '000',
-    INSTRUCTION_ECALL: '000',
-
-    INSTRUCTION_CSRRW: '001',
-    INSTRUCTION_CSRRS: '010',
-    INSTRUCTION_CSRRC: '011',
-    INSTRUCTION_CSRRWI: '101',
-    INSTRUCTION_CSRRSI: '110',
-    INSTRUCTION_CSRRCI: '111'
+    INSTRUCTION_ADDI: 0b000,
+    INSTRUCTION_SLTI: 0b010,
+    INSTRUCTION_SLTIU: 0b011,
+    INSTRUCTION_XORI: 0b100,
+    INSTRUCTION_ORI: 0b110,
+    INSTRUCTION_ANDI: 0b111,
+    INSTRUCTION_SLLI: 0b001,
+    INSTRUCTION_SRLI: 0b101,
+    INSTRUCTION_SRAI: 0b101,
+
+    INSTRUCTION_EBREAK: 0b000,
+    INSTRUCTION_ECALL: 0b000,
+
+    INSTRUCTION_CSRRW: 0b001,
+    INSTRUCTION_CSRRS: 0b010,
+    INSTRUCTION_CSRRC: 0b011,
+    INSTRUCTION_CSRRWI: 0b101,
+    INSTRUCTION_CSRRSI: 0b110,
+    INSTRUCTION_CSRRCI: 0b111
 }
 
 B_FUNCT3 = {
-    INSTRUCTION_BEQ: '000',
-    INSTRUCTION_BNE: '001',
-    INSTRUCTION_BLT: '100',
-    INSTRUCTION_BGE: '101',
-    INSTRUCTION_BLTU: '110',
-    INSTRUCTION_BGEU: '111'
+    INSTRUCTION_BEQ: 0b000,
+    INSTRUCTION_BNE: 0b001,
+    INSTRUCTION_BLT: 0b100,
+    INSTRUCTION_BGE: 0b101,
+    INSTRUCTION_BLTU: 0b110,
+    INSTRUCTION_BGEU: 0b111
 }
 
 S_FUNCT3 = {
-    INSTRUCTION_SB: '000',
-    INSTRUCTION_SH: '001',
-    INSTRUCTION_SW: '010',
+    INSTRUCTION_SB: 0b000,
+    INSTRUCTION_SH: 0b001,
+    INSTRUCTION_SW: 0b010,
 
-    INSTRUCTION_FSW: '010'
+    INSTRUCTION_FSW: 0b010
 }
 
-JALR_FUNCT3 = '000'
+JALR_FUNCT3 = 0b000
 
 FENCE_FUNCT3 = {
-    INSTRUCTION_FENCE: '000',
-    INSTRUCTION_FENCE_I: '001'
+    INSTRUCTION_FENCE: 0b000,
+    INSTRUCTION_FENCE_I: 0b001
 }
 
-ATOMIC_FUNCT3 = '010'
+ATOMIC_FUNCT3 = 0b010
 
 R_FUNCT7 = {
-    INSTRUCTION_ADD: '0000000',
-    INSTRUCTION_SUB: '0100000',
-    INSTRUCTION_SLL: '0000000',
-    INSTRUCTION_SLT: '0000000',
-    INSTRUCTION_SLTU: '0000000',
-    INSTRUCTION_XOR: '0000000',
-    INSTRUCTION_SRL: '0000000',
-    INSTRUCTION_SRA: '0100000',
-    INSTRUCTION_OR: '0000000',
-    INSTRUCTION_AND: '0000000',
-
-    INSTRUCTION_MUL: '0000001',
-    INSTRUCTION_MULH: '0000001',
-    INSTRUCTION_MULHSU: '0000001',
-    INSTRUCTION_MULHU: '0000001',
-    INSTRUCTION_DIV: '0000001',
-    INSTRUCTION_DIVU: '0000001',
-    INSTRUCTION_REM: '0000001',
-    INSTRUCTION_REMU: '0000001'
+    INSTRUCTION_ADD: 0b0000000,
+    INSTRUCTION_SUB: 0b0100000,
+    INSTRUCTION_SLL: 0b0000000,
+    INSTRUCTION_SLT: 0b0000000,
+    INSTRUCTION_SLTU: 0b0000000,
+    INSTRUCTION_XOR: 0b0000000,
+    INSTRUCTION_SRL: 0b0000000,
+    INSTRUCTION_SRA: 0b0100000,
+    INSTRUCTION_OR: 0b0000000,
+    INSTRUCTION_AND: 0b0000000,
+
+    INSTRUCTION_MUL: 0b0000001,
+    INSTRUCTION_MULH: 0b0000001,
+    INSTRUCTION_MULHSU: 0b0000001,
+    INSTRUCTION_MULHU: 0b0000001,
+    INSTRUCTION_DIV: 0b0000001,
+    INSTRUCTION_DIVU: 0b0000001,
+    INSTRUCTION_REM: 0b0000001,
+    INSTRUCTION_REMU: 0b0000001
 }
 
 I_SHIFT_FUNCT7 = {
-    INSTRUCTION_SLLI: '0000000',
-    INSTRUCTION_SRLI: '0000000',
-    INSTRUCTION_SRAI: '0100000'
+    INSTRUCTION_SLLI: 0b0000000,
+    INSTRUCTION_SRLI: 0b0000000,
+    INSTRUCTION_SRAI: 0b0100000
 }
 
 FLOATING_POINT_R_FUNCT7 = {
-    INSTRUCTION_FADD_S: '0000000',
-    INSTRUCTION_FSUB_S: '0000100',
-    INSTRUCTION_FMUL_S: '0001000',
-    INSTRUCTION_FDIV_S: '0001100',
+    INSTRUCTION_FADD_S: 0b0000000,
+    INSTRUCTION_FSUB_S: 0b0000100,
+    INSTRUCTION_FMUL_S: 0b0001000,
+    INSTRUCTION_FDIV_S: 0b0001100,
 
-    INSTRUCTION_FEQ_S: '1010000',
-    INSTRUCTION_FLT_S: '1010000',
-    INSTRUCTION_FLE_S: '1010000',
+    INSTRUCTION_FEQ_S: 0b1010000,
+    INSTRUCTION_FLT_S: 0b1010000,
+    INSTRUCTION_FLE_S: 0b1010000,
 
-    INSTRUCTION_FSQRT_S: '0101100',
+    INSTRUCTION_FSQRT_S: 0b0101100,
 
-    INSTRUCTION_FMV_X_W: '1110000',
-    INSTRUCTION_FMV_W_X: '1111000',
+    INSTRUCTION_FMV_X_W: 0b1110000,
+    INSTRUCTION_FMV_W_X: 0b1111000,
 
-    INSTRUCTION_FCVT_W_S: '1100000',
-    INSTRUCTION_FCVT_WU_S: '1100000',
-    INSTRUCTION_FCVT_S_W: '1101000',
-    INSTRUCTION_FCVT_S_WU: '1101000',
+    INSTRUCTION_FCVT_W_S: 0b1100000,
+    INSTRUCTION_FCVT_WU_S: 0b1100000,
+    INSTRUCTION_FCVT_S_W: 0b1101000,
+    INSTRUCTION_FCVT_S_WU: 0b1101000,
 
-    INSTRUCTION_FSGNJ_S: '0010000',
-    INSTRUCTION_FSGNJN_S: '0010000',
-    INSTRUCTION_FSGNJX_S: '0010000',
-    INSTRUCTION_FMIN_S: '0010100',
-    INSTRUCTION_FMAX_S: '0010100',
+    INSTRUCTION_FSGNJ_S: 0b0010000,
+    INSTRUCTION_FSGNJN_S: 0b0010000,
+    INSTRUCTION_FSGNJX_S: 0b0010000,
+    INSTRUCTION_FMIN_S: 0b0010100,
+    INSTRUCTION_FMAX_S: 0b0010100,
 
-    INSTRUCTION_FCLASS_S: '1110000'
+    INSTRUCTION_FCLASS_S: 0b1110000
 }
 
 
 COMPRESSED_R_FUNCT = {
-    INSTRUCTION_C_SUB: '00',
-    INSTRUCTION_C_XOR: '01',
-    INSTRUCTION_C_OR: '10',
-    INSTRUCTION_C_AND: '11',
-    INSTRUCTION_C_ADD: '1',
-    INSTRUCTION_C_MV: '0'
+    INSTRUCTION_C_SUB: 0b00,
+    INSTRUCTION_C_XOR: 0b01,
+    INSTRUCTION_C_OR: 0b10,
+    INSTRUCTION_C_AND: 0b11,
+    INSTRUCTION_C_ADD: 0b1,
+    INSTRUCTION_C_MV: 0b0
 }
 
 COMPRESSED_I_OPCODE = {
-    INSTRUCTION_C_ADDI: '01',
-    INSTRUCTION_C_LI: '01',
-    INSTRUCTION_C_LUI: '01',
-    INSTRUCTION_C_SLLI: '10',
-    INSTRUCTION_C_SRLI: '01',
-    INSTRUCTION_C_SRAI: '01',
-    INSTRUCTION_C_ANDI: '01',
-    INSTRUCTION_C_ADDI16SP: '01',
-    INSTRUCTION_C_NOP: '01',
-    INSTRUCTION_C_ADDI4SPN: '00',
-    INSTRUCTION_C_EBREAK: '10',
-    INSTRUCTION_C_SLLI64: '10',
-    INSTRUCTION_C_LWSP: '10',
-    INSTRUCTION_C_FLWSP: '10',
-    INSTRUCTION_C_FLDSP: '10'
+    INSTRUCTION_C_ADDI: 0b01,
+    INSTRUCTION_C_LI: 0b01,
+    INSTRUCTION_C_LUI: 0b01,
+    INSTRUCTION_C_SLLI: 0b10,
+    INSTRUCTION_C_SRLI: 0b01,
+    INSTRUCTION_C_SRAI: 0b01,
+    INSTRUCTION_C_ANDI: 0b01,
+    INSTRUCTION_C_ADDI16SP: 0b01,
+    INSTRUCTION_C_NOP: 0b01,
+    INSTRUCTION_C_ADDI4SPN: 0b00,
+    INSTRUCTION_C_EBREAK: 0b10,
+    INSTRUCTION_C_SLLI64: 0b10,
+    INSTRUCTION_C_LWSP: 0b10,
+    INSTRUCTION_C_FLWSP: 0b10,
+    INSTRUCTION_C_FLDSP: 0b10
 }
 
 COMPRESSED_I_FUNCT3 = {
-    INSTRUCTION_C_ADDI: '000',
-    INSTRUCTION_C_LI: '010',
-    INSTRUCTION_C_LUI: '011',
-    INSTRUCTION_C_SLLI: '000',
-    INSTRUCTION_C_ADDI16SP: '011',
-    INSTRUCTION_C_NOP: '000',
-    INSTRUCTION_C_ADDI4SPN: '000',
-    INSTRUCTION_C_EBREAK: '100',
-    INSTRUCTION_C_SLLI64: '000',
-    INSTRUCTION_C_LWSP: '010',
-    INSTRUCTION_C_FLWSP: '011',
-    INSTRUCTION_C_FLDSP: '001'
+    INSTRUCTION_C_ADDI: 0b000,
+    INSTRUCTION_C_LI: 0b010,
+    INSTRUCTION_C_LUI: 0b011,
+    INSTRUCTION_C_SLLI: 0b000,
+    INSTRUCTION_C_ADDI16SP: 0b011,
+    INSTRUCTION_C_NOP: 0b000,
+    INSTRUCTION_C_ADDI4SPN: 0b000,
+    INSTRUCTION_C_EBREAK: 0b100,
+    INSTRUCTION_C_SLLI64: 0b000,
+    INSTRUCTION_C_LWSP: 0b010,
+    INSTRUCTION_C_FLWSP: 0b011,
+    INSTRUCTION_C_FLDSP: 0b001
 }
 
 COMPRESSED_B_FUNCT3 = {
-    INSTRUCTION_C_BEQZ: '110',
-    INSTRUCTION_C_BNEZ: '111'
+    INSTRUCTION_C_BEQZ: 0b110,
+    INSTRUCTION_C_BNEZ: 0b111
 }
 
 COMPRESSED_L_FUNCT3 = {
-    INSTRUCTION_C_LW: '010',
-    INSTRUCTION_C_SW: '110',
-    INSTRUCTION_C_FLW: '011',
-    INSTRUCTION_C_FSW: '111',
-    INSTRUCTION_C_FLD: '001',
-    INSTRUCTION_C_FSD: '101'
+    INSTRUCTION_C_LW: 0b010,
+    INSTRUCTION_C_SW: 0b110,
+    INSTRUCTION_C_FLW: 0b011,
+    INSTRUCTION_C_FSW: 0b111,
+    INSTRUCTION_C_FLD: 0b001,
+    INSTRUCTION_C_FSD: 0b101
 }
 
 COMPRESSED_J_FUNCT3 = {
-    INSTRUCTION_C_J: '101',
-    INSTRUCTION_C_JAL: '001',
+    INSTRUCTION_C_J: 0b101,
+    INSTRUCTION_C_JAL: 0b001,
 }
 
 COMPRESSED_STORE_SP_FUNCT3 = {
-    INSTRUCTION_C_SWSP: '110',
-    INSTRUCTION_C_FSWSP: '111',
-    INSTRUCTION_C_FSDSP: '101'
+    INSTRUCTION_C_SWSP: 0b110,
+    INSTRUCTION_C_FSWSP: 0b111,
+    INSTRUCTION_C_FSDSP: 0b101
 }
 
 
 COMPRESSED_I_FUNCT2 = {
-    INSTRUCTION_C_SRLI: '00',
-    INSTRUCTION_C_SRAI: '01',
-    INSTRUCTION_C_ANDI: '10'
+    INSTRUCTION_C_SRLI: 0b00,
+    INSTRUCTION_C_SRAI: 0b01,
+    INSTRUCTION_C_ANDI: 0b10
 }
 
 COMPRESSED_J_R_FUNCT4 = {
-    INSTRUCTION_C_JR: '1000',
-    INSTRUCTION_C_JALR: '1001',
+    INSTRUCTION_C_JR: 0b1000,
+    INSTRUCTION_C_JALR: 0b1001,
 }
 
 FLOATING_POINT_R_FUNCT3 = {
-    INSTRUCTION_FEQ_S: '010',
-    INSTRUCTION_FLT_S: '001',
-    INSTRUCTION_FLE_S: '000',
-
-    INSTRUCTION_FSGNJ_S: '000',
-    INSTRUCTION_FSGNJN_S: '001',
-    INSTRUCTION_FSGNJX_S: '010',
-    INSTRUCTION_FMIN_S: '000',
-    INSTRUCTION_FMAX_S: '001'
+    INSTRUCTION_FEQ_S: 0b010,
+    INSTRUCTION_FLT_S: 0b001,
+    INSTRUCTION_FLE_S: 0b000,
+
+    INSTRUCTION_FSGNJ_S: 0b000,
+    INSTRUCTION_FSGNJN_S: 0b001,
+    INSTRUCTION_FSGNJX_S: 0b010,
+    INSTRUCTION_FMIN_S: 0b000,
+    INSTRUCTION_FMAX_S: 0b001
 }
 
 ATOMIC_FUNCT5 = {
-    INSTRUCTION_A_LR_W: '00010',
-    INSTRUCTION_A_SCW: '00011',
-    INSTRUCTION_A_AMOSWAP_W: '00001',
-    INSTRUCTION_A_AMOADD_W: '00000',
-    INSTRUCTION_A_AMOXOR_W: '00100',
-    INSTRUCTION_A_AMOAND_W: '01100',
-    INSTRUCTION_A_AMOOR_W: '01000',
-    INSTRUCTION_A_AMOMIN_W: '10000',
-    INSTRUCTION_A_AMOMAX_W: '10100',
-    INSTRUCTION_A_AMOMINU_W: '11000',
-    INSTRUCTION_A_AMOMAXU_W: '11100'
+    INSTRUCTION_A_LR_W: 0b00010,
+    INSTRUCTION_A_SCW: 0b00011,
+    INSTRUCTION_A_AMOSWAP_W: 0b00001,
+    INSTRUCTION_A_AMOADD_W: 0b00000,
+    INSTRUCTION_A_AMOXOR_W: 0b00100,
+    INSTRUCTION_A_AMOAND_W: 0b01100,
+    INSTRUCTION_A_AMOOR_W: 0b01000,
+    INSTRUCTION_A_AMOMIN_W: 0b10000,
+    INSTRUCTION_A_AMOMAX_W: 0b10100,
+    INSTRUCTION_A_AMOMINU_W: 0b11000,
+    INSTRUCTION_A_AMOMAXU_W: 0b11100
 }
 
 
 FLOATING_POINT_ROUNDING_MODES = {
-    'rne': '000',
-    'rtz': '001',
-    'rdn': '010',
-    'rup': '011',
-    'rmm': '100',
-    'dyn': '111'
+    'rne': 0b000,
+    'rtz': 0b001,
+    'rdn': 0b010,
+    'rup': 0b011,
+    'rmm': 0b100,
+    'dyn': 0b111
 }
 
 FENCE_ALL_MODES = 'iorw'
+
+FENCE_MODE_BITS = {'i': 0b1000, 'o': 0b0100, 'r': 0b0010, 'w': 0b0001}
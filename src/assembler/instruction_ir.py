@@ -0,0 +1,72 @@
+from enum import IntEnum
+from typing import NamedTuple
+
+from assembler import instruction_info
+
+
+class InstructionKind(IntEnum):
+    NEW_LINE = 0
+    LABEL = 1
+    R_INSTRUCTION = 2
+    I_INSTRUCTION = 3
+    I_SHIFT_INSTRUCTION = 4
+    I_LOAD_INSTRUCTION = 5
+    U_INSTRUCTION = 6
+    JAL_INSTRUCTION = 7
+    JALR_INSTRUCTION = 8
+    B_INSTRUCTION = 9
+    S_INSTRUCTION = 10
+    FENCE_INSTRUCTION = 11
+    COMPRESSED_R_INSTRUCTION = 12
+    COMPRESSED_I_INSTRUCTION = 13
+    COMPRESSED_B_INSTRUCTION = 14
+    COMPRESSED_L_LOAD_INSTRUCTION = 15
+    COMPRESSED_L_STORE_INSTRUCTION = 16
+    COMPRESSED_STORE_SP_INSTRUCTION = 17
+    COMPRESSED_J_INSTRUCTION = 18
+    COMPRESSED_J_R_INSTRUCTION = 19
+    FLOATING_POINT_R_INSTRUCTION = 20
+    FLOATING_POINT_R4_INSTRUCTION = 21
+    ATOMIC_INSTRUCTION = 22
+
+
+INSTRUCTION_SIZES = tuple(
+    0 if kind in (InstructionKind.NEW_LINE, InstructionKind.LABEL) else 2 if kind.name.startswith('COMPRESSED_') else 4
+    for kind in InstructionKind
+)
+
+OPCODE_NAMES = tuple(sorted({
+    value for name, value in vars(instruction_info).items() if name.startswith('INSTRUCTION_')
+}))
+
+OPCODE_IDS = {opcode: opcode_id for opcode_id, opcode in enumerate(OPCODE_NAMES)}
+
+
+class Instruction(NamedTuple):
+    kind: InstructionKind
+    opcode: int = 0
+    rd: int = 0
+    rs1: int = 0
+    rs2: int = 0
+    rs3: int = 0
+    imm: int = 0
+    label: str = None
+    rm_funct3: int = 0
+    aq_rl: int = 0
+    pred: int = 0
+    succ: int = 0
+    lineno: int = 0
+
+    @property
+    def size(self) -> int:
+        return INSTRUCTION_SIZES[self.kind]
+
+    @property
+    def mnemonic(self) -> str:
+        return OPCODE_NAMES[self.opcode]
+
+    def with_lineno(self, lineno: int):
+        return _new_instruction(Instruction, self[:-1] + (lineno,))
+
+
+_new_instruction = tuple.__new__
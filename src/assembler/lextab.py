@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('COMMA', 'COMPRESSED_ID', 'F_REGISTER', 'ID', 'IMMEDIATE', 'LABEL_COLON', 'LEFT_PAREN', 'NEWLINE', 'REGISTER', 'RIGHT_PAREN'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_LABEL_COLON>[a-zA-Z_][a-zA-Z_0-9\\.]*[:])|(?P<t_REGISTER>x3[0-1]|x2[0-9]|x1[0-9]|x[0-9]|zero|ra|sp|gp|tp|fp|s1[0-1]|s[0-9]|t[0-6]|a[0-7])|(?P<t_F_REGISTER>ft1[0-1]|ft[0-9]|fs1[0-1]|fs[0-9]|fa[0-7]|f3[0-1]|f2[0-9]|f1[0-9]|f[0-9])|(?P<t_COMPRESSED_ID>c\\.[a-z0-9]+)|(?P<t_ID>[a-zA-Z_][a-zA-Z_0-9\\.]*)|(?P<t_NEWLINE>\\n+)|(?P<t_COMMENT>\\#.*)|(?P<t_IMMEDIATE>0x[0-9a-fA-F]+|[+-]?[0-9]+)|(?P<t_LEFT_PAREN>\\()|(?P<t_RIGHT_PAREN>\\))|(?P<t_COMMA>,)', [None, ('t_LABEL_COLON', 'LABEL_COLON'), ('t_REGISTER', 'REGISTER'), ('t_F_REGISTER', 'F_REGISTER'), ('t_COMPRESSED_ID', 'COMPRESSED_ID'), ('t_ID', 'ID'), ('t_NEWLINE', 'NEWLINE'), ('t_COMMENT', 'COMMENT'), (None, 'IMMEDIATE'), (None, 'LEFT_PAREN'), (None, 'RIGHT_PAREN'), (None, 'COMMA')])]}
+_lexstateignore = {'INITIAL': ' \t\r'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
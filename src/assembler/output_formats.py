@@ -0,0 +1,100 @@
+INTEL_HEX_RECORD_SIZE = 16
+
+INTEL_HEX_DATA_RECORD = 0x00
+INTEL_HEX_END_OF_FILE_RECORD = 0x01
+INTEL_HEX_EXTENDED_LINEAR_ADDRESS_RECORD = 0x04
+
+
+def is_compressed(code: int) -> bool:
+    return code & 0b11 != 0b11
+
+
+def build_image(machine_code) -> bytearray:
+    return bytearray(b''.join(code.to_bytes(2 if is_compressed(code) else 4, 'little') for code in machine_code))
+
+
+def split_image(image) -> list:
+    machine_code = []
+    offset = 0
+    while offset < len(image):
+        size = 2 if is_compressed(image[offset]) else 4
+        machine_code.append(int.from_bytes(image[offset:offset + size], 'little'))
+        offset += size
+    return machine_code
+
+
+def to_binary_text(machine_code) -> str:
+    return ''.join(
+        ('{0:016b}\n' if is_compressed(code) else '{0:032b}\n').format(code) for code in machine_code
+    )
+
+
+def to_hex_text(machine_code) -> str:
+    return ''.join(
+        ('{0:04x}\n' if is_compressed(code) else '{0:08x}\n').format(code) for code in machine_code
+    )
+
+
+def to_hex_byte_dump(machine_code) -> str:
+    return ''.join(
+        ('{0:04x}' if is_compressed(code) else '{0:08x}').format(code)[::-1] for code in machine_code
+    )
+
+
+def _intel_hex_record(record_type: int, address: int, data) -> str:
+    record = bytes([len(data), (address >> 8) & 0xff, address & 0xff, record_type]) + bytes(data)
+    checksum = (-sum(record)) & 0xff
+    return ':' + record.hex().upper() + '{0:02X}'.format(checksum) + '\n'
+
+
+def to_intel_hex(image, base_address: int = 0) -> str:
+    view = memoryview(image)
+    records = []
+    upper_address = None
+    offset = 0
+    while offset < len(view):
+        address = base_address + offset
+        if address >> 16 != upper_address:
+            upper_address = address >> 16
+            records.append(_intel_hex_record(
+                INTEL_HEX_EXTENDED_LINEAR_ADDRESS_RECORD, 0, upper_address.to_bytes(2, 'big')
+            ))
+        record_size = min(INTEL_HEX_RECORD_SIZE, 0x10000 - (address & 0xffff))
+        chunk = view[offset:offset + record_size]
+        records.append(_intel_hex_record(INTEL_HEX_DATA_RECORD, address & 0xffff, chunk))
+        offset += len(chunk)
+    records.append(_intel_hex_record(INTEL_HEX_END_OF_FILE_RECORD, 0, b''))
+    return ''.join(records)
+
+
+def to_readmemh(image, word_size: int = 4) -> str:
+    padding = -len(image) % word_size
+    view = memoryview(bytes(image) + bytes(padding) if padding else image)
+    line_format = '{0:0' + str(2 * word_size) + 'x}\n'
+    return ''.join(
+        line_format.format(int.from_bytes(view[offset:offset + word_size], 'little'))
+        for offset in range(0, len(view), word_size)
+    )
+
+
+def write_text_file(filename, content: str) -> None:
+    with open(filename, 'w') as file:
+        file.write(content)
+
+
+def write_binary_file(filename, image) -> None:
+    with open(filename, 'wb') as file:
+        file.write(image)
+
+
+def write_file_if_changed(filename, content) -> bool:
+    mode = 'b' if isinstance(content, (bytes, bytearray)) else ''
+    try:
+        with open(filename, 'r' + mode) as file:
+            if file.read() == content:
+                return False
+    except (IOError, UnicodeDecodeError):
+        pass
+    with open(filename, 'w' + mode) as file:
+        file.write(content)
+    return True
@@ -1,7 +1,10 @@
-import ply.yacc as yacc
+import copy
+import os
+import threading
 
 from assembler.tokenizer import tokens
 from assembler.instruction_info import *
+from assembler.instruction_ir import Instruction, InstructionKind, OPCODE_IDS
 from assembler.pre_process import get_x_register_index, get_f_register_index
 from assembler.csr_registers import CSR_ENCODING_TABLE
 
@@ -13,44 +16,48 @@ def to_int(field: str) -> int:
         return int(field)
 
 
+def to_fence_bits(operand: str) -> int:
+    return sum(FENCE_MODE_BITS[mode] for mode in operand)
+
+
 def p_instruction_no_args(p):
     """expression : ID NEWLINE"""
     if p[1] in I_ENVIRONMENT_INSTRUCTIONS:
-        p[0] = {
-            'type': 'i_instruction',
-            'opcode': p[1],
-            'rd': '0',
-            'rs1': '0',
-            'imm': 0 if p[1] == INSTRUCTION_ECALL else 1,
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.I_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=0,
+            rs1=0,
+            imm=0 if p[1] == INSTRUCTION_ECALL else 1,
+            lineno=p.lineno(1)
+        )
     elif p[1] == 'nop':
-        p[0] = {
-            'type': 'i_instruction',
-            'opcode': 'addi',
-            'rd': get_x_register_index('x0'),
-            'rs1': get_x_register_index('x0'),
-            'imm': 0,
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.I_INSTRUCTION,
+            opcode=OPCODE_IDS[INSTRUCTION_ADDI],
+            rd=get_x_register_index('x0'),
+            rs1=get_x_register_index('x0'),
+            imm=0,
+            lineno=p.lineno(1)
+        )
     elif p[1] == 'ret':
-        p[0] = {
-            'type': 'jalr_instruction',
-            'opcode': 'jalr',
-            'rd': get_x_register_index('x0'),
-            'rs1': get_x_register_index('x1'),
-            'imm': 0,
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.JALR_INSTRUCTION,
+            opcode=OPCODE_IDS[INSTRUCTION_JALR],
+            rd=get_x_register_index('x0'),
+            rs1=get_x_register_index('x1'),
+            imm=0,
+            lineno=p.lineno(1)
+        )
     elif p[1] in I_FENCE_INSTRUCTIONS:
         operand_field = "" if p[1] == INSTRUCTION_FENCE_I else FENCE_ALL_MODES
-        p[0] = {
-            'type': 'fence_instruction',
-            'opcode': p[1],
-            'pred': operand_field,
-            'succ': operand_field,
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.FENCE_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            pred=to_fence_bits(operand_field),
+            succ=to_fence_bits(operand_field),
+            lineno=p.lineno(1)
+        )
     else:
         error_message = f'Error: unrecognized or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
@@ -58,46 +65,46 @@ def p_instruction_no_args(p):
 
 def p_label(p):
     """expression : LABEL_COLON NEWLINE"""
-    p[0] = {
-        'type': 'label',
-        'label': p[1].replace(":", ""),
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.LABEL,
+        label=p[1].replace(":", ""),
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_xreg_xreg(p):
     """expression : ID register COMMA register COMMA register NEWLINE"""
-    p[0] = {
-        'type': 'r_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': get_x_register_index(p[4]),
-        'rs2': get_x_register_index(p[6]),
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=get_x_register_index(p[4]),
+        rs2=get_x_register_index(p[6]),
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_xreg_imm(p):
     """expression : ID register COMMA register COMMA IMMEDIATE NEWLINE"""
     if p[1] in B_INSTRUCTIONS:
-        p[0] = {
-            'type': 'b_instruction',
-            'opcode': p[1],
-            'rs1': get_x_register_index(p[2]),
-            'rs2': get_x_register_index(p[4]),
-            'imm': to_int(p[6]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.B_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs1=get_x_register_index(p[2]),
+            rs2=get_x_register_index(p[4]),
+            imm=to_int(p[6]),
+            lineno=p.lineno(1)
+        )
     else:
-        instruction = 'i_shift_instruction' if p[1] in I_SHIFT_INSTRUCTIONS else 'i_instruction'
-        p[0] = {
-            'type': instruction,
-            'opcode': p[1],
-            'rd': get_x_register_index(p[2]),
-            'rs1': get_x_register_index(p[4]),
-            'imm': to_int(p[6]),
-            'lineno': p.lineno(1)
-        }
+        kind = InstructionKind.I_SHIFT_INSTRUCTION if p[1] in I_SHIFT_INSTRUCTIONS else InstructionKind.I_INSTRUCTION
+        p[0] = Instruction(
+            kind,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_x_register_index(p[2]),
+            rs1=get_x_register_index(p[4]),
+            imm=to_int(p[6]),
+            lineno=p.lineno(1)
+        )
 
 
 def p_instruction_xreg_imm_xreg(p):
@@ -105,14 +112,14 @@ def p_instruction_xreg_imm_xreg(p):
     if p[1] not in I_CSR_INSTRUCTIONS:
         error_message = f'Error: illegal or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'i_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': get_x_register_index(p[6]),
-        'imm': to_int(p[4]),
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.I_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=get_x_register_index(p[6]),
+        imm=to_int(p[4]),
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_imm_imm(p):
@@ -120,14 +127,14 @@ def p_instruction_xreg_imm_imm(p):
     if p[1] not in I_CSRI_INSTRUCTIONS:
         error_message = f'Error: illegal or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'i_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': str(to_int(p[6])),
-        'imm': to_int(p[4]),
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.I_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=to_int(p[6]),
+        imm=to_int(p[4]),
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_id_imm(p):
@@ -135,14 +142,14 @@ def p_instruction_xreg_id_imm(p):
     if p[1] not in I_CSRI_INSTRUCTIONS:
         error_message = f'Error: illegal or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'i_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': str(to_int(p[6])),
-        'imm': CSR_ENCODING_TABLE[p[4]],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.I_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=to_int(p[6]),
+        imm=CSR_ENCODING_TABLE[p[4]],
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_id_xreg(p):
@@ -153,14 +160,14 @@ def p_instruction_xreg_id_xreg(p):
     if p[4] not in CSR_ENCODING_TABLE:
         error_message = f'Error: unkown CSR {p[4]} at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'i_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': get_x_register_index(p[6]),
-        'imm': CSR_ENCODING_TABLE[p[4]],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.I_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=get_x_register_index(p[6]),
+        imm=CSR_ENCODING_TABLE[p[4]],
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_id_id(p):
@@ -177,56 +184,56 @@ def p_instruction_xreg_id_id(p):
     if not is_in_alphabetical_order(pred) or not is_in_alphabetical_order(succ):
         error_message = f'Error: illegal operands at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'fence_instruction',
-        'opcode': p[1],
-        'pred': p[2],
-        'succ': p[4],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FENCE_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        pred=to_fence_bits(pred),
+        succ=to_fence_bits(succ),
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_imm_lparen_xreg_rparen(p):
     """expression : ID register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINE"""
     if p[1] == INSTRUCTION_JALR:
-        p[0] = {
-            'type': 'jalr_instruction',
-            'opcode': p[1],
-            'rd': get_x_register_index(p[2]),
-            'rs1': get_x_register_index(p[6]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.JALR_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_x_register_index(p[2]),
+            rs1=get_x_register_index(p[6]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     elif p[1] in I_LOAD_INSTRUCTIONS:
-        p[0] = {
-            'type': 'i_load_instruction',
-            'opcode': p[1],
-            'rd': get_x_register_index(p[2]),
-            'rs1': get_x_register_index(p[6]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.I_LOAD_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_x_register_index(p[2]),
+            rs1=get_x_register_index(p[6]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     else:
-        p[0] = {
-            'type': 's_instruction',
-            'opcode': p[1],
-            'rs2': get_x_register_index(p[2]),
-            'rs1': get_x_register_index(p[6]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.S_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs2=get_x_register_index(p[2]),
+            rs1=get_x_register_index(p[6]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
 
 
 def p_instruction_xreg_imm(p):
     """expression : ID register COMMA IMMEDIATE NEWLINE"""
-    instruction = 'jal_instruction' if p[1] == INSTRUCTION_JAL else 'u_instruction'
-    p[0] = {
-        'type': instruction,
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'imm': to_int(p[4]),
-        'lineno': p.lineno(1)
-    }
+    kind = InstructionKind.JAL_INSTRUCTION if p[1] == INSTRUCTION_JAL else InstructionKind.U_INSTRUCTION
+    p[0] = Instruction(
+        kind,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        imm=to_int(p[4]),
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_id(p):
@@ -234,45 +241,45 @@ def p_instruction_xreg_id(p):
     if p[1] != INSTRUCTION_JAL:
         error_message = f'Error: illegal or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'jal_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'label': p[4],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.JAL_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        label=p[4],
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_xreg_id(p):
     """expression : ID register COMMA register COMMA ID NEWLINE"""
-    p[0] = {
-        'type': 'b_instruction',
-        'opcode': p[1],
-        'rs1': get_x_register_index(p[2]),
-        'rs2': get_x_register_index(p[4]),
-        'label': p[6],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.B_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rs1=get_x_register_index(p[2]),
+        rs2=get_x_register_index(p[4]),
+        label=p[6],
+        lineno=p.lineno(1)
+    )
 
 
 def p_compressed_instruction(p):
     """expression : COMPRESSED_ID NEWLINE"""
     if p[1] == INSTRUCTION_C_NOP:
-        p[0] = {
-            'type': 'compressed_i_instruction',
-            'opcode': p[1],
-            'rd': '0',
-            'imm': 0,
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_I_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=0,
+            imm=0,
+            lineno=p.lineno(1)
+        )
     elif p[1] == INSTRUCTION_C_EBREAK:
-        p[0] = {
-            'type': 'compressed_i_instruction',
-            'opcode': p[1],
-            'rd': '0',
-            'imm': 0x20,
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_I_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=0,
+            imm=0x20,
+            lineno=p.lineno(1)
+        )
     else:
         error_message = f'Error: illegal or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
@@ -280,13 +287,13 @@ def p_compressed_instruction(p):
 
 def p_compressed_instruction_xreg_xreg(p):
     """expression : COMPRESSED_ID register COMMA register NEWLINE"""
-    p[0] = {
-        'type': 'compressed_r_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs2': get_x_register_index(p[4]),
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.COMPRESSED_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs2=get_x_register_index(p[4]),
+        lineno=p.lineno(1)
+    )
 
 
 def p_compressed_instruction_xreg_xreg_imm(p):
@@ -294,8 +301,8 @@ def p_compressed_instruction_xreg_xreg_imm(p):
     if p[1] != INSTRUCTION_C_ADDI4SPN:
         error_message = f'Error: illegal or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
-    x_reg_rd_index = int(get_x_register_index(p[2]))
-    x_reg_rs_index = int(get_x_register_index(p[4]))
+    x_reg_rd_index = get_x_register_index(p[2])
+    x_reg_rs_index = get_x_register_index(p[4])
     if x_reg_rd_index < 8 or x_reg_rd_index > 15 or x_reg_rs_index != 2:
         error_message = f'Error: illegal operands at line {p.lineno(1)}'
         raise Exception(error_message)
@@ -304,179 +311,179 @@ def p_compressed_instruction_xreg_xreg_imm(p):
         error_message = f'Error: illegal operands at line {p.lineno(1)}'
         raise Exception(error_message)
 
-    p[0] = {
-        'type': 'compressed_i_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'imm': to_int(p[6]),
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.COMPRESSED_I_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        imm=to_int(p[6]),
+        lineno=p.lineno(1)
+    )
 
 
 def p_compressed_instruction_xreg_imm(p):
     """expression : COMPRESSED_ID register COMMA IMMEDIATE NEWLINE"""
     if p[1] in COMPRESSED_B_INSTRUCTIONS:
-        x_reg_index = int(get_x_register_index(p[2]))
+        x_reg_index = get_x_register_index(p[2])
         if x_reg_index < 8 or x_reg_index > 15:
             error_message = f'Error: illegal operands at line {p.lineno(1)}'
             raise Exception(error_message)
-        p[0] = {
-            'type': 'compressed_b_instruction',
-            'opcode': p[1],
-            'rs1': get_x_register_index(p[2]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_B_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs1=get_x_register_index(p[2]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     else:
         if p[1] == INSTRUCTION_C_ADDI16SP:
             imm_value = to_int(p[4])
             if imm_value == 0 or (imm_value % 16) != 0:
                 error_message = f'Error: illegal operands at line {p.lineno(1)}'
                 raise Exception(error_message)
-        p[0] = {
-            'type': 'compressed_i_instruction',
-            'opcode': p[1],
-            'rd': get_x_register_index(p[2]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_I_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_x_register_index(p[2]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
 
 
 def p_compressed_instruction_xreg_id(p):
     """expression : COMPRESSED_ID register COMMA ID NEWLINE"""
-    x_reg_index = int(get_x_register_index(p[2]))
+    x_reg_index = get_x_register_index(p[2])
     if x_reg_index < 8 or x_reg_index > 15:
         error_message = f'Error: illegal operands at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'compressed_b_instruction',
-        'opcode': p[1],
-        'rs1': get_x_register_index(p[2]),
-        'label': p[4],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.COMPRESSED_B_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rs1=get_x_register_index(p[2]),
+        label=p[4],
+        lineno=p.lineno(1)
+    )
 
 
 def p_compressed_instruction_xreg_imm_lparen_xreg_rparen(p):
     """expression : COMPRESSED_ID register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINE"""
     if p[1] == INSTRUCTION_C_SWSP:
-        if get_x_register_index(p[6]) != '2':
+        if get_x_register_index(p[6]) != 2:
             error_message = f'Error: illegal operands at line {p.lineno(1)}'
             raise Exception(error_message)
-        p[0] = {
-            'type': 'compressed_store_sp_instruction',
-            'opcode': p[1],
-            'rs2': get_x_register_index(p[2]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_STORE_SP_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs2=get_x_register_index(p[2]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     elif p[1] == INSTRUCTION_C_LWSP:
-        if get_x_register_index(p[6]) != '2':
+        if get_x_register_index(p[6]) != 2:
             error_message = f'Error: illegal operands at line {p.lineno(1)}'
             raise Exception(error_message)
-        p[0] = {
-            'type': 'compressed_i_instruction',
-            'opcode': p[1],
-            'rd': get_x_register_index(p[2]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_I_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_x_register_index(p[2]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     elif p[1] == INSTRUCTION_C_LW:
-        p[0] = {
-            'type': 'compressed_l_load_instruction',
-            'opcode': p[1],
-            'rd': get_x_register_index(p[2]),
-            'rs1': get_x_register_index(p[6]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_L_LOAD_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_x_register_index(p[2]),
+            rs1=get_x_register_index(p[6]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     else:
-        p[0] = {
-            'type': 'compressed_l_store_instruction',
-            'opcode': p[1],
-            'rs2': get_x_register_index(p[2]),
-            'rs1': get_x_register_index(p[6]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_L_STORE_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs2=get_x_register_index(p[2]),
+            rs1=get_x_register_index(p[6]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
 
 
 def p_compressed_instruction_freg_imm_lparen_xreg_rparen(p):
     """expression : COMPRESSED_ID f_register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINE"""
     if p[1] in [INSTRUCTION_C_FSWSP, INSTRUCTION_C_FSDSP]:
-        if get_x_register_index(p[6]) != '2':
+        if get_x_register_index(p[6]) != 2:
             error_message = f'Error: illegal operands at line {p.lineno(1)}'
             raise Exception(error_message)
-        p[0] = {
-            'type': 'compressed_store_sp_instruction',
-            'opcode': p[1],
-            'rs2': get_f_register_index(p[2]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_STORE_SP_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs2=get_f_register_index(p[2]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     elif p[1] in [INSTRUCTION_C_FLWSP, INSTRUCTION_C_FLDSP]:
-        if get_x_register_index(p[6]) != '2':
+        if get_x_register_index(p[6]) != 2:
             error_message = f'Error: illegal operands at line {p.lineno(1)}'
             raise Exception(error_message)
-        p[0] = {
-            'type': 'compressed_i_instruction',
-            'opcode': p[1],
-            'rd': get_f_register_index(p[2]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_I_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_f_register_index(p[2]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     elif p[1] in [INSTRUCTION_C_FLW, INSTRUCTION_C_FLD, INSTRUCTION_C_FSW, INSTRUCTION_C_FSD]:
-        f_reg_index = int(get_f_register_index(p[2]))
+        f_reg_index = get_f_register_index(p[2])
         if f_reg_index < 8 or f_reg_index > 15:
             error_message = f'Error: illegal operands at line {p.lineno(1)}'
             raise Exception(error_message)
         if p[1] in [INSTRUCTION_C_FLW, INSTRUCTION_C_FLD]:
-            p[0] = {
-                'type': 'compressed_l_load_instruction',
-                'opcode': p[1],
-                'rd': get_f_register_index(p[2]),
-                'rs1': get_x_register_index(p[6]),
-                'imm': to_int(p[4]),
-                'lineno': p.lineno(1)
-            }
+            p[0] = Instruction(
+                InstructionKind.COMPRESSED_L_LOAD_INSTRUCTION,
+                opcode=OPCODE_IDS[p[1]],
+                rd=get_f_register_index(p[2]),
+                rs1=get_x_register_index(p[6]),
+                imm=to_int(p[4]),
+                lineno=p.lineno(1)
+            )
         elif p[1] in [INSTRUCTION_C_FSW, INSTRUCTION_C_FSD]:
-            p[0] = {
-                'type': 'compressed_l_store_instruction',
-                'opcode': p[1],
-                'rs2': get_f_register_index(p[2]),
-                'rs1': get_x_register_index(p[6]),
-                'imm': to_int(p[4]),
-                'lineno': p.lineno(1)
-            }
+            p[0] = Instruction(
+                InstructionKind.COMPRESSED_L_STORE_INSTRUCTION,
+                opcode=OPCODE_IDS[p[1]],
+                rs2=get_f_register_index(p[2]),
+                rs1=get_x_register_index(p[6]),
+                imm=to_int(p[4]),
+                lineno=p.lineno(1)
+            )
 
 
 def p_compressed_instruction_imm(p):
     """expression : COMPRESSED_ID IMMEDIATE NEWLINE"""
-    p[0] = {
-        'type': 'compressed_j_instruction',
-        'opcode': p[1],
-        'imm': to_int(p[2]),
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.COMPRESSED_J_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        imm=to_int(p[2]),
+        lineno=p.lineno(1)
+    )
 
 
 def p_compressed_instruction_xreg(p):
     """expression : COMPRESSED_ID register NEWLINE"""
     if p[1] in COMPRESSED_J_R_INSTRUCTIONS:
-        p[0] = {
-            'type': 'compressed_j_r_instruction',
-            'opcode': p[1],
-            'rs1': get_x_register_index(p[2]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_J_R_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs1=get_x_register_index(p[2]),
+            lineno=p.lineno(1)
+        )
     elif p[1] == INSTRUCTION_C_SLLI64:
-        p[0] = {
-            'type': 'compressed_i_instruction',
-            'opcode': p[1],
-            'rd': get_x_register_index(p[2]),
-            'imm': 0,
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.COMPRESSED_I_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_x_register_index(p[2]),
+            imm=0,
+            lineno=p.lineno(1)
+        )
     else:
         error_message = f'Error: illegal or incomplete instruction at line {p.lineno(1)}'
         raise Exception(error_message)
@@ -488,15 +495,15 @@ def p_floating_point_instruction_freg_freg_freg(p):
         rm_funct3 = FLOATING_POINT_ROUNDING_MODES['dyn']
     else:
         rm_funct3 = FLOATING_POINT_R_FUNCT3[p[1]]
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': get_f_register_index(p[6]),
-        'rm_funct3': rm_funct3,
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=get_f_register_index(p[6]),
+        rm_funct3=rm_funct3,
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_freg_freg_freg(p):
@@ -505,16 +512,16 @@ def p_floating_point_instruction_freg_freg_freg_freg(p):
         error_message = f'Error: incorrect or unrocognized instruction at line {p.lineno(1)}'
         raise Exception(error_message)
 
-    p[0] = {
-        'type': 'floating_point_r4_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': get_f_register_index(p[6]),
-        'rs3': get_f_register_index(p[8]),
-        'rm_funct3': FLOATING_POINT_ROUNDING_MODES['dyn'],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R4_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=get_f_register_index(p[6]),
+        rs3=get_f_register_index(p[8]),
+        rm_funct3=FLOATING_POINT_ROUNDING_MODES['dyn'],
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_freg_freg_freg_id(p):
@@ -528,16 +535,16 @@ def p_floating_point_instruction_freg_freg_freg_freg_id(p):
         error_message = f'Error: illegal rounding mode at line {p.lineno(1)}'
         raise Exception(error_message)
 
-    p[0] = {
-        'type': 'floating_point_r4_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': get_f_register_index(p[6]),
-        'rs3': get_f_register_index(p[8]),
-        'rm_funct3': FLOATING_POINT_ROUNDING_MODES[p[10]],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R4_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=get_f_register_index(p[6]),
+        rs3=get_f_register_index(p[8]),
+        rm_funct3=FLOATING_POINT_ROUNDING_MODES[p[10]],
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_freg_freg_id(p):
@@ -547,41 +554,41 @@ def p_floating_point_instruction_freg_freg_freg_id(p):
         error_message = f'Error: illegal rounding mode at line {p.lineno(1)}'
         raise Exception(error_message)
 
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': get_f_register_index(p[6]),
-        'rm_funct3': FLOATING_POINT_ROUNDING_MODES[p[8]],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=get_f_register_index(p[6]),
+        rm_funct3=FLOATING_POINT_ROUNDING_MODES[p[8]],
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_xreg_freg_freg(p):
     """expression : ID register COMMA f_register COMMA f_register NEWLINE"""
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': get_f_register_index(p[6]),
-        'rm_funct3': FLOATING_POINT_R_FUNCT3[p[1]],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=get_f_register_index(p[6]),
+        rm_funct3=FLOATING_POINT_R_FUNCT3[p[1]],
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_freg(p):
     """expression : ID f_register COMMA f_register NEWLINE"""
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': '0',
-        'rm_funct3': FLOATING_POINT_ROUNDING_MODES['dyn'],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=0,
+        rm_funct3=FLOATING_POINT_ROUNDING_MODES['dyn'],
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_freg_id(p):
@@ -591,15 +598,15 @@ def p_floating_point_instruction_freg_freg_id(p):
         error_message = f'Error: illegal rounding mode at line {p.lineno(1)}'
         raise Exception(error_message)
 
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': '0',
-        'rm_funct3': FLOATING_POINT_ROUNDING_MODES[p[6]],
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=0,
+        rm_funct3=FLOATING_POINT_ROUNDING_MODES[p[6]],
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_xreg_freg(p):
@@ -608,21 +615,21 @@ def p_floating_point_instruction_xreg_freg(p):
         error_message = f'Error: incorrect or unrocognized instruction at line {p.lineno(1)}'
         raise Exception(error_message)
 
-    rm_funct3 = '001' if p[1] == INSTRUCTION_FCLASS_S else '000'
-    rs2 = '0'
+    rm_funct3 = 0b001 if p[1] == INSTRUCTION_FCLASS_S else 0b000
+    rs2 = 0
     if p[1] in [INSTRUCTION_FCVT_W_S, INSTRUCTION_FCVT_WU_S]:
         rm_funct3 = FLOATING_POINT_ROUNDING_MODES['dyn']
-        rs2 = '0' if p[1] == INSTRUCTION_FCVT_W_S else '1'
+        rs2 = 0 if p[1] == INSTRUCTION_FCVT_W_S else 1
 
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': rs2,
-        'rm_funct3': rm_funct3,
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=rs2,
+        rm_funct3=rm_funct3,
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_xreg_freg_id(p):
@@ -636,17 +643,17 @@ def p_floating_point_instruction_xreg_freg_id(p):
         raise Exception(error_message)
 
     rm_funct3 = FLOATING_POINT_ROUNDING_MODES[p[6]]
-    rs2 = '0' if p[1] == INSTRUCTION_FCVT_W_S else '1'
+    rs2 = 0 if p[1] == INSTRUCTION_FCVT_W_S else 1
 
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs1': get_f_register_index(p[4]),
-        'rs2': rs2,
-        'rm_funct3': rm_funct3,
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_x_register_index(p[2]),
+        rs1=get_f_register_index(p[4]),
+        rs2=rs2,
+        rm_funct3=rm_funct3,
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_xreg(p):
@@ -655,21 +662,21 @@ def p_floating_point_instruction_freg_xreg(p):
         error_message = f'Error: incorrect or unrocognized instruction at line {p.lineno(1)}'
         raise Exception(error_message)
 
-    rm_funct3 = '000'
-    rs2 = '0'
+    rm_funct3 = 0b000
+    rs2 = 0
     if p[1] in [INSTRUCTION_FCVT_S_W, INSTRUCTION_FCVT_S_WU]:
         rm_funct3 = FLOATING_POINT_ROUNDING_MODES['dyn']
-        rs2 = '0' if p[1] == INSTRUCTION_FCVT_S_W else '1'
+        rs2 = 0 if p[1] == INSTRUCTION_FCVT_S_W else 1
 
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_x_register_index(p[4]),
-        'rs2': rs2,
-        'rm_funct3': rm_funct3,
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_x_register_index(p[4]),
+        rs2=rs2,
+        rm_funct3=rm_funct3,
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_xreg_id(p):
@@ -683,17 +690,17 @@ def p_floating_point_instruction_freg_xreg_id(p):
         raise Exception(error_message)
 
     rm_funct3 = FLOATING_POINT_ROUNDING_MODES[p[6]]
-    rs2 = '0' if p[1] == INSTRUCTION_FCVT_S_W else '1'
+    rs2 = 0 if p[1] == INSTRUCTION_FCVT_S_W else 1
 
-    p[0] = {
-        'type': 'floating_point_r_instruction',
-        'opcode': p[1],
-        'rd': get_f_register_index(p[2]),
-        'rs1': get_x_register_index(p[4]),
-        'rs2': rs2,
-        'rm_funct3': rm_funct3,
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.FLOATING_POINT_R_INSTRUCTION,
+        opcode=OPCODE_IDS[p[1]],
+        rd=get_f_register_index(p[2]),
+        rs1=get_x_register_index(p[4]),
+        rs2=rs2,
+        rm_funct3=rm_funct3,
+        lineno=p.lineno(1)
+    )
 
 
 def p_floating_point_instruction_freg_imm_lparen_xreg_rparen(p):
@@ -703,99 +710,99 @@ def p_floating_point_instruction_freg_imm_lparen_xreg_rparen(p):
         raise Exception(error_message)
 
     if p[1] == INSTRUCTION_FLW:
-        p[0] = {
-            'type': 'i_load_instruction',
-            'opcode': p[1],
-            'rd': get_f_register_index(p[2]),
-            'rs1': get_x_register_index(p[6]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.I_LOAD_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rd=get_f_register_index(p[2]),
+            rs1=get_x_register_index(p[6]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
     elif p[1] == INSTRUCTION_FSW:
-        p[0] = {
-            'type': 's_instruction',
-            'opcode': p[1],
-            'rs2': get_f_register_index(p[2]),
-            'rs1': get_x_register_index(p[6]),
-            'imm': to_int(p[4]),
-            'lineno': p.lineno(1)
-        }
+        p[0] = Instruction(
+            InstructionKind.S_INSTRUCTION,
+            opcode=OPCODE_IDS[p[1]],
+            rs2=get_f_register_index(p[2]),
+            rs1=get_x_register_index(p[6]),
+            imm=to_int(p[4]),
+            lineno=p.lineno(1)
+        )
 
 
 def p_instruction_xreg_lparen_xreg_rparen(p):
     """expression : ID register COMMA LEFT_PAREN register RIGHT_PAREN NEWLINE"""
     instruction: str = p[1]
-    aq_rl_bits = '00'
+    aq_rl_bits = 0b00
     if instruction.endswith(".aqrl"):
         instruction = instruction.replace(".aqrl", "", 1)
-        aq_rl_bits = '11'
+        aq_rl_bits = 0b11
     elif instruction.endswith(".aq"):
         instruction = instruction.replace(".aq", "", 1)
-        aq_rl_bits = '10'
+        aq_rl_bits = 0b10
     elif instruction.endswith(".rl"):
         instruction = instruction.replace(".rl", "", 1)
-        aq_rl_bits = '01'
+        aq_rl_bits = 0b01
 
     if instruction != INSTRUCTION_A_LR_W:
         error_message = f'Error: incorrect or unrocognized instruction at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'atomic_instruction',
-        'opcode': p[1],
-        'rd': get_x_register_index(p[2]),
-        'rs2': '0',
-        'rs1': get_x_register_index(p[5]),
-        'aq_rl': aq_rl_bits,
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.ATOMIC_INSTRUCTION,
+        opcode=OPCODE_IDS[instruction],
+        rd=get_x_register_index(p[2]),
+        rs2=0,
+        rs1=get_x_register_index(p[5]),
+        aq_rl=aq_rl_bits,
+        lineno=p.lineno(1)
+    )
 
 
 def p_instruction_xreg_xreg_lparen_xreg_rparen(p):
     """expression : ID register COMMA register COMMA LEFT_PAREN register RIGHT_PAREN NEWLINE"""
     instruction: str = p[1]
-    aq_rl_bits = '00'
+    aq_rl_bits = 0b00
     if instruction.endswith(".aqrl"):
         instruction = instruction.replace(".aqrl", "", 1)
-        aq_rl_bits = '11'
+        aq_rl_bits = 0b11
     elif instruction.endswith(".aq"):
         instruction = instruction.replace(".aq", "", 1)
-        aq_rl_bits = '10'
+        aq_rl_bits = 0b10
     elif instruction.endswith(".rl"):
         instruction = instruction.replace(".rl", "", 1)
-        aq_rl_bits = '01'
+        aq_rl_bits = 0b01
 
     if instruction not in ATOMIC_INSTRUCTIONS:
         error_message = f'Error: incorrect or unrocognized instruction at line {p.lineno(1)}'
         raise Exception(error_message)
-    p[0] = {
-        'type': 'atomic_instruction',
-        'opcode': instruction,
-        'rd': get_x_register_index(p[2]),
-        'rs2': get_x_register_index(p[4]),
-        'rs1': get_x_register_index(p[7]),
-        'aq_rl': aq_rl_bits,
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.ATOMIC_INSTRUCTION,
+        opcode=OPCODE_IDS[instruction],
+        rd=get_x_register_index(p[2]),
+        rs2=get_x_register_index(p[4]),
+        rs1=get_x_register_index(p[7]),
+        aq_rl=aq_rl_bits,
+        lineno=p.lineno(1)
+    )
 
 
 def p_xreg(p):
     """register : REGISTER"""
-    reg_number = int(get_x_register_index(p[1]))
+    reg_number = get_x_register_index(p[1])
     p[0] = p[1]
 
 
 def p_freg(p):
     """f_register : F_REGISTER"""
-    reg_number = int(get_f_register_index(p[1]))
+    reg_number = get_f_register_index(p[1])
     p[0] = p[1]
 
 
 def p_newline(p):
     """expression : NEWLINE"""
-    p[0] = {
-        'type': 'new_line',
-        'lineno': p.lineno(1)
-    }
+    p[0] = Instruction(
+        InstructionKind.NEW_LINE,
+        lineno=p.lineno(1)
+    )
 
 
 def p_error(p):
@@ -807,4 +814,25 @@ def p_error(p):
         raise Exception(error_message)
 
 
-parser = yacc.yacc()
+_parser = None
+_parser_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def build_parser():
+    import ply.yacc as yacc
+    return yacc.yacc(
+        optimize=1, debug=False, write_tables=True,
+        tabmodule='parsetab', outputdir=os.path.dirname(os.path.abspath(__file__))
+    )
+
+
+def get_parser():
+    global _parser
+    parser = getattr(_thread_state, 'parser', None)
+    if parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = build_parser()
+        parser = _thread_state.parser = copy.copy(_parser)
+    return parser
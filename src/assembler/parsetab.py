@@ -0,0 +1,69 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'COMMA COMPRESSED_ID F_REGISTER ID IMMEDIATE LABEL_COLON LEFT_PAREN NEWLINE REGISTER RIGHT_PARENexpression : ID NEWLINEexpression : LABEL_COLON NEWLINEexpression : ID register COMMA register COMMA register NEWLINEexpression : ID register COMMA register COMMA IMMEDIATE NEWLINEexpression : ID register COMMA IMMEDIATE COMMA register NEWLINEexpression : ID register COMMA IMMEDIATE COMMA IMMEDIATE NEWLINEexpression : ID register COMMA ID COMMA IMMEDIATE NEWLINEexpression : ID register COMMA ID COMMA register NEWLINEexpression : ID ID COMMA ID NEWLINEexpression : ID register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINEexpression : ID register COMMA IMMEDIATE NEWLINEexpression : ID register COMMA ID NEWLINEexpression : ID register COMMA register COMMA ID NEWLINEexpression : COMPRESSED_ID NEWLINEexpression : COMPRESSED_ID register COMMA register NEWLINEexpression : COMPRESSED_ID register COMMA register COMMA IMMEDIATE NEWLINEexpression : COMPRESSED_ID register COMMA IMMEDIATE NEWLINEexpression : COMPRESSED_ID register COMMA ID NEWLINEexpression : COMPRESSED_ID register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINEexpression : COMPRESSED_ID f_register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINEexpression : COMPRESSED_ID IMMEDIATE NEWLINEexpression : COMPRESSED_ID register NEWLINEexpression : ID f_register COMMA f_register COMMA f_register NEWLINEexpression : ID f_register COMMA f_register COMMA f_register COMMA f_register NEWLINEexpression : ID f_register COMMA f_register COMMA f_register COMMA f_register COMMA ID NEWLINEexpression : ID f_register COMMA f_register COMMA f_register COMMA ID NEWLINEexpression : ID register COMMA f_register COMMA f_register NEWLINEexpression : ID f_register COMMA f_register NEWLINEexpression : ID f_register COMMA f_register COMMA ID NEWLINEexpression : ID register COMMA f_register NEWLINEexpression : ID register COMMA f_register COMMA ID NEWLINEexpression : ID f_register COMMA register NEWLINEexpression : ID f_register COMMA register COMMA ID NEWLINEexpression : ID f_register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINEexpression : ID register COMMA LEFT_PAREN register RIGHT_PAREN NEWLINEexpression : ID register COMMA register COMMA LEFT_PAREN register RIGHT_PAREN NEWLINEregister : REGISTERf_register : F_REGISTERexpression : NEWLINE'
+    
+_lr_action_items = {'ID':([0,2,17,18,20,40,45,47,49,90,106,],[2,6,24,25,35,60,68,70,72,99,108,]),'LABEL_COLON':([0,],[4,]),'COMPRESSED_ID':([0,],[5,]),'NEWLINE':([0,2,4,5,10,11,14,15,24,25,27,29,30,31,33,34,35,58,59,60,61,62,64,65,67,68,69,70,71,72,74,85,93,95,96,97,99,100,108,],[3,7,12,13,-37,-38,21,22,37,39,42,46,48,50,53,54,56,77,78,79,80,81,83,84,86,87,88,89,91,92,94,98,101,102,103,104,105,107,109,]),'$end':([1,3,7,12,13,21,22,37,39,42,46,48,50,53,54,56,77,78,79,80,81,83,84,86,87,88,89,91,92,94,98,101,102,103,104,105,107,109,],[0,-39,-1,-2,-14,-22,-21,-9,-12,-11,-30,-28,-32,-15,-17,-18,-8,-7,-13,-3,-4,-5,-6,-35,-31,-27,-29,-23,-33,-16,-10,-34,-19,-20,-36,-26,-24,-25,]),'REGISTER':([2,5,18,19,20,28,38,40,41,43,51,55,57,63,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'F_REGISTER':([2,5,18,19,45,47,90,],[11,11,11,11,11,11,11,]),'IMMEDIATE':([5,18,19,20,23,38,40,41,52,],[15,27,32,34,36,59,62,65,74,]),'COMMA':([6,8,9,10,11,14,16,25,26,27,29,30,31,33,71,100,],[17,18,19,-37,-38,20,23,38,40,41,45,47,49,52,90,106,]),'RIGHT_PAREN':([10,44,66,73,75,76,82,],[-37,67,85,93,95,96,97,]),'LEFT_PAREN':([18,27,32,34,36,40,],[28,43,51,55,57,63,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expression':([0,],[1,]),'register':([2,5,18,19,20,28,38,40,41,43,51,55,57,63,],[8,14,26,31,33,44,58,61,64,66,73,75,76,82,]),'f_register':([2,5,18,19,45,47,90,],[9,16,29,30,69,71,100,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> expression","S'",1,None,None,None),
+  ('expression -> ID NEWLINE','expression',2,'p_instruction_no_args','parser.py',24),
+  ('expression -> LABEL_COLON NEWLINE','expression',2,'p_label','parser.py',67),
+  ('expression -> ID register COMMA register COMMA register NEWLINE','expression',7,'p_instruction_xreg_xreg_xreg','parser.py',76),
+  ('expression -> ID register COMMA register COMMA IMMEDIATE NEWLINE','expression',7,'p_instruction_xreg_xreg_imm','parser.py',88),
+  ('expression -> ID register COMMA IMMEDIATE COMMA register NEWLINE','expression',7,'p_instruction_xreg_imm_xreg','parser.py',111),
+  ('expression -> ID register COMMA IMMEDIATE COMMA IMMEDIATE NEWLINE','expression',7,'p_instruction_xreg_imm_imm','parser.py',126),
+  ('expression -> ID register COMMA ID COMMA IMMEDIATE NEWLINE','expression',7,'p_instruction_xreg_id_imm','parser.py',141),
+  ('expression -> ID register COMMA ID COMMA register NEWLINE','expression',7,'p_instruction_xreg_id_xreg','parser.py',156),
+  ('expression -> ID ID COMMA ID NEWLINE','expression',5,'p_instruction_xreg_id_id','parser.py',174),
+  ('expression -> ID register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINE','expression',8,'p_instruction_xreg_imm_lparen_xreg_rparen','parser.py',197),
+  ('expression -> ID register COMMA IMMEDIATE NEWLINE','expression',5,'p_instruction_xreg_imm','parser.py',228),
+  ('expression -> ID register COMMA ID NEWLINE','expression',5,'p_instruction_xreg_id','parser.py',240),
+  ('expression -> ID register COMMA register COMMA ID NEWLINE','expression',7,'p_instruction_xreg_xreg_id','parser.py',254),
+  ('expression -> COMPRESSED_ID NEWLINE','expression',2,'p_compressed_instruction','parser.py',266),
+  ('expression -> COMPRESSED_ID register COMMA register NEWLINE','expression',5,'p_compressed_instruction_xreg_xreg','parser.py',289),
+  ('expression -> COMPRESSED_ID register COMMA register COMMA IMMEDIATE NEWLINE','expression',7,'p_compressed_instruction_xreg_xreg_imm','parser.py',300),
+  ('expression -> COMPRESSED_ID register COMMA IMMEDIATE NEWLINE','expression',5,'p_compressed_instruction_xreg_imm','parser.py',324),
+  ('expression -> COMPRESSED_ID register COMMA ID NEWLINE','expression',5,'p_compressed_instruction_xreg_id','parser.py',353),
+  ('expression -> COMPRESSED_ID register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINE','expression',8,'p_compressed_instruction_xreg_imm_lparen_xreg_rparen','parser.py',368),
+  ('expression -> COMPRESSED_ID f_register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINE','expression',8,'p_compressed_instruction_freg_imm_lparen_xreg_rparen','parser.py',412),
+  ('expression -> COMPRESSED_ID IMMEDIATE NEWLINE','expression',3,'p_compressed_instruction_imm','parser.py',461),
+  ('expression -> COMPRESSED_ID register NEWLINE','expression',3,'p_compressed_instruction_xreg','parser.py',471),
+  ('expression -> ID f_register COMMA f_register COMMA f_register NEWLINE','expression',7,'p_floating_point_instruction_freg_freg_freg','parser.py',493),
+  ('expression -> ID f_register COMMA f_register COMMA f_register COMMA f_register NEWLINE','expression',9,'p_floating_point_instruction_freg_freg_freg_freg','parser.py',510),
+  ('expression -> ID f_register COMMA f_register COMMA f_register COMMA f_register COMMA ID NEWLINE','expression',11,'p_floating_point_instruction_freg_freg_freg_freg_id','parser.py',528),
+  ('expression -> ID f_register COMMA f_register COMMA f_register COMMA ID NEWLINE','expression',9,'p_floating_point_instruction_freg_freg_freg_id','parser.py',551),
+  ('expression -> ID register COMMA f_register COMMA f_register NEWLINE','expression',7,'p_floating_point_instruction_xreg_freg_freg','parser.py',569),
+  ('expression -> ID f_register COMMA f_register NEWLINE','expression',5,'p_floating_point_instruction_freg_freg','parser.py',582),
+  ('expression -> ID f_register COMMA f_register COMMA ID NEWLINE','expression',7,'p_floating_point_instruction_freg_freg_id','parser.py',595),
+  ('expression -> ID register COMMA f_register NEWLINE','expression',5,'p_floating_point_instruction_xreg_freg','parser.py',613),
+  ('expression -> ID register COMMA f_register COMMA ID NEWLINE','expression',7,'p_floating_point_instruction_xreg_freg_id','parser.py',636),
+  ('expression -> ID f_register COMMA register NEWLINE','expression',5,'p_floating_point_instruction_freg_xreg','parser.py',660),
+  ('expression -> ID f_register COMMA register COMMA ID NEWLINE','expression',7,'p_floating_point_instruction_freg_xreg_id','parser.py',683),
+  ('expression -> ID f_register COMMA IMMEDIATE LEFT_PAREN register RIGHT_PAREN NEWLINE','expression',8,'p_floating_point_instruction_freg_imm_lparen_xreg_rparen','parser.py',707),
+  ('expression -> ID register COMMA LEFT_PAREN register RIGHT_PAREN NEWLINE','expression',7,'p_instruction_xreg_lparen_xreg_rparen','parser.py',733),
+  ('expression -> ID register COMMA register COMMA LEFT_PAREN register RIGHT_PAREN NEWLINE','expression',9,'p_instruction_xreg_xreg_lparen_xreg_rparen','parser.py',761),
+  ('register -> REGISTER','register',1,'p_xreg','parser.py',789),
+  ('f_register -> F_REGISTER','f_register',1,'p_freg','parser.py',795),
+  ('expression -> NEWLINE','expression',1,'p_newline','parser.py',801),
+]
@@ -20,13 +20,13 @@ def _register_rename(reg_name: str) -> str:
     return replacements[reg_name]
 
 
-def get_x_register_index(reg_name: str) -> str:
+def get_x_register_index(reg_name: str) -> int:
     if 'x' not in reg_name:
         reg_name = _register_rename(reg_name).replace("x", "")
-    return reg_name.replace("x", "")
+    return int(reg_name.replace("x", ""))
 
 
-def get_f_register_index(reg_name: str) -> str:
+def get_f_register_index(reg_name: str) -> int:
     if reg_name in replacements:
         reg_name = replacements[reg_name]
-    return reg_name.replace("f", "")
+    return int(reg_name.replace("f", ""))
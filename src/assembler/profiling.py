@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class AssemblyProfiler:
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.stats = {}
+        self.trace_events = []
+        self._origin = time.perf_counter()
+
+    def record(self, name: str, category: str, start: float, end: float) -> None:
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = [category, 0, 0.0]
+        stat[1] += 1
+        stat[2] += end - start
+        if self.trace:
+            self.trace_events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+            })
+
+    @contextmanager
+    def phase(self, name: str, category='phase'):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter())
+
+    def wrap(self, function, name: str, category='phase'):
+        record = self.record
+        perf_counter = time.perf_counter
+
+        def timed_function(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, category, start, perf_counter())
+        return timed_function
+
+    def summary(self) -> str:
+        lines = [f'{"phase":<42} {"category":<8} {"calls":>9} {"total [ms]":>11} {"mean [us]":>10}']
+        for name, (category, calls, seconds) in sorted(self.stats.items(), key=lambda item: -item[1][2]):
+            lines.append(f'{name:<42} {category:<8} {calls:>9} {1e3 * seconds:>11.2f} {1e6 * seconds / calls:>10.2f}')
+        return '\n'.join(lines) + '\n'
+
+    def to_chrome_trace(self) -> dict:
+        return {'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, filename) -> None:
+        with open(filename, 'w') as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
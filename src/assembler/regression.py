@@ -0,0 +1,127 @@
+import glob
+import os
+import time
+from functools import partial
+from typing import NamedTuple
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.batch import map_jobs, read_source
+from assembler.disassembler import to_disassembly_listing
+from assembler.output_formats import to_hex_text
+from assembler.simulator import Simulator, format_registers, format_simulation_result
+
+
+REGRESSION_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'regression')
+
+GOLDEN_SUFFIX = '.txt'
+SIMULATION_GOLDEN_SUFFIX = '.sim'
+
+
+class RegressionResult(NamedTuple):
+    filename: str
+    error: str
+    seconds: float
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None
+
+
+def get_golden_filename(assembly_filename, suffix=GOLDEN_SUFFIX) -> str:
+    return os.path.splitext(assembly_filename)[0] + suffix
+
+
+def find_first_difference(machine_code, golden_text: str):
+    actual_words = to_hex_text(machine_code).split()
+    expected_words = golden_text.split()
+    address = 0
+    for index in range(max(len(actual_words), len(expected_words))):
+        if index >= len(actual_words):
+            return f'line {index + 1} (address 0x{address:x}): expected {expected_words[index]}, got nothing'
+        if index >= len(expected_words):
+            return f'line {index + 1} (address 0x{address:x}): expected nothing, got {actual_words[index]}'
+        if actual_words[index] != expected_words[index].lower():
+            return (
+                f'line {index + 1} (address 0x{address:x}): expected {expected_words[index]}, '
+                f'got {actual_words[index]}'
+            )
+        address += len(actual_words[index]) // 2
+    return None
+
+
+def find_round_trip_difference(result):
+    reassembled = AssembleRisc().assemble_source(to_disassembly_listing(result.image))
+    difference = find_first_difference(reassembled.machine_code, to_hex_text(result.machine_code))
+    return None if difference is None else 'disassembly round trip, ' + difference
+
+
+def simulate_result(result) -> (str, str):
+    simulator = Simulator.from_assembly_result(result)
+    simulation_result = simulator.run()
+    return format_registers(simulator), format_simulation_result(simulation_result)
+
+
+def find_line_difference(actual_text: str, expected_text: str, description: str):
+    actual_lines = actual_text.splitlines()
+    expected_lines = expected_text.splitlines()
+    for index in range(max(len(actual_lines), len(expected_lines))):
+        actual_line = actual_lines[index] if index < len(actual_lines) else 'nothing'
+        expected_line = expected_lines[index] if index < len(expected_lines) else 'nothing'
+        if actual_line != expected_line:
+            return f'{description} line {index + 1}: expected {expected_line}, got {actual_line}'
+    return None
+
+
+def find_simulation_difference(source: str, result, golden_text: str):
+    registers, stop_text = simulate_result(result)
+    difference = find_line_difference(registers + stop_text, golden_text, 'simulation')
+    if difference is None:
+        # Compression moves code and so changes the stop address and the instruction count, but not the registers.
+        compressed_registers, _ = simulate_result(AssembleRisc(compress=True).assemble_source(source))
+        difference = find_line_difference(compressed_registers, registers, 'simulation with --compress')
+    return difference
+
+
+def get_regression_filenames(directory=REGRESSION_DIRECTORY) -> list:
+    return sorted(glob.glob(os.path.join(directory, '*.s')))
+
+
+def check_regression_file(assembly_filename, assemble_source) -> RegressionResult:
+    start = time.perf_counter()
+    try:
+        source = read_source(assembly_filename)
+        result = assemble_source(source)
+        with open(get_golden_filename(assembly_filename)) as golden_file:
+            error = find_first_difference(result.machine_code, golden_file.read())
+        if error is None:
+            error = find_round_trip_difference(result)
+        simulation_golden_filename = get_golden_filename(assembly_filename, SIMULATION_GOLDEN_SUFFIX)
+        if error is None and os.path.exists(simulation_golden_filename):
+            with open(simulation_golden_filename) as golden_file:
+                error = find_simulation_difference(source, result, golden_file.read())
+    except Exception as e:
+        error = str(e)
+    return RegressionResult(assembly_filename, error, time.perf_counter() - start)
+
+
+def _run_regression_file(assembly_filename, cache=None) -> RegressionResult:
+    assemble_source = AssembleRisc().assemble_source
+    if cache is not None:
+        assemble_source = partial(cache.get_or_assemble, assemble_function=assemble_source)
+    return check_regression_file(assembly_filename, assemble_source)
+
+
+def run_regression_suite(directory=REGRESSION_DIRECTORY, jobs=None, cache=None) -> list:
+    return map_jobs(partial(_run_regression_file, cache=cache), get_regression_filenames(directory), jobs)
+
+
+def format_regression_report(results, wall_seconds: float, directory=REGRESSION_DIRECTORY) -> str:
+    lines = []
+    for result in results:
+        name = os.path.relpath(result.filename, directory)
+        status = 'ok' if result.passed else 'FAILED'
+        line = f'{name:<40} {status:<6} {1e3 * result.seconds:>9.1f} ms'
+        lines.append(line if result.passed else line + '  ' + result.error.replace('\n', '\\n'))
+    failed_count = sum(not result.passed for result in results)
+    lines.append(f'{len(results)} files, {failed_count} failed, {wall_seconds:.2f} s wall time')
+    return '\n'.join(lines) + '\n'
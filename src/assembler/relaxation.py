@@ -0,0 +1,223 @@
+from bisect import bisect_left
+from itertools import accumulate
+from operator import add
+
+from assembler.instruction_info import *
+from assembler.instruction_ir import Instruction, InstructionKind, OPCODE_IDS
+
+
+B_OFFSET_RANGE = (-(1 << 12), (1 << 12) - 2)
+JAL_OFFSET_RANGE = (-(1 << 20), (1 << 20) - 2)
+COMPRESSED_B_OFFSET_RANGE = (-(1 << 8), (1 << 8) - 2)
+COMPRESSED_J_OFFSET_RANGE = (-(1 << 11), (1 << 11) - 2)
+
+PC_RELATIVE_OFFSET_RANGES = {
+    InstructionKind.B_INSTRUCTION: B_OFFSET_RANGE,
+    InstructionKind.JAL_INSTRUCTION: JAL_OFFSET_RANGE,
+    InstructionKind.COMPRESSED_B_INSTRUCTION: COMPRESSED_B_OFFSET_RANGE,
+    InstructionKind.COMPRESSED_J_INSTRUCTION: COMPRESSED_J_OFFSET_RANGE
+}
+
+# Each form is (size, offset of the jump inside the sequence, offset range or None when any offset fits).
+RELAXATION_FORMS = {
+    InstructionKind.COMPRESSED_B_INSTRUCTION: (
+        (2, 0, COMPRESSED_B_OFFSET_RANGE), (4, 0, B_OFFSET_RANGE), (8, 4, JAL_OFFSET_RANGE), (12, 4, None)
+    ),
+    InstructionKind.B_INSTRUCTION: ((4, 0, B_OFFSET_RANGE), (8, 4, JAL_OFFSET_RANGE), (12, 4, None)),
+    InstructionKind.JAL_INSTRUCTION: ((4, 0, JAL_OFFSET_RANGE), (8, 0, None)),
+    InstructionKind.COMPRESSED_J_INSTRUCTION: (
+        (2, 0, COMPRESSED_J_OFFSET_RANGE), (4, 0, JAL_OFFSET_RANGE), (8, 0, None)
+    )
+}
+
+INVERTED_BRANCHES = {
+    INSTRUCTION_BEQ: INSTRUCTION_BNE,
+    INSTRUCTION_BNE: INSTRUCTION_BEQ,
+    INSTRUCTION_BLT: INSTRUCTION_BGE,
+    INSTRUCTION_BGE: INSTRUCTION_BLT,
+    INSTRUCTION_BLTU: INSTRUCTION_BGEU,
+    INSTRUCTION_BGEU: INSTRUCTION_BLTU
+}
+
+EXPANDED_COMPRESSED_BRANCHES = {INSTRUCTION_C_BEQZ: INSTRUCTION_BEQ, INSTRUCTION_C_BNEZ: INSTRUCTION_BNE}
+
+COMPRESSED_JUMP_LINK_REGISTERS = {INSTRUCTION_C_J: 0, INSTRUCTION_C_JAL: 1}
+
+_new_instruction = tuple.__new__
+
+# t1, the register used by the far-jump sequences of the GNU assembler when the jump does not link. These sequences
+# are only emitted when far jumps are enabled, since they overwrite the program's t1.
+SCRATCH_REGISTER = 6
+
+
+def fits_offset(offset: int, offset_range) -> bool:
+    return offset_range is None or offset_range[0] <= offset <= offset_range[1]
+
+
+def find_out_of_range_instructions(parsed_instructions, labels_table) -> list:
+    return [
+        index for index, (address, parse_info) in enumerate(parsed_instructions)
+        if parse_info.label is not None and parse_info.kind in PC_RELATIVE_OFFSET_RANGES and
+        parse_info.label in labels_table and
+        not fits_offset(labels_table[parse_info.label] - address, PC_RELATIVE_OFFSET_RANGES[parse_info.kind])
+    ]
+
+
+def _spans_any(sorted_indexes, index: int, label_index: int) -> bool:
+    low, high = min(index, label_index), max(index, label_index)
+    position = bisect_left(sorted_indexes, low)
+    return position < len(sorted_indexes) and sorted_indexes[position] < high
+
+
+def find_relaxation_levels(parsed_instructions, labels_table) -> dict:
+    if not find_out_of_range_instructions(parsed_instructions, labels_table):
+        return {}
+
+    addresses = [address for address, _ in parsed_instructions]
+    label_indexes = {label: bisect_left(addresses, address) for label, address in labels_table.items()}
+    all_candidates = [
+        (index, address, labels_table[parse_info.label], label_indexes[parse_info.label],
+         RELAXATION_FORMS[parse_info.kind])
+        for index, (address, parse_info) in enumerate(parsed_instructions)
+        if parse_info.label is not None and parse_info.kind in RELAXATION_FORMS and parse_info.label in labels_table
+    ]
+    candidates = all_candidates
+    shifts = [0] * len(parsed_instructions)
+    levels = {}
+    while candidates:
+        shift_prefix = [0] + list(accumulate(shifts))
+        grown_indexes = []
+        grown_shifts = [0]
+        grown_total = 0
+        for index, address, label_address, label_index, forms in candidates:
+            forward = label_index > index
+            if forward:
+                target_shift = shift_prefix[label_index] + grown_total
+            else:
+                target_shift = shift_prefix[label_index] + grown_shifts[bisect_left(grown_indexes, label_index)]
+            offset = label_address + target_shift - address - shift_prefix[index] - grown_total
+            level = old_level = levels.get(index, 0)
+            old_size = forms[old_level][0]
+            while True:
+                size, jump_position, offset_range = forms[level]
+                jump_offset = offset - jump_position + (size - old_size if forward else 0)
+                if offset_range is None or offset_range[0] <= jump_offset <= offset_range[1]:
+                    break
+                level += 1
+            if level != old_level:
+                shifts[index] += size - old_size
+                grown_total += size - old_size
+                grown_indexes.append(index)
+                grown_shifts.append(grown_total)
+                levels[index] = level
+        if not grown_indexes:
+            break
+        # Any branch spanning an instruction that grew is checked again, including ones that fit in earlier passes.
+        candidates = [
+            candidate for candidate in all_candidates
+            if levels.get(candidate[0], 0) < len(candidate[4]) - 1 and
+            _spans_any(grown_indexes, candidate[0], candidate[3])
+        ]
+    return levels
+
+
+def _make_instruction(opcode: str, kind, lineno: int, rd=0, rs1=0, rs2=0, imm=0, label=None) -> Instruction:
+    return _new_instruction(Instruction, (kind, OPCODE_IDS[opcode], rd, rs1, rs2, 0, imm, label, 0, 0, 0, 0, lineno))
+
+
+def expand_far_jump(rd: int, offset: int, lineno: int) -> list:
+    scratch_register = rd if rd != 0 else SCRATCH_REGISTER
+    upper = (offset + 0x800) >> 12
+    return [
+        _make_instruction(INSTRUCTION_AUIPC, InstructionKind.U_INSTRUCTION, lineno, rd=scratch_register, imm=upper),
+        _make_instruction(
+            INSTRUCTION_JALR, InstructionKind.JALR_INSTRUCTION, lineno, rd=rd, rs1=scratch_register,
+            imm=offset - (upper << 12)
+        )
+    ]
+
+
+def expand_instruction(parse_info, size: int, offset: int) -> list:
+    lineno = parse_info.lineno
+    if parse_info.kind == InstructionKind.JAL_INSTRUCTION:
+        return expand_far_jump(parse_info.rd, offset, lineno)
+    if parse_info.kind == InstructionKind.COMPRESSED_J_INSTRUCTION:
+        rd = COMPRESSED_JUMP_LINK_REGISTERS[parse_info.mnemonic]
+        if size == 4:
+            return [_make_instruction(
+                INSTRUCTION_JAL, InstructionKind.JAL_INSTRUCTION, lineno, rd=rd, label=parse_info.label
+            )]
+        return expand_far_jump(rd, offset, lineno)
+
+    opcode = EXPANDED_COMPRESSED_BRANCHES.get(parse_info.mnemonic, parse_info.mnemonic)
+    if size == 4:
+        return [_make_instruction(
+            opcode, InstructionKind.B_INSTRUCTION, lineno, rs1=parse_info.rs1, rs2=parse_info.rs2,
+            label=parse_info.label
+        )]
+    inverted_branch = _make_instruction(
+        INVERTED_BRANCHES[opcode], InstructionKind.B_INSTRUCTION, lineno, rs1=parse_info.rs1, rs2=parse_info.rs2,
+        imm=size
+    )
+    if size == 8:
+        return [
+            inverted_branch,
+            _make_instruction(INSTRUCTION_JAL, InstructionKind.JAL_INSTRUCTION, lineno, label=parse_info.label)
+        ]
+    return [inverted_branch] + expand_far_jump(0, offset - 4, lineno)
+
+
+def uses_scratch_register(parse_info, level: int) -> bool:
+    if RELAXATION_FORMS[parse_info.kind][level][2] is not None:
+        return False
+    if parse_info.kind == InstructionKind.JAL_INSTRUCTION:
+        return parse_info.rd == 0
+    if parse_info.kind == InstructionKind.COMPRESSED_J_INSTRUCTION:
+        return COMPRESSED_JUMP_LINK_REGISTERS[parse_info.mnemonic] == 0
+    return True
+
+
+def relax_branches(context, far_jumps=False) -> bool:
+    parsed_instructions = context.parsed_instructions
+    labels_table = context.labels_table
+    levels = find_relaxation_levels(parsed_instructions, labels_table)
+    if not levels:
+        return False
+    if not far_jumps:
+        for index in sorted(levels):
+            parse_info = parsed_instructions[index][1]
+            if uses_scratch_register(parse_info, levels[index]):
+                error_message = (
+                    'Error: label {} out of range at line {}, reaching it needs --far-jumps, which overwrites t1'
+                ).format(parse_info.label, str(parse_info.lineno))
+                raise Exception(error_message)
+
+    old_addresses = [address for address, _ in parsed_instructions]
+    shifts = [0] * (len(parsed_instructions) + 1)
+    sizes = {}
+    for index, level in levels.items():
+        forms = RELAXATION_FORMS[parsed_instructions[index][1].kind]
+        sizes[index] = forms[level][0]
+        shifts[index + 1] = forms[level][0] - forms[0][0]
+    addresses = list(map(add, old_addresses + [context.instruction_address], accumulate(shifts)))
+    for label, address in labels_table.items():
+        labels_table[label] = addresses[bisect_left(old_addresses, address)]
+
+    relaxed_instructions = []
+    start = 0
+    for index in sorted(levels):
+        relaxed_instructions.extend(zip(addresses[start:index], [
+            parse_info for _, parse_info in parsed_instructions[start:index]
+        ]))
+        parse_info = parsed_instructions[index][1]
+        address = addresses[index]
+        for instruction in expand_instruction(parse_info, sizes[index], labels_table[parse_info.label] - address):
+            relaxed_instructions.append((address, instruction))
+            address += instruction.size
+        start = index + 1
+    relaxed_instructions.extend(zip(addresses[start:-1], [
+        parse_info for _, parse_info in parsed_instructions[start:]
+    ]))
+    context.parsed_instructions = relaxed_instructions
+    context.instruction_address = addresses[-1]
+    return True
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.batch import initialize_worker, read_source
+from assembler.client import DEFAULT_SOCKET_PATH, MESSAGE_LENGTH
+
+
+_assembler = None
+
+
+def _assemble_request(request) -> tuple:
+    global _assembler
+    if _assembler is None:
+        _assembler = AssembleRisc()
+    source = request['source'] if 'source' in request else read_source(request['path'])
+    result = _assembler.assemble_source(source)
+    return result.image, result.labels_table
+
+
+def _decode_request(message: bytes) -> dict:
+    try:
+        request = json.loads(message)
+    except ValueError:
+        request = None
+    if not isinstance(request, dict) or not ('source' in request or 'path' in request):
+        error_message = 'Error: malformed request, expected a JSON object with a source or path key'
+        raise Exception(error_message)
+    return request
+
+
+async def _read_message(reader) -> bytes:
+    length, = MESSAGE_LENGTH.unpack(await reader.readexactly(MESSAGE_LENGTH.size))
+    return await reader.readexactly(length)
+
+
+def _write_message(writer, body: bytes) -> None:
+    writer.write(MESSAGE_LENGTH.pack(len(body)) + body)
+
+
+async def _handle_client(reader, writer, executor) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                message = await _read_message(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            try:
+                request = _decode_request(message)
+                image, labels_table = await loop.run_in_executor(executor, _assemble_request, request)
+                header = {'labels_table': labels_table}
+            except Exception as e:
+                image, header = b'', {'error': str(e)}
+            try:
+                _write_message(writer, json.dumps(header).encode())
+                _write_message(writer, image)
+                await writer.drain()
+            except ConnectionError:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(socket_path=DEFAULT_SOCKET_PATH, jobs=None) -> None:
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1, initializer=initialize_worker) as executor:
+        # A path request reads any file the server can read, so only the user running the server may connect. The
+        # umask keeps the socket private between its creation and the chmod.
+        old_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(partial(_handle_client, executor=executor), path=socket_path)
+        finally:
+            os.umask(old_umask)
+        os.chmod(socket_path, 0o600)
+        async with server:
+            await server.serve_forever()
+
+
+def _remove_stale_socket(socket_path) -> None:
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        error_message = 'Error: {} exists and is not a socket'.format(socket_path)
+        raise Exception(error_message)
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    error_message = 'Error: an assembler server is already listening on {}'.format(socket_path)
+    raise Exception(error_message)
+
+
+def run_server(socket_path=DEFAULT_SOCKET_PATH, jobs=None) -> None:
+    _remove_stale_socket(socket_path)
+    try:
+        asyncio.run(serve(socket_path, jobs))
+    finally:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,831 @@
+import math
+import operator
+import struct
+from array import array
+from typing import NamedTuple
+
+from assembler.csr_registers import CSR_ENCODING_TABLE
+from assembler.disassembler import DECODINGS, find_opcode_id
+from assembler.encoding_templates import ENCODING_TEMPLATES
+from assembler.instruction_info import *
+from assembler.instruction_ir import InstructionKind
+from assembler.output_formats import is_compressed
+
+
+DEFAULT_MEMORY_SIZE = 1 << 20
+
+DEFAULT_MAX_INSTRUCTIONS = 10000000
+
+WORD_MASK = 0xffffffff
+SIGN_BIT = 0x80000000
+
+ZERO_REGISTER_SINK = 32
+STACK_POINTER = 2
+RETURN_ADDRESS = 1
+ARGUMENT_REGISTER_A0 = 10
+ARGUMENT_REGISTER_A7 = 17
+
+EXIT_SYSTEM_CALL = 93
+
+STOP_EXIT = 'exit'
+STOP_ECALL = 'ecall'
+STOP_EBREAK = 'ebreak'
+STOP_INSTRUCTION_LIMIT = 'instruction limit'
+
+CANONICAL_NAN = 0x7fc00000
+POSITIVE_INFINITY = 0x7f800000
+NEGATIVE_INFINITY = 0xff800000
+
+FFLAGS_CSR = CSR_ENCODING_TABLE['fflags']
+FRM_CSR = CSR_ENCODING_TABLE['frm']
+FCSR_CSR = CSR_ENCODING_TABLE['fcsr']
+COUNTER_CSRS = [CSR_ENCODING_TABLE[name] for name in ['cycle', 'time', 'instret']]
+COUNTER_HIGH_CSRS = [CSR_ENCODING_TABLE[name] for name in ['cycleh', 'timeh', 'instreth']]
+
+_HALF = struct.Struct('<H')
+_WORD = struct.Struct('<I')
+_SINGLE = struct.Struct('<f')
+_DOUBLE = struct.Struct('<d')
+_DOUBLE_WORD = struct.Struct('<Q')
+
+
+def _signed(value: int) -> int:
+    return value - ((value & SIGN_BIT) << 1)
+
+
+def _divide(a: int, b: int) -> int:
+    if b == 0:
+        return WORD_MASK
+    a, b = _signed(a), _signed(b)
+    quotient = abs(a) // abs(b)
+    return (quotient if (a < 0) == (b < 0) else -quotient) & WORD_MASK
+
+
+def _remainder(a: int, b: int) -> int:
+    if b == 0:
+        return a
+    a_signed = _signed(a)
+    remainder = abs(a_signed) % abs(_signed(b))
+    return (remainder if a_signed >= 0 else -remainder) & WORD_MASK
+
+
+R_OPERATIONS = {
+    INSTRUCTION_ADD: lambda a, b: (a + b) & WORD_MASK,
+    INSTRUCTION_SUB: lambda a, b: (a - b) & WORD_MASK,
+    INSTRUCTION_SLL: lambda a, b: (a << (b & 0x1f)) & WORD_MASK,
+    INSTRUCTION_SLT: lambda a, b: int((a ^ SIGN_BIT) < (b ^ SIGN_BIT)),
+    INSTRUCTION_SLTU: lambda a, b: int(a < b),
+    INSTRUCTION_XOR: operator.xor,
+    INSTRUCTION_SRL: lambda a, b: a >> (b & 0x1f),
+    INSTRUCTION_SRA: lambda a, b: (_signed(a) >> (b & 0x1f)) & WORD_MASK,
+    INSTRUCTION_OR: operator.or_,
+    INSTRUCTION_AND: operator.and_,
+    INSTRUCTION_MUL: lambda a, b: (a * b) & WORD_MASK,
+    INSTRUCTION_MULH: lambda a, b: (_signed(a) * _signed(b) >> 32) & WORD_MASK,
+    INSTRUCTION_MULHSU: lambda a, b: (_signed(a) * b >> 32) & WORD_MASK,
+    INSTRUCTION_MULHU: lambda a, b: (a * b) >> 32,
+    INSTRUCTION_DIV: _divide,
+    INSTRUCTION_DIVU: lambda a, b: a // b if b else WORD_MASK,
+    INSTRUCTION_REM: _remainder,
+    INSTRUCTION_REMU: lambda a, b: a % b if b else a
+}
+
+I_OPERATIONS = {
+    INSTRUCTION_ADDI: R_OPERATIONS[INSTRUCTION_ADD],
+    INSTRUCTION_SLTI: R_OPERATIONS[INSTRUCTION_SLT],
+    INSTRUCTION_SLTIU: R_OPERATIONS[INSTRUCTION_SLTU],
+    INSTRUCTION_XORI: R_OPERATIONS[INSTRUCTION_XOR],
+    INSTRUCTION_ORI: R_OPERATIONS[INSTRUCTION_OR],
+    INSTRUCTION_ANDI: R_OPERATIONS[INSTRUCTION_AND],
+    INSTRUCTION_SLLI: R_OPERATIONS[INSTRUCTION_SLL],
+    INSTRUCTION_SRLI: R_OPERATIONS[INSTRUCTION_SRL],
+    INSTRUCTION_SRAI: R_OPERATIONS[INSTRUCTION_SRA],
+    INSTRUCTION_C_ADDI: R_OPERATIONS[INSTRUCTION_ADD],
+    INSTRUCTION_C_ANDI: R_OPERATIONS[INSTRUCTION_AND],
+    INSTRUCTION_C_SLLI: R_OPERATIONS[INSTRUCTION_SLL],
+    INSTRUCTION_C_SRLI: R_OPERATIONS[INSTRUCTION_SRL],
+    INSTRUCTION_C_SRAI: R_OPERATIONS[INSTRUCTION_SRA]
+}
+
+COMPRESSED_R_OPERATIONS = {
+    INSTRUCTION_C_ADD: R_OPERATIONS[INSTRUCTION_ADD],
+    INSTRUCTION_C_MV: R_OPERATIONS[INSTRUCTION_ADD],
+    INSTRUCTION_C_SUB: R_OPERATIONS[INSTRUCTION_SUB],
+    INSTRUCTION_C_XOR: R_OPERATIONS[INSTRUCTION_XOR],
+    INSTRUCTION_C_OR: R_OPERATIONS[INSTRUCTION_OR],
+    INSTRUCTION_C_AND: R_OPERATIONS[INSTRUCTION_AND]
+}
+
+BRANCH_CONDITIONS = {
+    INSTRUCTION_BEQ: operator.eq,
+    INSTRUCTION_BNE: operator.ne,
+    INSTRUCTION_BLT: lambda a, b: (a ^ SIGN_BIT) < (b ^ SIGN_BIT),
+    INSTRUCTION_BGE: lambda a, b: (a ^ SIGN_BIT) >= (b ^ SIGN_BIT),
+    INSTRUCTION_BLTU: operator.lt,
+    INSTRUCTION_BGEU: operator.ge,
+    INSTRUCTION_C_BEQZ: operator.eq,
+    INSTRUCTION_C_BNEZ: operator.ne
+}
+
+LOAD_FORMATS = {
+    INSTRUCTION_LB: struct.Struct('<b'),
+    INSTRUCTION_LH: struct.Struct('<h'),
+    INSTRUCTION_LW: _WORD,
+    INSTRUCTION_LBU: struct.Struct('<B'),
+    INSTRUCTION_LHU: _HALF,
+    INSTRUCTION_FLW: _WORD,
+    INSTRUCTION_C_LW: _WORD,
+    INSTRUCTION_C_FLW: _WORD,
+    INSTRUCTION_C_LWSP: _WORD,
+    INSTRUCTION_C_FLWSP: _WORD
+}
+
+STORE_FORMATS = {
+    INSTRUCTION_SB: (struct.Struct('<B'), 0xff),
+    INSTRUCTION_SH: (_HALF, 0xffff),
+    INSTRUCTION_SW: (_WORD, WORD_MASK),
+    INSTRUCTION_FSW: (_WORD, WORD_MASK),
+    INSTRUCTION_C_SW: (_WORD, WORD_MASK),
+    INSTRUCTION_C_FSW: (_WORD, WORD_MASK),
+    INSTRUCTION_C_SWSP: (_WORD, WORD_MASK),
+    INSTRUCTION_C_FSWSP: (_WORD, WORD_MASK)
+}
+
+COMPRESSED_X_REGISTER_LOADS_STORES = [
+    INSTRUCTION_C_LW, INSTRUCTION_C_SW, INSTRUCTION_C_LWSP, INSTRUCTION_C_SWSP
+]
+
+DOUBLE_PRECISION_INSTRUCTIONS = [
+    INSTRUCTION_C_FLD, INSTRUCTION_C_FSD, INSTRUCTION_C_FLDSP, INSTRUCTION_C_FSDSP
+]
+
+AMO_OPERATIONS = {
+    INSTRUCTION_A_AMOSWAP_W: lambda a, b: b,
+    INSTRUCTION_A_AMOADD_W: R_OPERATIONS[INSTRUCTION_ADD],
+    INSTRUCTION_A_AMOXOR_W: operator.xor,
+    INSTRUCTION_A_AMOAND_W: operator.and_,
+    INSTRUCTION_A_AMOOR_W: operator.or_,
+    INSTRUCTION_A_AMOMIN_W: lambda a, b: a if (a ^ SIGN_BIT) < (b ^ SIGN_BIT) else b,
+    INSTRUCTION_A_AMOMAX_W: lambda a, b: a if (a ^ SIGN_BIT) > (b ^ SIGN_BIT) else b,
+    INSTRUCTION_A_AMOMINU_W: min,
+    INSTRUCTION_A_AMOMAXU_W: max
+}
+
+
+def bits_to_float(bits: int) -> float:
+    return _SINGLE.unpack(_WORD.pack(bits))[0]
+
+
+def float_to_bits(value: float) -> int:
+    if value != value:
+        return CANONICAL_NAN
+    try:
+        return _WORD.unpack(_SINGLE.pack(value))[0]
+    except OverflowError:
+        return POSITIVE_INFINITY if value > 0 else NEGATIVE_INFINITY
+
+
+def _divide_floats(a: float, b: float) -> float:
+    if b == 0.0:
+        if a != a or a == 0.0:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _square_root(a: float, b: float) -> float:
+    return math.sqrt(a) if a >= 0.0 else math.nan
+
+
+def _float_minimum(a: float, b: float) -> float:
+    if a != a:
+        return b
+    if b != b:
+        return a
+    if a == b:
+        return a if math.copysign(1.0, a) < 0 else b
+    return min(a, b)
+
+
+def _float_maximum(a: float, b: float) -> float:
+    if a != a:
+        return b
+    if b != b:
+        return a
+    if a == b:
+        return b if math.copysign(1.0, a) < 0 else a
+    return max(a, b)
+
+
+def _on_floats(operation):
+    def operate(a: int, b: int) -> int:
+        return float_to_bits(operation(bits_to_float(a), bits_to_float(b)))
+
+    return operate
+
+
+def classify_float(bits: int) -> int:
+    negative = bits >> 31
+    exponent = (bits >> 23) & 0xff
+    fraction = bits & 0x7fffff
+    if exponent == 0xff:
+        if fraction == 0:
+            return 1 << 0 if negative else 1 << 7
+        return 1 << 9 if fraction & 0x400000 else 1 << 8
+    if exponent == 0:
+        if fraction == 0:
+            return 1 << 3 if negative else 1 << 4
+        return 1 << 2 if negative else 1 << 5
+    return 1 << 1 if negative else 1 << 6
+
+
+FLOATING_POINT_OPERATIONS = {
+    INSTRUCTION_FADD_S: _on_floats(operator.add),
+    INSTRUCTION_FSUB_S: _on_floats(operator.sub),
+    INSTRUCTION_FMUL_S: _on_floats(operator.mul),
+    INSTRUCTION_FDIV_S: _on_floats(_divide_floats),
+    INSTRUCTION_FSQRT_S: _on_floats(_square_root),
+    INSTRUCTION_FMIN_S: _on_floats(_float_minimum),
+    INSTRUCTION_FMAX_S: _on_floats(_float_maximum),
+    INSTRUCTION_FSGNJ_S: lambda a, b: (a & ~SIGN_BIT) | (b & SIGN_BIT),
+    INSTRUCTION_FSGNJN_S: lambda a, b: (a & ~SIGN_BIT) | (~b & SIGN_BIT),
+    INSTRUCTION_FSGNJX_S: lambda a, b: a ^ (b & SIGN_BIT)
+}
+
+FLOATING_POINT_TO_X_OPERATIONS = {
+    INSTRUCTION_FEQ_S: lambda a, b: int(bits_to_float(a) == bits_to_float(b)),
+    INSTRUCTION_FLT_S: lambda a, b: int(bits_to_float(a) < bits_to_float(b)),
+    INSTRUCTION_FLE_S: lambda a, b: int(bits_to_float(a) <= bits_to_float(b)),
+    INSTRUCTION_FCLASS_S: lambda a, b: classify_float(a),
+    INSTRUCTION_FMV_X_W: lambda a, b: a
+}
+
+X_TO_FLOATING_POINT_OPERATIONS = {
+    INSTRUCTION_FCVT_S_W: lambda value: float_to_bits(float(_signed(value))),
+    INSTRUCTION_FCVT_S_WU: lambda value: float_to_bits(float(value)),
+    INSTRUCTION_FMV_W_X: lambda value: value
+}
+
+def fused_multiply_add(a: float, b: float, c: float) -> float:
+    # The product of two singles is exact in a double, so only the sum is rounded. It is rounded to odd, using the
+    # error of the sum, so that the final rounding to single gives the correctly rounded result of a * b + c.
+    product = a * b
+    total = product + c
+    if not math.isfinite(total):
+        return total
+    addend = total - product
+    error = (product - (total - addend)) + (c - addend)
+    if error and not _DOUBLE_WORD.unpack(_DOUBLE.pack(total))[0] & 1:
+        total = math.nextafter(total, math.copysign(math.inf, error))
+    return total
+
+
+FUSED_OPERATIONS = {
+    INSTRUCTION_FMADD_S: fused_multiply_add,
+    INSTRUCTION_FMSUB_S: lambda a, b, c: fused_multiply_add(a, b, -c),
+    INSTRUCTION_FNMSUB_S: lambda a, b, c: fused_multiply_add(-a, b, c),
+    INSTRUCTION_FNMADD_S: lambda a, b, c: fused_multiply_add(-a, b, -c)
+}
+
+
+def _round_half_away_from_zero(value: float) -> int:
+    return math.floor(value + 0.5) if value >= 0 else math.ceil(value - 0.5)
+
+
+ROUNDING_FUNCTIONS = {
+    FLOATING_POINT_ROUNDING_MODES['rne']: round,
+    FLOATING_POINT_ROUNDING_MODES['rtz']: math.trunc,
+    FLOATING_POINT_ROUNDING_MODES['rdn']: math.floor,
+    FLOATING_POINT_ROUNDING_MODES['rup']: math.ceil,
+    FLOATING_POINT_ROUNDING_MODES['rmm']: _round_half_away_from_zero
+}
+
+DYNAMIC_ROUNDING_MODE = FLOATING_POINT_ROUNDING_MODES['dyn']
+
+
+def convert_to_integer(bits: int, rounding_mode: int, signed: bool) -> int:
+    low, high = (-SIGN_BIT, SIGN_BIT - 1) if signed else (0, WORD_MASK)
+    value = bits_to_float(bits)
+    if value != value:
+        return high & WORD_MASK
+    if math.isinf(value):
+        return (high if value > 0 else low) & WORD_MASK
+    return min(max(ROUNDING_FUNCTIONS[rounding_mode](value), low), high) & WORD_MASK
+
+
+def _x_register(code: int, shift: int) -> int:
+    return (code >> shift) & 0x1f
+
+
+def _destination(register: int) -> int:
+    return register if register != 0 else ZERO_REGISTER_SINK
+
+
+def _compressed_register(code: int, shift: int) -> int:
+    return ((code >> shift) & 0x7) + 8
+
+
+class SimulationStop(Exception):
+    pass
+
+
+class SimulationResult(NamedTuple):
+    stop_reason: str
+    instruction_count: int
+    pc: int
+    exit_code: int = None
+
+
+class Simulator:
+    def __init__(self, image=b'', memory_size=DEFAULT_MEMORY_SIZE):
+        memory_size = max(memory_size, (len(image) + 3) & ~3)
+        self.memory = bytearray(memory_size)
+        self.memory[:len(image)] = image
+        self.x_registers = array('I', [0] * (ZERO_REGISTER_SINK + 1))
+        self.x_registers[STACK_POINTER] = memory_size & ~0xf
+        self.f_registers = array('I', [0] * 32)
+        self.fcsr = 0
+        self.csrs = {}
+        self.pc = 0
+        self.instruction_count = 0
+        self.reservation = None
+        self._steps = iter(())
+        self._instruction_limit = 0
+        self._predecode_entry = (self._predecode_and_execute,)
+        self.decoded_instructions = [self._predecode_entry] * (memory_size // 2)
+
+        self.instruction_handlers = {
+            InstructionKind.R_INSTRUCTION: self._predecode_r_instruction,
+            InstructionKind.I_INSTRUCTION: self._predecode_i_instruction,
+            InstructionKind.I_SHIFT_INSTRUCTION: self._predecode_i_shift_instruction,
+            InstructionKind.I_LOAD_INSTRUCTION: self._predecode_i_load_instruction,
+            InstructionKind.U_INSTRUCTION: self._predecode_u_instruction,
+            InstructionKind.JAL_INSTRUCTION: self._predecode_jal_instruction,
+            InstructionKind.JALR_INSTRUCTION: self._predecode_jalr_instruction,
+            InstructionKind.B_INSTRUCTION: self._predecode_b_instruction,
+            InstructionKind.S_INSTRUCTION: self._predecode_s_instruction,
+            InstructionKind.FENCE_INSTRUCTION: self._predecode_fence_instruction,
+            InstructionKind.COMPRESSED_R_INSTRUCTION: self._predecode_compressed_r_instruction,
+            InstructionKind.COMPRESSED_I_INSTRUCTION: self._predecode_compressed_i_instruction,
+            InstructionKind.COMPRESSED_B_INSTRUCTION: self._predecode_compressed_b_instruction,
+            InstructionKind.COMPRESSED_L_LOAD_INSTRUCTION: self._predecode_compressed_l_load_instruction,
+            InstructionKind.COMPRESSED_L_STORE_INSTRUCTION: self._predecode_compressed_l_store_instruction,
+            InstructionKind.COMPRESSED_STORE_SP_INSTRUCTION: self._predecode_compressed_store_sp_instruction,
+            InstructionKind.COMPRESSED_J_INSTRUCTION: self._predecode_compressed_j_instruction,
+            InstructionKind.COMPRESSED_J_R_INSTRUCTION: self._predecode_compressed_j_r_instruction,
+            InstructionKind.FLOATING_POINT_R_INSTRUCTION: self._predecode_floating_point_r_instruction,
+            InstructionKind.FLOATING_POINT_R4_INSTRUCTION: self._predecode_floating_point_r4_instruction,
+            InstructionKind.ATOMIC_INSTRUCTION: self._predecode_atomic_instruction
+        }
+
+    @classmethod
+    def from_assembly_result(cls, result, memory_size=DEFAULT_MEMORY_SIZE):
+        return cls(result.image, memory_size)
+
+    def predecode(self, pc: int) -> tuple:
+        code = _HALF.unpack_from(self.memory, pc)[0]
+        size = 2
+        if not is_compressed(code):
+            code = _WORD.unpack_from(self.memory, pc)[0]
+            size = 4
+        opcode_id = find_opcode_id(code)
+        if opcode_id < 0:
+            return self._execute_illegal_instruction, size, code
+        decoding = DECODINGS[opcode_id]
+        if decoding.format_operands(decoding, code) is None:
+            return self._execute_illegal_instruction, size, code
+        entry = self.instruction_handlers[ENCODING_TEMPLATES[opcode_id].kind](decoding, code)
+        return entry if entry is not None else (self._execute_illegal_instruction, size, code)
+
+    def _predecode_and_execute(self, entry, pc: int) -> int:
+        entry = self.decoded_instructions[pc >> 1] = self.predecode(pc)
+        return entry[0](entry, pc)
+
+    def flush_decoded_instructions(self) -> None:
+        self.decoded_instructions[:] = [self._predecode_entry] * len(self.decoded_instructions)
+
+    def _predecode_r_instruction(self, decoding, code: int) -> tuple:
+        return (
+            self._execute_register, 4, R_OPERATIONS[decoding.opcode],
+            _destination(_x_register(code, 7)), _x_register(code, 15), _x_register(code, 20)
+        )
+
+    def _predecode_i_instruction(self, decoding, code: int) -> tuple:
+        opcode = decoding.opcode
+        if opcode == INSTRUCTION_ECALL:
+            return self._execute_environment_call, 4
+        if opcode == INSTRUCTION_EBREAK:
+            return self._execute_breakpoint, 4
+        if opcode in I_CSR_INSTRUCTIONS + I_CSRI_INSTRUCTIONS:
+            return (
+                self._execute_csr, 4, opcode, _destination(_x_register(code, 7)), code >> 20, _x_register(code, 15)
+            )
+        return (
+            self._execute_immediate, 4, I_OPERATIONS[opcode], _destination(_x_register(code, 7)),
+            _x_register(code, 15), decoding.decode_immediate(code) & WORD_MASK
+        )
+
+    def _predecode_i_shift_instruction(self, decoding, code: int) -> tuple:
+        return (
+            self._execute_immediate, 4, I_OPERATIONS[decoding.opcode], _destination(_x_register(code, 7)),
+            _x_register(code, 15), _x_register(code, 20)
+        )
+
+    def _predecode_i_load_instruction(self, decoding, code: int) -> tuple:
+        if decoding.opcode == INSTRUCTION_FLW:
+            handler, rd = self._execute_floating_point_load, _x_register(code, 7)
+        else:
+            handler, rd = self._execute_load, _destination(_x_register(code, 7))
+        return (
+            handler, 4, LOAD_FORMATS[decoding.opcode].unpack_from, rd, _x_register(code, 15),
+            decoding.decode_immediate(code)
+        )
+
+    def _predecode_u_instruction(self, decoding, code: int) -> tuple:
+        handler = self._execute_lui if decoding.opcode == INSTRUCTION_LUI else self._execute_auipc
+        return handler, 4, _destination(_x_register(code, 7)), code & 0xfffff000
+
+    def _predecode_jal_instruction(self, decoding, code: int) -> tuple:
+        return self._execute_jal, 4, _destination(_x_register(code, 7)), decoding.decode_immediate(code)
+
+    def _predecode_jalr_instruction(self, decoding, code: int) -> tuple:
+        return (
+            self._execute_jalr, 4, _destination(_x_register(code, 7)), _x_register(code, 15),
+            decoding.decode_immediate(code)
+        )
+
+    def _predecode_b_instruction(self, decoding, code: int) -> tuple:
+        return (
+            self._execute_branch, 4, BRANCH_CONDITIONS[decoding.opcode], _x_register(code, 15),
+            _x_register(code, 20), decoding.decode_immediate(code)
+        )
+
+    def _predecode_s_instruction(self, decoding, code: int) -> tuple:
+        store_format, value_mask = STORE_FORMATS[decoding.opcode]
+        handler = self._execute_floating_point_store if decoding.opcode == INSTRUCTION_FSW else self._execute_store
+        return (
+            handler, 4, store_format.pack_into, value_mask, _x_register(code, 15), _x_register(code, 20),
+            decoding.decode_immediate(code)
+        )
+
+    def _predecode_fence_instruction(self, decoding, code: int) -> tuple:
+        if decoding.opcode == INSTRUCTION_FENCE_I:
+            return self._execute_fence_i, 4
+        return self._execute_nop, 4
+
+    def _predecode_compressed_r_instruction(self, decoding, code: int) -> tuple:
+        operation = COMPRESSED_R_OPERATIONS[decoding.opcode]
+        if decoding.layout == 'CA':
+            rd = _compressed_register(code, 7)
+            return self._execute_register, 2, operation, rd, rd, _compressed_register(code, 2)
+        rd = _x_register(code, 7)
+        rs1 = 0 if decoding.opcode == INSTRUCTION_C_MV else rd
+        return self._execute_register, 2, operation, _destination(rd), rs1, _x_register(code, 2)
+
+    def _predecode_compressed_i_instruction(self, decoding, code: int):
+        opcode = decoding.opcode
+        rd = _x_register(code, 7)
+        if opcode == INSTRUCTION_C_EBREAK:
+            return self._execute_breakpoint, 2
+        if opcode in [INSTRUCTION_C_NOP, INSTRUCTION_C_SLLI64]:
+            return self._execute_nop, 2
+        if opcode in DOUBLE_PRECISION_INSTRUCTIONS:
+            return None
+        imm = decoding.decode_immediate(code)
+        if opcode == INSTRUCTION_C_LWSP:
+            return self._execute_load, 2, _WORD.unpack_from, _destination(rd), STACK_POINTER, imm
+        if opcode == INSTRUCTION_C_FLWSP:
+            return self._execute_floating_point_load, 2, _WORD.unpack_from, rd, STACK_POINTER, imm
+        if opcode == INSTRUCTION_C_LUI:
+            return self._execute_lui, 2, _destination(rd), (imm << 12) & WORD_MASK
+        if opcode == INSTRUCTION_C_LI:
+            return self._execute_immediate, 2, R_OPERATIONS[INSTRUCTION_ADD], _destination(rd), 0, imm & WORD_MASK
+        if opcode == INSTRUCTION_C_ADDI16SP:
+            return (
+                self._execute_immediate, 2, R_OPERATIONS[INSTRUCTION_ADD], STACK_POINTER, STACK_POINTER,
+                imm & WORD_MASK
+            )
+        if opcode == INSTRUCTION_C_ADDI4SPN:
+            return (
+                self._execute_immediate, 2, R_OPERATIONS[INSTRUCTION_ADD], _compressed_register(code, 2),
+                STACK_POINTER, imm
+            )
+        if decoding.layout == 'CB':
+            rd = _compressed_register(code, 7)
+            return self._execute_immediate, 2, I_OPERATIONS[opcode], rd, rd, imm & WORD_MASK
+        return self._execute_immediate, 2, I_OPERATIONS[opcode], _destination(rd), rd, imm & WORD_MASK
+
+    def _predecode_compressed_b_instruction(self, decoding, code: int) -> tuple:
+        return (
+            self._execute_branch, 2, BRANCH_CONDITIONS[decoding.opcode], _compressed_register(code, 7), 0,
+            decoding.decode_immediate(code)
+        )
+
+    def _predecode_compressed_l_load_instruction(self, decoding, code: int):
+        if decoding.opcode in DOUBLE_PRECISION_INSTRUCTIONS:
+            return None
+        if decoding.opcode in COMPRESSED_X_REGISTER_LOADS_STORES:
+            handler = self._execute_load
+        else:
+            handler = self._execute_floating_point_load
+        return (
+            handler, 2, _WORD.unpack_from, _compressed_register(code, 2), _compressed_register(code, 7),
+            decoding.decode_immediate(code)
+        )
+
+    def _predecode_compressed_l_store_instruction(self, decoding, code: int):
+        if decoding.opcode in DOUBLE_PRECISION_INSTRUCTIONS:
+            return None
+        if decoding.opcode in COMPRESSED_X_REGISTER_LOADS_STORES:
+            handler = self._execute_store
+        else:
+            handler = self._execute_floating_point_store
+        return (
+            handler, 2, _WORD.pack_into, WORD_MASK, _compressed_register(code, 7), _compressed_register(code, 2),
+            decoding.decode_immediate(code)
+        )
+
+    def _predecode_compressed_store_sp_instruction(self, decoding, code: int):
+        if decoding.opcode in DOUBLE_PRECISION_INSTRUCTIONS:
+            return None
+        if decoding.opcode in COMPRESSED_X_REGISTER_LOADS_STORES:
+            handler = self._execute_store
+        else:
+            handler = self._execute_floating_point_store
+        return (
+            handler, 2, _WORD.pack_into, WORD_MASK, STACK_POINTER, _x_register(code, 2),
+            decoding.decode_immediate(code)
+        )
+
+    def _predecode_compressed_j_instruction(self, decoding, code: int) -> tuple:
+        rd = RETURN_ADDRESS if decoding.opcode == INSTRUCTION_C_JAL else ZERO_REGISTER_SINK
+        return self._execute_jal, 2, rd, decoding.decode_immediate(code)
+
+    def _predecode_compressed_j_r_instruction(self, decoding, code: int) -> tuple:
+        rd = RETURN_ADDRESS if decoding.opcode == INSTRUCTION_C_JALR else ZERO_REGISTER_SINK
+        return self._execute_jalr, 2, rd, _x_register(code, 7), 0
+
+    def _predecode_floating_point_r_instruction(self, decoding, code: int) -> tuple:
+        opcode = decoding.opcode
+        rd, rs1, rs2 = _x_register(code, 7), _x_register(code, 15), _x_register(code, 20)
+        if opcode in FLOATING_POINT_OPERATIONS:
+            return self._execute_floating_point, 4, FLOATING_POINT_OPERATIONS[opcode], rd, rs1, rs2
+        if opcode in FLOATING_POINT_TO_X_OPERATIONS:
+            return (
+                self._execute_floating_point_to_x, 4, FLOATING_POINT_TO_X_OPERATIONS[opcode], _destination(rd), rs1,
+                rs2
+            )
+        if opcode in X_TO_FLOATING_POINT_OPERATIONS:
+            return self._execute_x_to_floating_point, 4, X_TO_FLOATING_POINT_OPERATIONS[opcode], rd, rs1
+        return (
+            self._execute_convert_to_integer, 4, opcode == INSTRUCTION_FCVT_W_S, _destination(rd), rs1,
+            (code >> 12) & 0x7
+        )
+
+    def _predecode_floating_point_r4_instruction(self, decoding, code: int) -> tuple:
+        return (
+            self._execute_fused, 4, FUSED_OPERATIONS[decoding.opcode], _x_register(code, 7),
+            _x_register(code, 15), _x_register(code, 20), code >> 27
+        )
+
+    def _predecode_atomic_instruction(self, decoding, code: int) -> tuple:
+        opcode = decoding.opcode
+        rd, rs1, rs2 = _destination(_x_register(code, 7)), _x_register(code, 15), _x_register(code, 20)
+        if opcode == INSTRUCTION_A_LR_W:
+            return self._execute_load_reserved, 4, rd, rs1
+        if opcode == INSTRUCTION_A_SCW:
+            return self._execute_store_conditional, 4, rd, rs1, rs2
+        return self._execute_atomic_memory_operation, 4, AMO_OPERATIONS[opcode], rd, rs1, rs2
+
+    def _execute_register(self, entry, pc: int) -> int:
+        _, size, operation, rd, rs1, rs2 = entry
+        x = self.x_registers
+        x[rd] = operation(x[rs1], x[rs2])
+        return pc + size
+
+    def _execute_immediate(self, entry, pc: int) -> int:
+        _, size, operation, rd, rs1, imm = entry
+        x = self.x_registers
+        x[rd] = operation(x[rs1], imm)
+        return pc + size
+
+    def _execute_load(self, entry, pc: int) -> int:
+        _, size, unpack_from, rd, rs1, imm = entry
+        x = self.x_registers
+        x[rd] = unpack_from(self.memory, (x[rs1] + imm) & WORD_MASK)[0] & WORD_MASK
+        return pc + size
+
+    def _execute_floating_point_load(self, entry, pc: int) -> int:
+        _, size, unpack_from, rd, rs1, imm = entry
+        self.f_registers[rd] = unpack_from(self.memory, (self.x_registers[rs1] + imm) & WORD_MASK)[0]
+        return pc + size
+
+    def _execute_store(self, entry, pc: int) -> int:
+        _, size, pack_into, value_mask, rs1, rs2, imm = entry
+        x = self.x_registers
+        pack_into(self.memory, (x[rs1] + imm) & WORD_MASK, x[rs2] & value_mask)
+        return pc + size
+
+    def _execute_floating_point_store(self, entry, pc: int) -> int:
+        _, size, pack_into, value_mask, rs1, rs2, imm = entry
+        pack_into(self.memory, (self.x_registers[rs1] + imm) & WORD_MASK, self.f_registers[rs2])
+        return pc + size
+
+    def _execute_lui(self, entry, pc: int) -> int:
+        self.x_registers[entry[2]] = entry[3]
+        return pc + entry[1]
+
+    def _execute_auipc(self, entry, pc: int) -> int:
+        self.x_registers[entry[2]] = (pc + entry[3]) & WORD_MASK
+        return pc + entry[1]
+
+    def _execute_jal(self, entry, pc: int) -> int:
+        _, size, rd, offset = entry
+        self.x_registers[rd] = pc + size
+        return (pc + offset) & WORD_MASK
+
+    def _execute_jalr(self, entry, pc: int) -> int:
+        _, size, rd, rs1, offset = entry
+        x = self.x_registers
+        target = (x[rs1] + offset) & (WORD_MASK - 1)
+        x[rd] = pc + size
+        return target
+
+    def _execute_branch(self, entry, pc: int) -> int:
+        _, size, condition, rs1, rs2, offset = entry
+        x = self.x_registers
+        if condition(x[rs1], x[rs2]):
+            return (pc + offset) & WORD_MASK
+        return pc + size
+
+    def _execute_nop(self, entry, pc: int) -> int:
+        return pc + entry[1]
+
+    def _execute_fence_i(self, entry, pc: int) -> int:
+        self.flush_decoded_instructions()
+        return pc + entry[1]
+
+    def _execute_environment_call(self, entry, pc: int) -> int:
+        reason = STOP_EXIT if self.x_registers[ARGUMENT_REGISTER_A7] == EXIT_SYSTEM_CALL else STOP_ECALL
+        raise SimulationStop(reason, pc + entry[1])
+
+    def _execute_breakpoint(self, entry, pc: int) -> int:
+        raise SimulationStop(STOP_EBREAK, pc + entry[1])
+
+    def _execute_illegal_instruction(self, entry, pc: int) -> int:
+        width = 2 * entry[1]
+        error_message = 'Error: illegal instruction 0x{:0{}x} at pc 0x{:08x}'.format(entry[2], width, pc)
+        raise Exception(error_message)
+
+    def _execute_csr(self, entry, pc: int) -> int:
+        _, size, opcode, rd, csr, source = entry
+        value = source if opcode in I_CSRI_INSTRUCTIONS else self.x_registers[source]
+        old_value = self.read_csr(csr)
+        if opcode in [INSTRUCTION_CSRRW, INSTRUCTION_CSRRWI]:
+            self.write_csr(csr, value)
+        elif source != 0:
+            self.write_csr(csr, old_value | value if opcode in [INSTRUCTION_CSRRS, INSTRUCTION_CSRRSI] else
+                           old_value & ~value)
+        self.x_registers[rd] = old_value
+        return pc + size
+
+    def _execute_floating_point(self, entry, pc: int) -> int:
+        _, size, operation, rd, rs1, rs2 = entry
+        f = self.f_registers
+        f[rd] = operation(f[rs1], f[rs2])
+        return pc + size
+
+    def _execute_floating_point_to_x(self, entry, pc: int) -> int:
+        _, size, operation, rd, rs1, rs2 = entry
+        f = self.f_registers
+        self.x_registers[rd] = operation(f[rs1], f[rs2])
+        return pc + size
+
+    def _execute_x_to_floating_point(self, entry, pc: int) -> int:
+        _, size, operation, rd, rs1 = entry
+        self.f_registers[rd] = operation(self.x_registers[rs1])
+        return pc + size
+
+    def _execute_convert_to_integer(self, entry, pc: int) -> int:
+        _, size, signed, rd, rs1, rounding_mode = entry
+        if rounding_mode == DYNAMIC_ROUNDING_MODE:
+            rounding_mode = self.rounding_mode
+        self.x_registers[rd] = convert_to_integer(self.f_registers[rs1], rounding_mode, signed)
+        return pc + size
+
+    def _execute_fused(self, entry, pc: int) -> int:
+        _, size, operation, rd, rs1, rs2, rs3 = entry
+        f = self.f_registers
+        f[rd] = float_to_bits(operation(bits_to_float(f[rs1]), bits_to_float(f[rs2]), bits_to_float(f[rs3])))
+        return pc + size
+
+    def _execute_load_reserved(self, entry, pc: int) -> int:
+        _, size, rd, rs1 = entry
+        x = self.x_registers
+        self.reservation = x[rs1]
+        x[rd] = _WORD.unpack_from(self.memory, x[rs1])[0]
+        return pc + size
+
+    def _execute_store_conditional(self, entry, pc: int) -> int:
+        _, size, rd, rs1, rs2 = entry
+        x = self.x_registers
+        success = self.reservation == x[rs1]
+        if success:
+            _WORD.pack_into(self.memory, x[rs1], x[rs2])
+        self.reservation = None
+        x[rd] = 0 if success else 1
+        return pc + size
+
+    def _execute_atomic_memory_operation(self, entry, pc: int) -> int:
+        _, size, operation, rd, rs1, rs2 = entry
+        x = self.x_registers
+        address = x[rs1]
+        old_value = _WORD.unpack_from(self.memory, address)[0]
+        _WORD.pack_into(self.memory, address, operation(old_value, x[rs2]))
+        x[rd] = old_value
+        return pc + size
+
+    @property
+    def rounding_mode(self) -> int:
+        return (self.fcsr >> 5) & 0x7
+
+    def _retired_instruction_count(self) -> int:
+        return self.instruction_count + self._instruction_limit - operator.length_hint(self._steps) - 1
+
+    def read_csr(self, csr: int) -> int:
+        if csr == FFLAGS_CSR:
+            return self.fcsr & 0x1f
+        if csr == FRM_CSR:
+            return self.rounding_mode
+        if csr == FCSR_CSR:
+            return self.fcsr
+        if csr in COUNTER_CSRS:
+            return self._retired_instruction_count() & WORD_MASK
+        if csr in COUNTER_HIGH_CSRS:
+            return (self._retired_instruction_count() >> 32) & WORD_MASK
+        return self.csrs.get(csr, 0)
+
+    def write_csr(self, csr: int, value: int) -> None:
+        if csr >> 10 == 0b11:
+            error_message = 'Error: write to read-only CSR 0x{:03x}'.format(csr)
+            raise Exception(error_message)
+        if csr == FFLAGS_CSR:
+            self.fcsr = (self.fcsr & ~0x1f) | (value & 0x1f)
+        elif csr == FRM_CSR:
+            self.fcsr = (self.fcsr & 0x1f) | ((value & 0x7) << 5)
+        elif csr == FCSR_CSR:
+            self.fcsr = value & 0xff
+        else:
+            self.csrs[csr] = value
+
+    def run(self, max_instructions=DEFAULT_MAX_INSTRUCTIONS) -> SimulationResult:
+        decoded_instructions = self.decoded_instructions
+        pc = self.pc
+        steps = self._steps = iter(range(max_instructions))
+        self._instruction_limit = max_instructions
+        stop_reason = STOP_INSTRUCTION_LIMIT
+        try:
+            for _ in steps:
+                entry = decoded_instructions[pc >> 1]
+                pc = entry[0](entry, pc)
+        except SimulationStop as stop:
+            stop_reason, pc = stop.args
+        except (IndexError, struct.error):
+            self.instruction_count = self._retired_instruction_count()
+            self.pc = pc
+            error_message = 'Error: memory access out of range at pc 0x{:08x}'.format(pc)
+            raise Exception(error_message)
+        except Exception:
+            self.instruction_count = self._retired_instruction_count()
+            self.pc = pc
+            raise
+        self.instruction_count = self._retired_instruction_count() + 1
+        self.pc = pc
+        exit_code = _signed(self.x_registers[ARGUMENT_REGISTER_A0]) if stop_reason == STOP_EXIT else None
+        return SimulationResult(stop_reason, self.instruction_count, pc, exit_code)
+
+
+def simulate(image, max_instructions=DEFAULT_MAX_INSTRUCTIONS, memory_size=DEFAULT_MEMORY_SIZE) -> Simulator:
+    simulator = Simulator(image, memory_size)
+    simulator.run(max_instructions)
+    return simulator
+
+
+def format_registers(simulator) -> str:
+    lines = []
+    for index in range(1, 32):
+        value = simulator.x_registers[index]
+        if value:
+            lines.append(f'x{index:<3} 0x{value:08x} {_signed(value)}')
+    for index in range(32):
+        bits = simulator.f_registers[index]
+        if bits:
+            lines.append(f'f{index:<3} 0x{bits:08x} {bits_to_float(bits)!r}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def format_simulation_result(result) -> str:
+    text = f'stopped by {result.stop_reason} at pc 0x{result.pc:08x} after {result.instruction_count} instructions'
+    if result.exit_code is not None:
+        text += f', exit code {result.exit_code}'
+    return text + '\n'
@@ -1,4 +1,5 @@
-import ply.lex as lex
+import os
+import threading
 
 
 tokens = (
@@ -74,8 +75,26 @@ def t_error(token):
     raise Exception(error_message)
 
 
-lexer = lex.lex()
+_lexer = None
+_lexer_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def build_lexer():
+    import ply.lex as lex
+    return lex.lex(optimize=1, lextab='lextab', outputdir=os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_lexer():
+    global _lexer
+    lexer = getattr(_thread_state, 'lexer', None)
+    if lexer is None:
+        with _lexer_lock:
+            if _lexer is None:
+                _lexer = build_lexer()
+        lexer = _thread_state.lexer = _lexer.clone()
+    return lexer
 
 
 def reset_lineno():
-    lexer.lineno = 1
+    get_lexer().lineno = 1
@@ -0,0 +1,68 @@
+import argparse
+import sys
+import time
+
+from assembler.client import DEFAULT_SOCKET_PATH, AssemblerClient
+from assembler.regression import check_regression_file, format_regression_report, get_regression_filenames
+from main import OUTPUT_FORMATS, get_output_prefix, write_outputs
+
+
+def build_argument_parser():
+    argument_parser = argparse.ArgumentParser(
+        description="Assembles files on a running assembler server (see main.py --serve)."
+    )
+    argument_parser.add_argument(
+        "-i", "--input", nargs='+', help="Input assembly file names, or - to read the assembly from stdin."
+    )
+    argument_parser.add_argument(
+        "-r", "--regression", action='store_true',
+        help="Check the regression tests against their golden files; exits with status 1 if any of them fails."
+    )
+    argument_parser.add_argument(
+        "-f", "--formats", nargs='+', choices=OUTPUT_FORMATS, default=['text'],
+        help="Output formats to write into the output directory."
+    )
+    argument_parser.add_argument(
+        "--socket", default=DEFAULT_SOCKET_PATH, help="Unix domain socket the assembler server listens on."
+    )
+    return argument_parser
+
+
+def main():
+    exit_code = 0
+    try:
+        args = build_argument_parser().parse_args()
+        client = AssemblerClient(args.socket)
+        try:
+            if args.regression:
+                start = time.perf_counter()
+                results = [
+                    check_regression_file(assembly_filename, client.assemble_source)
+                    for assembly_filename in get_regression_filenames()
+                ]
+                print(format_regression_report(results, time.perf_counter() - start), end='')
+                if not results or not all(result.passed for result in results):
+                    exit_code = 1
+
+            input_filenames = args.input if args.input else ['../examples/tryouts.s']
+
+            if input_filenames == ['-']:
+                write_outputs(client.assemble_source(sys.stdin.read()).machine_code, args.formats)
+            elif len(input_filenames) == 1:
+                write_outputs(client.assemble_file(input_filenames[0]).machine_code, args.formats)
+            else:
+                for input_filename in input_filenames:
+                    write_outputs(
+                        client.assemble_file(input_filename).machine_code, args.formats,
+                        get_output_prefix(input_filename)
+                    )
+        finally:
+            client.close()
+    except Exception as e:
+        print(str(e))
+        exit_code = 1
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
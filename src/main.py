@@ -1,75 +1,284 @@
 import argparse
-import glob
+import os
+import sys
+import time
 
 from assembler.assemblerisc import AssembleRisc
+from assembler.batch import assemble_many, assemble_parallel, read_image, read_source
+from assembler.cache import AssemblyCache
+from assembler.incremental import IncrementalAssembler
+from assembler.client import DEFAULT_SOCKET_PATH
+from assembler.profiling import AssemblyProfiler
+from assembler.regression import format_regression_report, run_regression_suite
+from assembler.output_formats import *
 
 
-def run_regression() -> None:
-    assembler = AssembleRisc()
-    assembly_filenames = glob.glob("../regression/*.s")
-    for assembly_filename in assembly_filenames:
-        hex_code = _convert_to_hex(assembler.assemble(assembly_filename))
-        golden_filename = assembly_filename.replace(".s", ".txt")
-        with open(golden_filename, 'r') as golden_file:
-            data = golden_file.read()
-            if data != hex_code:
-                print(f'{assembly_filename} failed!')
+OUTPUT_FORMATS = ['text', 'bin', 'ihex', 'readmemh', 'readmemh8']
 
+WATCH_INTERVAL = 0.5
 
-def get_args():
+
+def run_regression(jobs=None, cache=None) -> bool:
+    start = time.perf_counter()
+    results = run_regression_suite(jobs=jobs, cache=cache)
+    print(format_regression_report(results, time.perf_counter() - start), end='')
+    return bool(results) and all(result.passed for result in results)
+
+
+def build_argument_parser():
     argument_parser = argparse.ArgumentParser()
-    argument_parser.add_argument("-i", "--input", help="Input assembly file name.")
-    argument_parser.add_argument("-r", "--regression", action='store_true')
+    argument_parser.add_argument(
+        "-i", "--input", nargs='+', help="Input assembly file names, or - to read the assembly from stdin."
+    )
+    argument_parser.add_argument(
+        "-r", "--regression", action='store_true',
+        help="Check the regression tests against their golden files; exits with status 1 if any of them fails."
+    )
+    argument_parser.add_argument(
+        "-j", "--jobs", type=int,
+        help="Number of worker processes used to assemble several files (default 1, or one per CPU for -r)."
+    )
+    argument_parser.add_argument(
+        "--no-cache", action='store_true', help="Always re-assemble instead of using the on-disk assembly cache."
+    )
+    argument_parser.add_argument(
+        "-w", "--watch", action='store_true',
+        help="Keep running and re-assemble the input files whenever they change."
+    )
+    argument_parser.add_argument(
+        "-f", "--formats", nargs='+', choices=OUTPUT_FORMATS, default=['text'],
+        help="Output formats to write into the output directory."
+    )
+    argument_parser.add_argument(
+        "-d", "--disassemble", action='store_true',
+        help="Treat the inputs as raw little-endian images and write their disassembly into the output directory."
+    )
+    argument_parser.add_argument(
+        "--base-address", type=lambda value: int(value, 0), default=0,
+        help="Address of the first byte of the disassembled images."
+    )
+    argument_parser.add_argument(
+        "-s", "--simulate", action='store_true',
+        help="Run the assembled images on the built-in instruction-set simulator and print the final registers; "
+             "exits with the program's exit code."
+    )
+    argument_parser.add_argument(
+        "--max-instructions", type=int,
+        help="Number of instructions after which the simulation is stopped (default 10000000)."
+    )
+    argument_parser.add_argument(
+        "--compress", action='store_true',
+        help="Rewrite eligible instructions into their 16-bit RVC forms and print the code size saved."
+    )
+    argument_parser.add_argument(
+        "--far-jumps", action='store_true',
+        help="Let branches and jumps reach out of range labels through auipc and jalr, using t1 as scratch register."
+    )
+    argument_parser.add_argument(
+        "--serve", action='store_true', help="Run as an assembler server listening on a Unix domain socket."
+    )
+    argument_parser.add_argument(
+        "--socket", default=DEFAULT_SOCKET_PATH, help="Unix domain socket used by the assembler server and client."
+    )
+    argument_parser.add_argument(
+        "--profile", action='store_true',
+        help="Assemble in a single process and print the time spent in each phase and instruction type."
+    )
+    argument_parser.add_argument(
+        "--profile-trace", help="Also write the profiled phases as a Chrome trace-event JSON file."
+    )
+    return argument_parser
+
 
-    args = argument_parser.parse_args()
+def get_args():
+    args = build_argument_parser().parse_args()
     return args
 
 
-def write_output_file(filename, content):
-    with open(filename, 'w') as file:
-        file.write(content)
+def render_outputs(machine_code, formats, prefix='out') -> dict:
+    output_prefix = os.path.join('../output', prefix)
+    outputs = {}
+    if 'text' in formats:
+        outputs[output_prefix + '_binary.txt'] = to_binary_text(machine_code)
+        outputs[output_prefix + '_hexadeciaml.txt'] = to_hex_text(machine_code)
+        outputs[output_prefix + '_byte_dump_hexadeciaml.txt'] = to_hex_byte_dump(machine_code)
 
+    image = build_image(machine_code)
+    if 'bin' in formats:
+        outputs[output_prefix + '.bin'] = image
+    if 'ihex' in formats:
+        outputs[output_prefix + '.hex'] = to_intel_hex(image)
+    if 'readmemh' in formats:
+        outputs[output_prefix + '_readmemh.mem'] = to_readmemh(image, word_size=4)
+    if 'readmemh8' in formats:
+        outputs[output_prefix + '_readmemh_bytes.mem'] = to_readmemh(image, word_size=1)
+    return outputs
 
-def _convert_to_hex(binary_code) -> str:
-    hex_result = ""
-    codes = binary_code.splitlines()
-    for code in codes:
-        is_compressed = len(code) == 16
-        if is_compressed:
-            hex_result += '{0:04x}'.format(int(code, 2)) + "\n"
+
+def write_outputs(machine_code, formats, prefix='out', only_changed=False) -> None:
+    for output_filename, content in render_outputs(machine_code, formats, prefix).items():
+        if only_changed:
+            write_file_if_changed(output_filename, content)
+        elif isinstance(content, str):
+            write_text_file(output_filename, content)
         else:
-            hex_result += '{0:08x}'.format(int(code, 2)) + "\n"
-    return hex_result
+            write_binary_file(output_filename, content)
+
+
+def get_output_prefix(input_filename) -> str:
+    return os.path.splitext(os.path.basename(input_filename))[0]
+
+
+def _changed_line_range(old_lines, new_lines) -> (int, int):
+    prefix = 0
+    common_length = min(len(old_lines), len(new_lines))
+    while prefix < common_length and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < common_length - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
 
+def watch(input_filenames, formats, far_jumps=False) -> None:
+    assemblers = {
+        input_filename: IncrementalAssembler(AssembleRisc(far_jumps=far_jumps)) for input_filename in input_filenames
+    }
+    file_stamps = {}
+    while True:
+        for input_filename, assembler in assemblers.items():
+            try:
+                file_stat = os.stat(input_filename)
+            except OSError:
+                continue
+            file_stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+            if file_stamps.get(input_filename) == file_stamp:
+                continue
+            file_stamps[input_filename] = file_stamp
 
-def _dump_bytes(hex_code) -> str:
-    hex_result = ""
-    codes = hex_code.splitlines()
-    for code in codes:
-        hex_result += code[::-1]
-    return hex_result
+            try:
+                with open(input_filename) as file:
+                    lines = file.read().splitlines()
+                prefix, suffix = _changed_line_range(assembler.lines, lines)
+                assembler.update(prefix + 1, len(assembler.lines) - suffix, lines[prefix:len(lines) - suffix])
+                output_prefix = 'out' if len(input_filenames) == 1 else get_output_prefix(input_filename)
+                write_outputs(assembler.result().machine_code, formats, output_prefix, only_changed=True)
+            except Exception as e:
+                print(str(e))
+        time.sleep(WATCH_INTERVAL)
+
+
+def disassemble(input_filenames, base_address=0) -> None:
+    from assembler.disassembler import to_disassembly_listing
+    for input_filename in input_filenames:
+        image = sys.stdin.buffer.read() if input_filename == '-' else read_image(input_filename)
+        output_prefix = 'out' if len(input_filenames) == 1 else get_output_prefix(input_filename)
+        write_text_file(
+            os.path.join('../output', output_prefix + '_disassembly.s'), to_disassembly_listing(image, base_address)
+        )
+
+
+def assemble_serially(input_filenames, formats, compress=False, far_jumps=False) -> None:
+    from assembler.compression import format_compression_report
+    assembler = AssembleRisc(compress=compress, far_jumps=far_jumps)
+    for input_filename in input_filenames:
+        source = sys.stdin.read() if input_filename == '-' else read_source(input_filename)
+        result = assembler.assemble_source(source)
+        output_prefix = 'out' if len(input_filenames) == 1 else get_output_prefix(input_filename)
+        write_outputs(result.machine_code, formats, output_prefix)
+        if result.compression_report is not None:
+            print(input_filename + ': ' + format_compression_report(result.compression_report), end='')
+
+
+def simulate(input_filenames, max_instructions=None, compress=False, far_jumps=False) -> int:
+    from assembler.simulator import (
+        DEFAULT_MAX_INSTRUCTIONS, STOP_INSTRUCTION_LIMIT, Simulator, format_registers, format_simulation_result
+    )
+    exit_code = 0
+    for input_filename in input_filenames:
+        if len(input_filenames) > 1:
+            print(input_filename + ':')
+        try:
+            source = sys.stdin.read() if input_filename == '-' else read_source(input_filename)
+            assembler = AssembleRisc(compress=compress, far_jumps=far_jumps)
+            simulator = Simulator.from_assembly_result(assembler.assemble_source(source))
+            result = simulator.run(max_instructions or DEFAULT_MAX_INSTRUCTIONS)
+        except Exception as e:
+            print(str(e))
+            exit_code = exit_code or 1
+            continue
+        print(format_registers(simulator) + format_simulation_result(result), end='')
+        if result.exit_code:
+            exit_code = exit_code or result.exit_code & 0xff or 1
+        elif result.stop_reason == STOP_INSTRUCTION_LIMIT:
+            exit_code = exit_code or 1
+    return exit_code
+
+
+def profile(input_filenames, formats, profiler, compress=False, far_jumps=False) -> None:
+    assembler = AssembleRisc(profiler=profiler, compress=compress, far_jumps=far_jumps)
+    for input_filename in input_filenames:
+        if input_filename == '-':
+            machine_code = assembler.assemble_source(sys.stdin.read()).machine_code
+        else:
+            machine_code = assembler.assemble(input_filename)
+        output_prefix = 'out' if len(input_filenames) == 1 else get_output_prefix(input_filename)
+        with profiler.phase('write_outputs'):
+            write_outputs(machine_code, formats, output_prefix)
 
 
 def main():
+    exit_code = 0
     try:
         args = get_args()
+        cache = None if args.no_cache else AssemblyCache()
 
-        if args.regression:
-            run_regression()
+        if args.regression and not run_regression(args.jobs, cache):
+            exit_code = 1
+        jobs = args.jobs or 1
 
-        input_filename = args.input if args.input else '../examples/tryouts.s'
+        input_filenames = args.input if args.input else ['../examples/tryouts.s']
 
-        assembler = AssembleRisc()
-        binary_code = assembler.assemble(input_filename)
-
-        hex_code = _convert_to_hex(binary_code)
-        hex_byte_dump = _dump_bytes(hex_code)
-
-        write_output_file('../output/out_binary.txt', binary_code)
-        write_output_file('../output/out_hexadeciaml.txt', hex_code)
-        write_output_file('../output/out_byte_dump_hexadeciaml.txt', hex_byte_dump)
+        if args.serve:
+            from assembler.server import run_server
+            run_server(args.socket, jobs)
+        elif args.disassemble:
+            if not args.input:
+                error_message = 'Error: --disassemble needs input images'
+                raise Exception(error_message)
+            disassemble(input_filenames, args.base_address)
+        elif args.simulate:
+            exit_code = simulate(input_filenames, args.max_instructions, args.compress, args.far_jumps)
+        elif args.watch:
+            if '-' in input_filenames:
+                error_message = 'Error: --watch needs input files, not stdin'
+                raise Exception(error_message)
+            if args.compress:
+                error_message = 'Error: --compress cannot be used with --watch'
+                raise Exception(error_message)
+            watch(input_filenames, args.formats, args.far_jumps)
+        elif args.profile or args.profile_trace:
+            profiler = AssemblyProfiler(trace=args.profile_trace is not None)
+            profile(input_filenames, args.formats, profiler, args.compress, args.far_jumps)
+            print(profiler.summary(), end='')
+            if args.profile_trace:
+                profiler.write_chrome_trace(args.profile_trace)
+        elif args.compress or args.far_jumps:
+            assemble_serially(input_filenames, args.formats, args.compress, args.far_jumps)
+        elif input_filenames == ['-']:
+            write_outputs(AssembleRisc().assemble_source(sys.stdin.read()).machine_code, args.formats)
+        elif len(input_filenames) == 1:
+            write_outputs(assemble_parallel(input_filenames[0], jobs, cache=cache), args.formats)
+        else:
+            machine_codes = assemble_many(input_filenames, jobs, cache)
+            for input_filename, machine_code in zip(input_filenames, machine_codes):
+                write_outputs(machine_code, args.formats, get_output_prefix(input_filename))
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
         print(str(e))
+        exit_code = 1
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
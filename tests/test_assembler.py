@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+
+
+class CachedErrorTest(unittest.TestCase):
+    def assert_error(self, assembler, source: str, message: str) -> None:
+        with self.assertRaises(Exception) as raised:
+            assembler.assemble_source(source)
+        self.assertEqual(str(raised.exception), message)
+
+    def test_parse_errors_report_each_line(self):
+        assembler = AssembleRisc()
+        self.assert_error(
+            assembler, 'addi x5, x0, 1\naddi x5, x0,\n', 'Error: invalid or incomplete token "\n" found at line 2'
+        )
+        self.assert_error(assembler, 'addi x5, x0,\n', 'Error: invalid or incomplete token "\n" found at line 1')
+        self.assert_error(assembler, '\n\n\nc.lw x5, 4(x9)\n', 'Error: illegal operands at line 4')
+        self.assert_error(assembler, 'c.lw x5, 4(x9)\n', 'Error: illegal operands at line 1')
+
+    def test_encode_errors_report_each_line(self):
+        assembler = AssembleRisc()
+        self.assert_error(assembler, 'nop\ncsrrwi x5, fcsr, 40\n', 'Error: illegal immediate operand at line 2')
+        self.assert_error(assembler, 'csrrwi x5, fcsr, 40\n', 'Error: illegal immediate operand at line 1')
+
+    def test_failing_line_is_parsed_once(self):
+        assembler = AssembleRisc()
+        parsed_lines = []
+        parse_line_uncached = assembler._parse_line_uncached
+
+        def count_parses(line, lineno):
+            parsed_lines.append(line)
+            return parse_line_uncached(line, lineno)
+
+        assembler._parse_line_uncached = count_parses
+        self.assert_error(assembler, 'nop\naddi x5, x0,\n', 'Error: invalid or incomplete token "\n" found at line 2')
+        self.assertEqual(parsed_lines.count('addi x5, x0,\n'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
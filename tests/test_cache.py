@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.cache import AssemblyCache
+
+
+class AssemblyCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def make_cache(self, **limits) -> AssemblyCache:
+        return AssemblyCache(self.directory.name, **limits)
+
+    def test_round_trip(self):
+        cache = self.make_cache()
+        source = 'start:\naddi x5, x0, 1\nbeq x5, x0, start\n'
+        result = AssembleRisc().assemble_source(source)
+        self.assertIsNone(cache.get(source))
+        cache.put(source, result)
+        self.assertEqual(cache.get(source), result)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_malformed_entries_are_misses(self):
+        cache = self.make_cache()
+        source = 'addi x5, x0, 1\n'
+        for entry_text in ['', '[1, 2]', '{"labels_table": {}}', '{"machine_code": 5, "labels_table": {}}',
+                           '{"machine_code": ["x"], "labels_table": {}}', '{"machine_code": []}']:
+            with open(cache._entry_filename(cache.get_key(source)), 'w') as entry_file:
+                entry_file.write(entry_text)
+            self.assertIsNone(cache.get(source), entry_text)
+        self.assertEqual((cache.hits, cache.misses), (0, 6))
+
+    def test_eviction_keeps_the_limits_without_scanning_on_every_put(self):
+        cache = self.make_cache(max_entries=20)
+        scan_count = 0
+        scan_entries = cache._scan_entries
+
+        def count_scans():
+            nonlocal scan_count
+            scan_count += 1
+            return scan_entries()
+
+        cache._scan_entries = count_scans
+        sources = ['addi x5, x0, {}\n'.format(index) for index in range(200)]
+        for source in sources:
+            cache.put(source, AssembleRisc().assemble_source(source))
+            self.assertLessEqual(len(os.listdir(self.directory.name)), 20)
+        self.assertLess(scan_count, 200 // 2)
+        self.assertIsNotNone(cache.get(sources[-1]))
+        self.assertIsNone(cache.get(sources[0]))
+
+    def test_eviction_by_size(self):
+        cache = self.make_cache(max_size=1000)
+        for index in range(100):
+            source = 'addi x5, x0, {}\n'.format(index)
+            cache.put(source, AssembleRisc().assemble_source(source))
+            self.assertLessEqual(sum(entry.stat().st_size for entry in os.scandir(self.directory.name)), 1000)
+        self.assertIsNotNone(cache.get(source))
+        self.assertLess(len(os.listdir(self.directory.name)), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
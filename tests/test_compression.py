@@ -0,0 +1,113 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.compression import CompressionReport
+from assembler.simulator import Simulator
+
+
+X_REGISTERS = ['x{}'.format(index) for index in [1, 3, 4, 5, 6, 7, 8, 10, 11, 12, 13, 14, 15, 16, 20, 31]]
+COMPRESSED_X_REGISTERS = ['x{}'.format(index) for index in [8, 10, 11, 12, 13, 14, 15]]
+F_REGISTERS = ['f{}'.format(index) for index in [0, 3, 8, 9, 12, 15, 20]]
+
+# sp and x9 point into this range, which holds every load and store of the generated programs.
+DATA_START = 0x10000 - 1024
+DATA_END = 0x21400
+
+
+def _random_register(rng) -> str:
+    return rng.choice(COMPRESSED_X_REGISTERS if rng.random() < 0.6 else X_REGISTERS)
+
+
+def _random_line(rng, label_count: int, position: int) -> str:
+    a, b = _random_register(rng), _random_register(rng)
+    choice = rng.randrange(20)
+    if choice == 0:
+        return 'addi {}, {}, {}'.format(a, a, rng.randint(-40, 40))
+    if choice == 1:
+        return 'addi {}, x0, {}'.format(a, rng.randint(-40, 40))
+    if choice == 2:
+        return 'addi {}, {}, 0'.format(a, b)
+    if choice == 3:
+        return 'addi x2, x2, {}'.format(rng.choice([16, -16, 32, -32, 496, -512, 8]))
+    if choice == 4:
+        return 'addi {}, x2, {}'.format(rng.choice(COMPRESSED_X_REGISTERS), rng.choice([4, 8, 1020, 1024, 0, 6]))
+    if choice == 5:
+        return 'andi {}, {}, {}'.format(a, a, rng.randint(-40, 40))
+    if choice == 6:
+        return '{} {}, {}, {}'.format(rng.choice(['slli', 'srli', 'srai']), a, a, rng.randint(0, 31))
+    if choice == 7:
+        return 'lui {}, {}'.format(a, rng.choice([1, 31, 32, 0xfffff, 0xfffe0, 0xfffdf, 5]))
+    if choice == 8:
+        return 'add {}, {}, {}'.format(a, rng.choice([a, b, 'x0']), rng.choice([a, b, 'x0']))
+    if choice == 9:
+        operation = rng.choice(['sub', 'xor', 'or', 'and'])
+        return '{} {}, {}, {}'.format(operation, a, rng.choice([a, b]), rng.choice([a, b]))
+    if choice == 10:
+        return '{} {}, {}(x2)'.format(rng.choice(['lw', 'sw']), a, rng.choice([0, 4, 252, 256, 2]))
+    if choice == 11:
+        return '{} {}, {}(x9)'.format(rng.choice(['lw', 'sw']), a, rng.choice([0, 4, 124, 128]))
+    if choice == 12:
+        return '{} {}, {}({})'.format(
+            rng.choice(['flw', 'fsw']), rng.choice(F_REGISTERS), rng.choice([0, 8, 124, 252]), rng.choice(['x2', 'x9'])
+        )
+    if choice in [13, 14, 15] and position < label_count - 1:
+        target = 'L{}'.format(rng.randint(position + 1, label_count - 1))
+        if choice == 13:
+            return 'beq {}, x0, {}'.format(a, target)
+        if choice == 14:
+            return 'bne x0, {}, {}'.format(a, target)
+        return 'jal x0, {}'.format(target)
+    if choice == 16:
+        return 'nop'
+    return '{} {}, {}, {}'.format(rng.choice(['sub', 'xor']), a, b, a)
+
+
+def generate_compressible_program(seed: int) -> str:
+    rng = random.Random(seed)
+    size = rng.randint(5, 400)
+    label_count = max(2, size // 6)
+    lines = ['lui x2, 16', 'lui x9, 32', 'addi x9, x9, 256', 'lui x8, 32']
+    position = 0
+    for _ in range(size):
+        if rng.random() < 1 / 6 and position < label_count - 1:
+            lines.append('L{}:'.format(position))
+            position += 1
+        lines.append(_random_line(rng, label_count, position))
+        if rng.random() < 0.02:
+            # Long runs of uncompressible filler put some branches close to the edge of their compressed range.
+            lines.extend(['addi x5, x0, 0'] * rng.randint(100, 400))
+    lines.extend('L{}:'.format(index) for index in range(position, label_count))
+    lines.append('ebreak')
+    return '\n'.join(lines) + '\n'
+
+
+def run_program(source: str, compress: bool) -> tuple:
+    simulator = Simulator.from_assembly_result(AssembleRisc(compress=compress).assemble_source(source))
+    result = simulator.run(1000000)
+    return (
+        result.stop_reason, list(simulator.x_registers[:32]), list(simulator.f_registers),
+        bytes(simulator.memory[DATA_START:DATA_END])
+    )
+
+
+class CompressionTest(unittest.TestCase):
+    def test_compressed_program_behaves_like_uncompressed(self):
+        for seed in range(40):
+            source = generate_compressible_program(seed)
+            self.assertEqual(
+                run_program(source, compress=True), run_program(source, compress=False), 'seed {}'.format(seed)
+            )
+
+    def test_report(self):
+        result = AssembleRisc(compress=True).assemble_source('addi x8, x0, 1\nadd x8, x8, x8\nsub x5, x6, x7\n')
+        self.assertEqual(result.compression_report, CompressionReport(3, 2, 12, 8))
+        self.assertEqual(len(result.image), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.disassembler import numpy, to_disassembly_listing
+from program_generator import HANDLER_TEMPLATES, generate_program
+
+
+class DisassemblerRoundTripTest(unittest.TestCase):
+    def assert_round_trip(self, use_numpy: bool) -> None:
+        for seed in range(3):
+            image = AssembleRisc().assemble_source(generate_program(5000, seed)).image
+            listing = to_disassembly_listing(image, use_numpy=use_numpy)
+            self.assertEqual(AssembleRisc().assemble_source(listing).image, image, 'seed {}'.format(seed))
+
+    def test_round_trip(self):
+        self.assert_round_trip(use_numpy=False)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_vectorized_round_trip(self):
+        self.assert_round_trip(use_numpy=True)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_vectorized_listing_matches(self):
+        for handler_type in HANDLER_TEMPLATES:
+            image = AssembleRisc().assemble_source(generate_program(500, handler_types=[handler_type])).image
+            self.assertEqual(
+                to_disassembly_listing(image, use_numpy=True), to_disassembly_listing(image, use_numpy=False),
+                handler_type
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.simulator import Simulator
+
+
+FILLER = 'addi x5, x5, 1\n'
+
+# Branches whose condition always holds, so that every relaxed form ends up at its label.
+TAKEN_BRANCHES = ['beq x0, x0, {}', 'bge x0, x0, {}', 'bgeu x0, x0, {}', 'c.beqz x8, {}', 'jal x0, {}', 'jal x1, {}']
+
+
+def find_jump_target(simulator, start: int, end: int) -> int:
+    simulator.pc = start
+    while start <= simulator.pc < end:
+        simulator.run(1)
+    return simulator.pc
+
+
+def make_cascade_program(count: int, triggers) -> (str, list):
+    lines = []
+    branches = []
+    for index in range(count):
+        target = 'L{}'.format(index + (1025 if index in triggers else 1023))
+        lines.append('L{}:'.format(index))
+        lines.append('beq x5, x6, ' + target)
+        branches.append(('L{}'.format(index), 'L{}'.format(index + 1), target))
+    lines.extend('L{}:'.format(index) for index in range(count, count + 1100))
+    lines.append('ebreak')
+    return '\n'.join(lines) + '\n', branches
+
+
+class RelaxationTest(unittest.TestCase):
+    def assert_branches_reach_labels(self, result, branches) -> None:
+        simulator = Simulator.from_assembly_result(result)
+        labels_table = result.labels_table
+        for start_label, end_label, target_label in branches:
+            self.assertEqual(
+                find_jump_target(simulator, labels_table[start_label], labels_table[end_label]),
+                labels_table[target_label], 'branch at {} to {}'.format(start_label, target_label)
+            )
+
+    def assemble_branches(self, target_label, filler_count: int, backward: bool, far_jumps=False, compress=False):
+        branch_lines = ''.join(
+            'B{}:\n{}\nE{}:\n'.format(index, branch.format(target_label), index)
+            for index, branch in enumerate(TAKEN_BRANCHES)
+        )
+        filler = FILLER * filler_count
+        if backward:
+            source = target_label + ':\n' + filler + branch_lines + 'ebreak\n'
+        else:
+            source = branch_lines + filler + target_label + ':\nebreak\n'
+        result = AssembleRisc(compress=compress, far_jumps=far_jumps).assemble_source(source)
+        branches = [('B{}'.format(index), 'E{}'.format(index), target_label) for index in range(len(TAKEN_BRANCHES))]
+        return result, branches
+
+    def test_near_branches_keep_their_size(self):
+        result, branches = self.assemble_branches('target', 10, backward=False)
+        self.assertEqual(len(result.image), 4 * 10 + 5 * 4 + 2 + 4)
+        self.assert_branches_reach_labels(result, branches)
+
+    def test_forward_branches(self):
+        result, branches = self.assemble_branches('target', 1100, backward=False)
+        self.assertEqual(len(result.image), 4 * 1100 + 4 * 8 + 2 * 4 + 4)
+        self.assert_branches_reach_labels(result, branches)
+
+    def test_backward_branches(self):
+        result, branches = self.assemble_branches('target', 1100, backward=True)
+        self.assertEqual(len(result.image), 4 * 1100 + 4 * 8 + 2 * 4 + 4)
+        self.assert_branches_reach_labels(result, branches)
+
+    def test_compressed_branches_and_jumps(self):
+        for filler_count in [10, 1100]:
+            for backward in [False, True]:
+                result, branches = self.assemble_branches('target', filler_count, backward, compress=True)
+                self.assert_branches_reach_labels(result, branches)
+
+    def test_far_branches_need_far_jumps(self):
+        with self.assertRaisesRegex(Exception, 'needs --far-jumps'):
+            self.assemble_branches('target', 1 << 18, backward=False)
+
+    def test_far_branches(self):
+        for backward in [False, True]:
+            result, branches = self.assemble_branches('target', 1 << 18, backward, far_jumps=True)
+            self.assertEqual(len(result.image), 4 * (1 << 18) + 4 * 12 + 2 * 8 + 4)
+            self.assert_branches_reach_labels(result, branches)
+
+    def test_growth_cascades_to_branches_that_fit_in_earlier_passes(self):
+        for count, triggers in [(2100, {1030}), (3100, {1500}), (3100, {2050})]:
+            source, branches = make_cascade_program(count, triggers)
+            self.assert_branches_reach_labels(AssembleRisc().assemble_source(source), branches)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import random
+import sys
+import unittest
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.simulator import CANONICAL_NAN, POSITIVE_INFINITY, Simulator, bits_to_float
+
+
+FUSED_INSTRUCTIONS = {
+    'fmadd.s': lambda a, b, c: a * b + c,
+    'fmsub.s': lambda a, b, c: a * b - c,
+    'fnmsub.s': lambda a, b, c: -(a * b) + c,
+    'fnmadd.s': lambda a, b, c: -(a * b) - c
+}
+
+
+def round_to_single(value: Fraction) -> int:
+    if value == 0:
+        return 0
+    sign = 0x80000000 if value < 0 else 0
+    value = abs(value)
+    exponent = value.numerator.bit_length() - value.denominator.bit_length()
+    if Fraction(2) ** exponent > value:
+        exponent -= 1
+    exponent = max(exponent, -126)
+    scaled = value / Fraction(2) ** (exponent - 23)
+    mantissa, remainder = divmod(scaled.numerator, scaled.denominator)
+    if 2 * remainder > scaled.denominator or (2 * remainder == scaled.denominator and mantissa & 1):
+        mantissa += 1
+    if mantissa == 1 << 24:
+        mantissa >>= 1
+        exponent += 1
+    if exponent > 127:
+        return sign | POSITIVE_INFINITY
+    if mantissa < 1 << 23:
+        return sign | mantissa
+    return sign | (exponent + 127) << 23 | (mantissa - (1 << 23))
+
+
+def make_single(rng, low_exponent: int, high_exponent: int, mantissa=None) -> int:
+    if mantissa is None:
+        mantissa = rng.getrandbits(23)
+    return rng.getrandbits(1) << 31 | rng.randint(low_exponent, high_exponent) + 127 << 23 | mantissa
+
+
+def make_tie_factor(rng, low_exponent: int, high_exponent: int) -> int:
+    # The product of two such factors has 24 bits and a half, so it lies exactly between two singles.
+    return make_single(rng, low_exponent, high_exponent, (rng.getrandbits(11) << 1 | 1) << 11)
+
+
+class FusedMultiplyAddTest(unittest.TestCase):
+    def setUp(self):
+        self.simulators = {
+            opcode: Simulator.from_assembly_result(
+                AssembleRisc().assemble_source('{} f4, f1, f2, f3, rne\n'.format(opcode)), memory_size=64
+            )
+            for opcode in FUSED_INSTRUCTIONS
+        }
+
+    def run_fused(self, opcode: str, a: int, b: int, c: int) -> int:
+        simulator = self.simulators[opcode]
+        simulator.f_registers[1], simulator.f_registers[2], simulator.f_registers[3] = a, b, c
+        simulator.pc = 0
+        simulator.run(1)
+        return simulator.f_registers[4]
+
+    def test_rounds_once(self):
+        a = 0x3f800800
+        c = 0x1c800000
+        self.assertEqual(self.run_fused('fmadd.s', a, a, c), 0x3f801001)
+        self.assertEqual(self.run_fused('fnmadd.s', a, a, c), 0xbf801001)
+        self.assertEqual(self.run_fused('fmadd.s', a, a, c | 0x80000000), 0x3f801000)
+
+    def test_matches_exact_result(self):
+        rng = random.Random(23)
+        for _ in range(3000):
+            choice = rng.randrange(4)
+            if choice == 3:
+                a, b = make_tie_factor(rng, -20, 20), make_tie_factor(rng, -20, 20)
+            else:
+                a, b = make_single(rng, -20, 20), make_single(rng, -20, 20)
+            product = Fraction(bits_to_float(a)) * Fraction(bits_to_float(b))
+            if choice == 0:
+                c = make_single(rng, -60, 60)
+            elif choice == 1:
+                c = round_to_single(-product) ^ rng.randrange(4)
+            else:
+                c = round_to_single(product * Fraction(rng.choice([-1, 1]), 1 << rng.randrange(20, 80)))
+            for opcode, operation in FUSED_INSTRUCTIONS.items():
+                expected = round_to_single(operation(
+                    Fraction(bits_to_float(a)), Fraction(bits_to_float(b)), Fraction(bits_to_float(c))
+                ))
+                self.assertEqual(
+                    self.run_fused(opcode, a, b, c), expected,
+                    '{} 0x{:08x} 0x{:08x} 0x{:08x}'.format(opcode, a, b, c)
+                )
+
+    def test_special_values(self):
+        one, zero, negative_zero = 0x3f800000, 0, 0x80000000
+        self.assertEqual(self.run_fused('fmadd.s', POSITIVE_INFINITY, zero, one), CANONICAL_NAN)
+        self.assertEqual(self.run_fused('fmsub.s', POSITIVE_INFINITY, one, POSITIVE_INFINITY), CANONICAL_NAN)
+        self.assertEqual(self.run_fused('fmadd.s', 0x7f7fffff, 0x40000000, zero), POSITIVE_INFINITY)
+        self.assertEqual(self.run_fused('fmadd.s', 0x00000001, 0x3f000000, zero), zero)
+        self.assertEqual(self.run_fused('fmadd.s', negative_zero, one, negative_zero), negative_zero)
+        self.assertEqual(self.run_fused('fnmadd.s', zero, one, zero), negative_zero)
+        self.assertEqual(self.run_fused('fmsub.s', one, one, one), zero)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from assembler.assemblerisc import AssembleRisc
+from assembler.assembly_result import StreamedInstruction, StreamedPatch
+from assembler.output_formats import is_compressed
+from program_generator import generate_program
+
+
+def build_stream_image(records) -> bytes:
+    image = bytearray()
+    for record in records:
+        if isinstance(record, StreamedInstruction):
+            image += (record.word or 0).to_bytes(record.size, 'little')
+        else:
+            size = 2 if is_compressed(record.word) else 4
+            image[record.address:record.address + size] = record.word.to_bytes(size, 'little')
+    return bytes(image)
+
+
+class AssembleStreamTest(unittest.TestCase):
+    def test_stream_matches_assemble_source(self):
+        for seed in range(3):
+            source = generate_program(500, seed)
+            records = list(AssembleRisc().assemble_stream(source.splitlines()))
+            self.assertEqual(build_stream_image(records), AssembleRisc().assemble_source(source).image, seed)
+
+    def test_forward_reference_is_patched_when_label_appears(self):
+        lines = ['beq x0, x0, end', 'nop', 'jal x1, end', 'end:', 'jal x0, end']
+        records = list(AssembleRisc().assemble_stream(lines))
+        image = AssembleRisc().assemble_source('\n'.join(lines)).image
+        words = [int.from_bytes(image[offset:offset + 4], 'little') for offset in range(0, len(image), 4)]
+        self.assertEqual(records, [
+            StreamedInstruction(0, None, 4, 1), StreamedInstruction(4, words[1], 4, 2),
+            StreamedInstruction(8, None, 4, 3), StreamedPatch(0, words[0]), StreamedPatch(8, words[2]),
+            StreamedInstruction(12, words[3], 4, 5)
+        ])
+
+    def test_records_are_yielded_before_the_label_is_read(self):
+        lines_read = []
+
+        def read_lines():
+            for line in ['jal x0, end'] + ['addi x5, x5, 1'] * 1000 + ['end:']:
+                lines_read.append(line)
+                yield line
+
+        stream = AssembleRisc().assemble_stream(read_lines())
+        for index in range(1001):
+            self.assertEqual(next(stream).address, index * 4)
+            self.assertEqual(len(lines_read), index + 1)
+        self.assertEqual(next(stream).address, 0)
+
+    def test_undefined_label(self):
+        stream = AssembleRisc().assemble_stream(['nop', 'beq x0, x0, first', 'jal x0, second', 'first:'])
+        with self.assertRaises(Exception) as raised:
+            list(stream)
+        self.assertEqual(str(raised.exception), 'Error: label second not defined at line 3')
+
+
+if __name__ == '__main__':
+    unittest.main()